@@ -0,0 +1,271 @@
+"""
+Benchmark maws against a local stand-in of the deployment API
+
+Usage:
+
+    python -m benchmarks.run --latency 0.02 --sequence 202,202,200
+    python -m benchmarks.run --compare benchmarks/results/<baseline>.json
+"""
+
+import asyncio
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Annotated, Iterator, Optional
+
+import typer
+from pydantic import BaseModel
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.stub import TOKEN, DeploymentApiStub, StubConfig
+from maws import __version__
+from maws.config import Settings, close_api_clients
+from maws.fleet import deploy_fleet
+from maws.manifest import ServiceDeployment
+from maws.polling import PollingPolicy
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SCHEMA_VERSION = 1
+
+app = typer.Typer()
+console = Console()
+
+
+class Metric(BaseModel):
+    value: float
+    unit: str
+    lower_is_better: bool = True
+
+
+class BenchmarkResult(BaseModel):
+    """
+    Stored benchmark run, comparable across releases
+    """
+
+    schema_version: int = SCHEMA_VERSION
+    maws_version: str = __version__
+    commit: Optional[str] = None
+    python: str = platform.python_version()
+    platform: str = platform.platform()
+    created_at: str
+    config: dict
+    metrics: dict[str, Metric] = {}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_cli(*args: str, env: Optional[dict] = None) -> float:
+    """
+    Run the CLI in a fresh interpreter
+
+    Returns:
+        float: Wall time in seconds
+    """
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "from maws.main import main; main()", *args],
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        check=False,
+    )
+    return time.perf_counter() - start
+
+
+def cold_start(repeat: int) -> dict[str, Metric]:
+    times = [run_cli("--help") for _ in range(repeat)]
+    return {
+        "cold_start_median": Metric(value=statistics.median(times) * 1000, unit="ms"),
+        "cold_start_min": Metric(value=min(times) * 1000, unit="ms"),
+    }
+
+
+def stub_environment(stub: DeploymentApiStub, cache: str, poll_delay: float) -> dict[str, str]:
+    """
+    Get the environment configuring maws for the stub with an own cache directory
+    """
+    return {
+        "API_BASE_URL": stub.base_url,
+        "API_VERSION": stub.config.version,
+        "API_ACCESS_TOKEN": TOKEN,
+        "MAWS_CACHE_DIR": cache,
+        "POLL_INITIAL_DELAY": str(poll_delay),
+        "POLL_MAX_DELAY": str(poll_delay),
+        "POLL_JITTER": "0",
+    }
+
+
+@contextmanager
+def environment(env: dict[str, str]) -> Iterator[None]:
+    """
+    Set environment variables for the in-process benchmarks
+    """
+    previous = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def single_deploy(stub: DeploymentApiStub, repeat: int, poll_delay: float) -> dict[str, Metric]:
+    """
+    Deploy and wait for a single service through the CLI, starting with an empty cache
+    """
+    stub.reset()
+    with tempfile.TemporaryDirectory() as cache:
+        env = stub_environment(stub, cache, poll_delay)
+        service = stub.config.services[0]
+        times = [run_cli("ecs", "deploy", service, "registry/image:latest", env=env) for _ in range(repeat)]
+    return {
+        "deploy_latency_median": Metric(value=statistics.median(times) * 1000, unit="ms"),
+        "deploy_latency_p95": Metric(value=percentile(times, 95) * 1000, unit="ms"),
+        "requests_per_deploy": Metric(value=stub.requests.total() / repeat, unit="requests"),
+        "patch_requests_per_deploy": Metric(
+            value=stub.requests["PATCH /services/{name}"] / repeat,
+            unit="requests",
+        ),
+    }
+
+
+def fleet_throughput(stub: DeploymentApiStub, services: int, concurrency: int, poll_delay: float) -> Metric:
+    """
+    Deploy many services in-process and get the number of settled deployments per second
+
+    The client is configured like the CLI's, with retries, rate limiting,
+    the HTTP cache and tracing, starting with an empty cache.
+    """
+    stub.reset()
+    deployments = [ServiceDeployment(name=name, image="registry/image:latest") for name in stub.config.services]
+    deployments = deployments[:services]
+    with tempfile.TemporaryDirectory() as cache, environment(stub_environment(stub, cache, poll_delay)):
+        client = Settings().api_client
+        try:
+            start = time.perf_counter()
+            asyncio.run(deploy_fleet(client, deployments, PollingPolicy.fixed(poll_delay), concurrency=concurrency))
+            elapsed = time.perf_counter() - start
+        finally:
+            # the next run starts with a new client and cache
+            close_api_clients()
+    return Metric(value=len(deployments) / elapsed, unit="deployments/s", lower_is_better=False)
+
+
+def percentile(values: list[float], p: float) -> float:
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(p) - 1]
+
+
+def compare(baseline: BenchmarkResult, current: BenchmarkResult, threshold: float) -> bool:
+    """
+    Print the relative change of every metric present in both runs
+
+    Returns:
+        bool: True if any metric regressed by more than `threshold`
+    """
+    table = Table(title=f"{baseline.maws_version} ({baseline.commit}) -> {current.maws_version} ({current.commit})")
+    table.add_column("Metric", style="italic")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Current", justify="right")
+    table.add_column("Change", justify="right")
+    regressed = False
+    for name, metric in current.metrics.items():
+        if name not in baseline.metrics or not baseline.metrics[name].value:
+            continue
+        before = baseline.metrics[name].value
+        change = (metric.value - before) / before
+        worse = change > threshold if metric.lower_is_better else change < -threshold
+        regressed |= worse
+        table.add_row(
+            name,
+            f"{before:.2f} {metric.unit}",
+            f"{metric.value:.2f} {metric.unit}",
+            f"[{'red' if worse else 'green'}]{change:+.1%}[/]",
+        )
+    console.print(table)
+    return regressed
+
+
+@app.command()
+def main(
+    latency: Annotated[float, typer.Option(help="Stub latency per request in seconds")] = 0.02,
+    sequence: Annotated[str, typer.Option(help="Status codes of consecutive status checks")] = "202,202,200",
+    error_rate: Annotated[float, typer.Option(help="Fraction of requests answered with a 500")] = 0,
+    repeat: Annotated[int, typer.Option(min=1, help="Repetitions of the CLI benchmarks")] = 5,
+    services: Annotated[int, typer.Option(min=1, help="Number of services deployed by the fleet benchmark")] = 100,
+    concurrency: Annotated[str, typer.Option(help="Concurrency levels of the fleet benchmark")] = "1,10,50",
+    poll_delay: Annotated[float, typer.Option(help="Fixed delay between status checks in seconds")] = 0.05,
+    seed: Annotated[Optional[int], typer.Option(help="Seed of the injected errors")] = None,
+    batch: Annotated[bool, typer.Option(help="Let the stub accept batch deployments")] = False,
+    output: Annotated[Optional[Path], typer.Option(help="Result file, defaults to benchmarks/results/")] = None,
+    baseline: Annotated[Optional[Path], typer.Option("--compare", exists=True, help="Result file to compare")] = None,
+    threshold: Annotated[float, typer.Option(help="Relative change reported as a regression")] = 0.1,
+) -> None:
+    """
+    Run the benchmarks, store the results and optionally compare them with a baseline
+    """
+    config = StubConfig(
+        latency=latency,
+        sequence=[int(status) for status in sequence.split(",")],
+        error_rate=error_rate,
+        services=[f"service-{i}" for i in range(services)],
+        seed=seed,
+        batch=batch,
+    )
+    levels = [int(level) for level in concurrency.split(",")]
+    result = BenchmarkResult(
+        commit=git_commit(),
+        created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        config={
+            **config.model_dump(exclude={"services", "tasks"}),
+            "services": services,
+            "repeat": repeat,
+            "concurrency": levels,
+            "poll_delay": poll_delay,
+        },
+    )
+
+    with console.status("Measuring cold start"):
+        result.metrics.update(cold_start(repeat))
+    with DeploymentApiStub(config) as stub:
+        with console.status("Measuring single deployments"):
+            result.metrics.update(single_deploy(stub, repeat, poll_delay))
+        for level in levels:
+            with console.status(f"Measuring fleet throughput at concurrency {level}"):
+                result.metrics[f"fleet_throughput_c{level}"] = fleet_throughput(stub, services, level, poll_delay)
+
+    table = Table(title=f"maws {result.maws_version} ({result.commit})")
+    table.add_column("Metric", style="italic")
+    table.add_column("Value", justify="right")
+    for name, metric in result.metrics.items():
+        table.add_row(name, f"{metric.value:.2f} {metric.unit}")
+    console.print(table)
+
+    output = output or RESULTS_DIR / f"{result.maws_version}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(result.model_dump_json(indent=2))
+    console.print(f"Results written to {output}")
+
+    if baseline and compare(BenchmarkResult.model_validate_json(baseline.read_text()), result, threshold):
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
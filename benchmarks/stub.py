@@ -0,0 +1,203 @@
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs
+
+from pydantic import BaseModel
+
+from maws.polling import WAIT_HEADER
+
+TOKEN = "benchmark-token"
+
+
+class StubConfig(BaseModel):
+    """
+    Behaviour of the deployment API stand-in
+
+    `sequence` is the list of status codes returned by consecutive
+    `GET /services/{service}` requests after a deployment has been started,
+    the last one is repeated, e.g. `[202, 202, 200]` or `[202, 417]`.
+    `error_rate` is the fraction of requests answered with a 500.
+    With `max_wait` the stub supports long polling: it advertises the limit in
+    the `X-Max-Wait` header and a status request with `?wait=<seconds>` moves
+    through the sequence every `step` seconds until the deployment settles or
+    the wait has elapsed.
+    With `validators` every `200 OK` of a GET carries an ETag of its body and
+    a request with a matching If-None-Match is answered `304 Not Modified`.
+    With `compress` bodies are gzipped for clients accepting it.
+    With `batch` the stub accepts batch deployments (`PATCH /services`),
+    otherwise they are answered with a 404 like by an API predating them.
+    """
+
+    latency: float = 0
+    sequence: list[int] = [HTTPStatus.ACCEPTED, HTTPStatus.OK]
+    error_rate: float = 0
+    services: list[str] = [f"service-{i}" for i in range(100)]
+    tasks: list[str] = [f"task-{i}" for i in range(100)]
+    version: str = "v1"
+    seed: Optional[int] = None
+    max_wait: int = 0
+    step: float = 0.01
+    validators: bool = False
+    compress: bool = False
+    batch: bool = False
+
+
+class DeploymentApiStub(ThreadingHTTPServer):
+    """
+    Local HTTP server implementing the endpoints of `openapi.yaml`
+
+    Example:
+
+        with DeploymentApiStub(StubConfig(latency=0.02)) as stub:
+            run_against(stub.base_url, TOKEN)
+            print(stub.requests)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config: StubConfig = StubConfig(), port: int = 0):
+        super().__init__(("127.0.0.1", port), StubHandler)
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.requests: Counter[str] = Counter()
+        self.polls: defaultdict[str, int] = defaultdict(int)
+        self.not_modified = 0
+        self.thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset(self) -> None:
+        """
+        Forget all requests and deployments
+        """
+        with self.lock:
+            self.requests.clear()
+            self.polls.clear()
+            self.not_modified = 0
+
+    def __enter__(self) -> "DeploymentApiStub":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def respond(
+        self, method: str, path: str, token: Optional[str], wait: float = 0, body: object = None
+    ) -> tuple[int, object]:
+        """
+        Get the status code and body of a request
+
+        Args:
+            method (str)
+            path (str)
+            token (str | None): Value of the `x-api-token` header
+            wait (float, optional): Seconds to hold a status request of a deployment in progress. Defaults to 0.
+            body (object, optional): Decoded JSON request body. Defaults to None.
+
+        Returns:
+            tuple[int, object]
+        """
+        config = self.config
+        route = re.sub(r"^/[^/]+/(services|tasks)/[^/]+$", r"/\1/{name}", path)
+        with self.lock:
+            self.requests[f"{method} {route}"] += 1
+            failed = self.random.random() < config.error_rate
+        if config.latency:
+            time.sleep(config.latency)
+
+        if token != TOKEN:
+            return HTTPStatus.FORBIDDEN, {"error": "Unauthorized"}
+        if failed:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Injected failure"}
+
+        match method, path.split("/")[1:]:
+            case "GET", [config.version, "services"]:
+                return HTTPStatus.OK, config.services
+            case "GET", [config.version, "tasks"]:
+                return HTTPStatus.OK, config.tasks
+            case "PATCH", [config.version, "services"] if config.batch:
+                results = []
+                for item in body["deployments"]:
+                    service = item["service"]
+                    if service in config.services:
+                        with self.lock:
+                            self.polls[service] = 0
+                        results.append({"service": service, "status_code": HTTPStatus.CREATED})
+                    else:
+                        results.append({"service": service, "status_code": HTTPStatus.NOT_FOUND, "error": "Not Found"})
+                return HTTPStatus.MULTI_STATUS, {"results": results}
+            case "PATCH", [config.version, "services", service] if service in config.services:
+                with self.lock:
+                    self.polls[service] = 0
+                return HTTPStatus.CREATED, None
+            case "GET", [config.version, "services", service] if service in config.services:
+                deadline = time.monotonic() + min(wait, config.max_wait)
+                while True:
+                    with self.lock:
+                        if service not in self.polls:
+                            return HTTPStatus.OK, None  # no deployment running
+                        index = min(self.polls[service], len(config.sequence) - 1)
+                        self.polls[service] += 1
+                    status = HTTPStatus(config.sequence[index])
+                    if status != HTTPStatus.ACCEPTED or time.monotonic() + config.step > deadline:
+                        break
+                    time.sleep(config.step)
+                if status == HTTPStatus.EXPECTATION_FAILED:
+                    return status, {"error": f"Deployment of {service} failed"}
+                return status, None
+            case "PATCH", [config.version, "tasks", task] if task in config.tasks:
+                return HTTPStatus.CREATED, None
+        return HTTPStatus.NOT_FOUND, None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: DeploymentApiStub
+
+    def handle_request(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length)) if length else None
+        path, _, query = self.path.partition("?")
+        wait = float(parse_qs(query).get("wait", ["0"])[0])
+        status, body = self.server.respond(self.command, path, self.headers.get("x-api-token"), wait, request)
+        config = self.server.config
+        content = b"" if body is None else json.dumps(body).encode()
+        headers = {"Content-Type": "application/json"}
+        if config.max_wait:
+            headers[WAIT_HEADER] = str(config.max_wait)
+        if config.validators and self.command == "GET" and status == HTTPStatus.OK:
+            headers["ETag"] = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+            if self.headers.get("If-None-Match") == headers["ETag"]:
+                status, content = HTTPStatus.NOT_MODIFIED, b""
+                with self.server.lock:
+                    self.server.not_modified += 1
+        if config.compress and content and "gzip" in self.headers.get("Accept-Encoding", ""):
+            content = gzip.compress(content)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_PATCH = handle_request
+
+    def log_message(self, format, *args) -> None:
+        pass  # keep benchmark output clean
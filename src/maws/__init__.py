@@ -1,2 +1,17 @@
+import os
+from pathlib import Path
+
 __app_name__ = "maws"
 __version__ = "25.12.2"
+
+CONFIG_FILE_PATH = Path.home() / ".skaylink" / "profile.toml"
+
+
+def cache_dir() -> Path:
+    """
+    Get the directory of local caches, can be moved with MAWS_CACHE_DIR
+
+    Returns:
+        Path
+    """
+    return Path(os.getenv("MAWS_CACHE_DIR", Path.home() / ".skaylink" / "cache"))
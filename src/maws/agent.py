@@ -0,0 +1,430 @@
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Callable, Optional
+
+from maws import __app_name__, __version__, cache_dir
+
+# Seconds without a command after which the agent exits
+IDLE_TIMEOUT = 3600
+
+# Seconds a client waits for the agent to accept a connection
+CONNECT_TIMEOUT = 1
+
+
+def socket_path() -> Path:
+    """
+    Get the path of the agent socket, follows MAWS_CACHE_DIR
+
+    Returns:
+        Path
+    """
+    return cache_dir() / "agent.sock"
+
+
+def send_frame(stream, frame: dict) -> None:
+    stream.write(json.dumps(frame, separators=(",", ":")).encode() + b"\n")
+    stream.flush()
+
+
+def connect(path: Optional[Path] = None) -> Optional[socket.socket]:
+    """
+    Connect to a running agent
+
+    Args:
+        path (Path, optional): Defaults to `socket_path()`.
+
+    Returns:
+        socket.socket | None: None if no agent is listening
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path or socket_path()))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def control(command: str, path: Optional[Path] = None) -> Optional[dict]:
+    """
+    Send a control command (`ping` or `stop`) to the agent
+
+    Args:
+        command (str)
+        path (Path, optional): Defaults to `socket_path()`.
+
+    Returns:
+        dict | None: Status of the agent, None if it is not running
+    """
+    sock = connect(path)
+    if sock is None:
+        return None
+    with sock, sock.makefile("rwb") as stream:
+        try:
+            send_frame(stream, {"control": command})
+            return json.loads(stream.readline())
+        except (OSError, ValueError):
+            return None
+
+
+def terminal() -> dict:
+    """
+    Get whether the output of the caller is a terminal and the width rich renders it with
+
+    Like rich, COLUMNS takes precedence over the size of a terminal attached
+    to any of the standard streams, otherwise the width is 80.
+
+    Returns:
+        dict: `isatty` and `width`
+    """
+    columns = os.getenv("COLUMNS", "")
+    width = int(columns) if columns.isdigit() else None
+    for fd in (0, 1, 2):
+        if width is not None:
+            break
+        try:
+            width = os.get_terminal_size(fd).columns
+        except OSError:
+            continue
+    return {"isatty": sys.stdout.isatty(), "width": width or 80}
+
+
+def forward(args: list[str]) -> Optional[int]:
+    """
+    Run a command in the agent and relay its output
+
+    The command runs with the environment, working directory and terminal of
+    the caller. It is only handed back (None) while the agent has not accepted
+    it yet, e.g. if no agent is running or it has another version, so it is
+    never executed twice. Interrupting the caller closes the connection, which
+    interrupts the command in the agent.
+
+    Args:
+        args (list[str]): Command line arguments without the program name
+
+    Returns:
+        int | None: Exit code of the command, None if it has to run in-process
+    """
+    if os.getenv("MAWS_NO_AGENT"):
+        return None
+    # bound before the agent may redirect them, it runs in this process in tests
+    streams = {"stdout": sys.stdout, "stderr": sys.stderr}
+    sock = connect()
+    if sock is None:
+        return None
+    accepted = False
+    with sock, sock.makefile("rwb") as stream:
+        try:
+            send_frame(
+                stream,
+                {
+                    "version": __version__,
+                    "args": args,
+                    "cwd": os.getcwd(),
+                    "env": dict(os.environ),
+                    "terminal": terminal(),
+                },
+            )
+            for line in stream:
+                frame = json.loads(line)
+                if "fallback" in frame:
+                    return None
+                if "accepted" in frame:
+                    accepted = True
+                elif "exit" in frame:
+                    return frame["exit"]
+                for name, output in streams.items():
+                    if name in frame:
+                        output.write(frame[name])
+                        output.flush()
+        except (OSError, ValueError):
+            pass
+        except KeyboardInterrupt:
+            streams["stderr"].write("\nAborted!\n")
+            return 1
+    if not accepted:
+        return None
+    streams["stderr"].write("Lost connection to the maws agent\n")
+    return 1
+
+
+class FrameWriter(io.TextIOBase):
+    """
+    Text stream sending every write as a frame to the client
+    """
+
+    def __init__(self, send: Callable[[dict], None], name: str, tty: bool = False):
+        self.send = send
+        self.name = name
+        self.tty = tty
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def write(self, text: str | bytes) -> int:
+        if isinstance(text, bytes):
+            text = text.decode(errors="replace")  # click writes bytes to streams without a binary buffer
+        if text:
+            self.send({self.name: text})
+        return len(text)
+
+
+class AgentServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Unix socket server running CLI commands from a warm process
+
+    The modules are imported once. Every command runs in a child forked from
+    the agent, with the environment, working directory and terminal of its
+    client, so commands of several clients run side by side without seeing
+    each other's state. A command whose client disconnects, e.g. on Ctrl-C,
+    is sent SIGINT as if it ran in the terminal.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, idle_timeout: Optional[float] = IDLE_TIMEOUT):
+        """
+        Args:
+            path (Path): Socket path, the file is only accessible by the current user
+            idle_timeout (float, optional): Exit after this many seconds without a command. Defaults to IDLE_TIMEOUT.
+        """
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.children: set[int] = set()  # pids of the running commands
+        self._children_lock = threading.Lock()
+        self.started_at = time.time()
+        self.last_active = time.monotonic()
+        self.commands = 0
+        self.stopping = False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        umask = os.umask(0o077)
+        try:
+            super().__init__(str(path), AgentHandler)
+        finally:
+            os.umask(umask)
+
+    @property
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "version": __version__,
+            "started_at": self.started_at,
+            "commands": self.commands,
+            "running": len(self.children),
+        }
+
+    @property
+    def idle(self) -> bool:
+        return (
+            self.idle_timeout is not None
+            and not self.children
+            and time.monotonic() - self.last_active > self.idle_timeout
+        )
+
+    def serve(self, poll_interval: float = 0.5) -> None:
+        """
+        Handle requests until stopped or idle for `idle_timeout` seconds
+        """
+        from maws import catalog, fleet, main  # noqa: F401 warm up the heavy imports
+
+        self.timeout = poll_interval
+        try:
+            while not self.stopping and not self.idle:
+                self.handle_request()
+        finally:
+            self.server_close()
+            self.path.unlink(missing_ok=True)
+
+    def run(self, request: dict, connection: socket.socket, send: Callable[[dict], None]) -> int:
+        """
+        Run the command of a request in a forked child and wait for it
+
+        Args:
+            request (dict)
+            connection (socket.socket): Connection of the client, closing it interrupts the command
+            send (Callable[[dict], None]): Sends a frame to the client
+
+        Returns:
+            int: Exit code
+        """
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                self.socket.close()
+                signal.signal(signal.SIGINT, signal.default_int_handler)
+                code = execute(request, send)
+            finally:
+                os._exit(code if 0 <= code <= 255 else 1)
+
+        with self._children_lock:
+            self.children.add(pid)
+        threading.Thread(target=self.watch, args=(connection, pid), daemon=True).start()
+        try:
+            # the child is only reaped once it can no longer be interrupted, so its pid is never reused meanwhile
+            os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+        finally:
+            with self._children_lock:
+                self.children.discard(pid)
+                self.commands += 1
+                self.last_active = time.monotonic()
+        _, status = os.waitpid(pid, 0)
+        code = os.waitstatus_to_exitcode(status)
+        return 128 - code if code < 0 else code  # killed by a signal, as reported by shells
+
+    def watch(self, connection: socket.socket, pid: int) -> None:
+        """
+        Interrupt a command once its client closes the connection
+
+        The client sends nothing after its request, so the read returns when
+        the connection is closed, e.g. because the client was interrupted.
+
+        Args:
+            connection (socket.socket)
+            pid (int): Child running the command
+        """
+        try:
+            connection.recv(1)
+        except OSError:
+            pass
+        with self._children_lock:
+            if pid in self.children:
+                os.kill(pid, signal.SIGINT)
+
+
+def execute(request: dict, send: Callable[[dict], None]) -> int:
+    """
+    Run a command with the environment, working directory and terminal of the client
+
+    Only called in a child of the agent, the changes to the process state are
+    never undone.
+
+    Args:
+        request (dict)
+        send (Callable[[dict], None]): Sends a frame to the client
+
+    Returns:
+        int: Exit code
+    """
+    from maws.main import app
+
+    terminal = request.get("terminal", {})
+    os.environ.clear()
+    os.environ.update(request["env"])
+    os.chdir(request["cwd"])
+    sys.argv = [__app_name__, *request["args"]]
+    client_consoles(terminal)
+    stdout = FrameWriter(send, "stdout", terminal.get("isatty", False))
+    stderr = FrameWriter(send, "stderr", terminal.get("isatty", False))
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            app(args=request["args"], prog_name=__app_name__)
+        except SystemExit as e:
+            return exit_code(e.code)
+        except KeyboardInterrupt:
+            return 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+    return 0
+
+
+def client_consoles(terminal: dict) -> None:
+    """
+    Replace the consoles of the loaded command modules by ones for the terminal of the client
+
+    Rich detects the terminal, its colors and width once per console, the
+    module level consoles would otherwise render for the agent's terminal.
+
+    Args:
+        terminal (dict): `isatty` and `width` of the client, see `terminal()`
+    """
+    from rich.console import Console
+
+    for name, module in list(sys.modules.items()):
+        if name.startswith(f"{__app_name__}.") and isinstance(console := getattr(module, "console", None), Console):
+            module.console = Console(
+                stderr=console.stderr,
+                force_terminal=terminal.get("isatty", False),
+                width=terminal.get("width"),
+            )
+
+
+def exit_code(code) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+class AgentHandler(socketserver.StreamRequestHandler):
+    server: AgentServer
+
+    def send(self, frame: dict) -> None:
+        send_frame(self.wfile, frame)
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        match request.get("control"):
+            case "ping":
+                return self.send(self.server.status)
+            case "stop":
+                self.server.stopping = True
+                return self.send(self.server.status)
+        if request.get("version") != __version__:
+            return self.send({"fallback": f"Agent runs version {__version__}"})
+        try:
+            self.send({"accepted": True})
+            code = self.server.run(request, self.connection, self.send)
+            self.send({"exit": code})
+        except OSError:
+            pass  # the client went away
+        finally:
+            try:
+                self.connection.shutdown(socket.SHUT_RD)  # ends the watch
+            except OSError:
+                pass
+
+
+def start_agent(path: Optional[Path] = None, idle_timeout: Optional[float] = IDLE_TIMEOUT) -> AgentServer:
+    """
+    Listen on the agent socket, replacing a stale socket file
+
+    Args:
+        path (Path, optional): Defaults to `socket_path()`.
+        idle_timeout (float, optional): Defaults to IDLE_TIMEOUT.
+
+    Raises:
+        RuntimeError: If an agent is already running
+
+    Returns:
+        AgentServer
+    """
+    path = path or socket_path()
+    if path.exists():
+        if (status := control("ping", path)) is not None:
+            raise RuntimeError(f"Agent already running with pid {status['pid']}")
+        path.unlink()
+    return AgentServer(path, idle_timeout)
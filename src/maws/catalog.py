@@ -0,0 +1,149 @@
+import asyncio
+import difflib
+import os
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Optional
+
+from pydantic import BaseModel
+
+from maws.clients.ecs_service_deployment_client import AuthenticatedClient
+from maws.clients.ecs_service_deployment_client.api.services import get_services
+from maws.clients.ecs_service_deployment_client.api.tasks import get_tasks
+from maws.completion import catalog_path
+from maws.config import async_session
+from maws.fleet import parse_names
+
+if TYPE_CHECKING:
+    from maws.config import Settings
+
+
+class Catalog(BaseModel):
+    """
+    Local listing of the services and tasks of an API endpoint
+    """
+
+    base_url: str
+    services: frozenset[str] = frozenset()
+    tasks: frozenset[str] = frozenset()
+    updated_at: float = 0
+    ttl: float = 300  # stored for shell completion, which does not load the profile
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.updated_at < ttl
+
+    def suggest(self, name: str, names: frozenset[str]) -> Optional[str]:
+        """
+        Get the closest known name for a misspelled one
+
+        Args:
+            name (str)
+            names (frozenset[str]): Known names, e.g. `services`
+
+        Returns:
+            str | None
+        """
+        matches = difflib.get_close_matches(name, names, n=1)
+        return matches[0] if matches else None
+
+
+# Parsed catalogs by path, reused by long running processes like the agent while the file is unchanged
+_catalogs: dict[str, tuple[tuple[int, int], Catalog]] = {}
+
+
+def load_catalog(profile: Optional[str], base_url: str) -> Optional[Catalog]:
+    """
+    Load the cached catalog of a profile
+
+    Args:
+        profile (str | None)
+        base_url (str): Catalogs of other endpoints are ignored
+
+    Returns:
+        Catalog | None
+    """
+    path = catalog_path(profile)
+    try:
+        stat = path.stat()
+        # catalogs are replaced atomically, so every update gets a new inode
+        file_key = (stat.st_ino, stat.st_mtime_ns)
+        cached = _catalogs.get(str(path))
+        if cached and cached[0] == file_key:
+            catalog = cached[1]
+        else:
+            catalog = Catalog.model_validate_json(path.read_text())
+            _catalogs[str(path)] = (file_key, catalog)
+    except (OSError, ValueError):
+        return None
+    return catalog if catalog.base_url == base_url else None
+
+
+def save_catalog(profile: Optional[str], catalog: Catalog) -> None:
+    """
+    Store the catalog of a profile
+
+    Args:
+        profile (str | None)
+        catalog (Catalog)
+    """
+    path = catalog_path(profile)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(catalog.model_dump_json())
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # the catalog is an optimization only
+
+
+async def fetch_catalog(client: AuthenticatedClient, base_url: str) -> Catalog:
+    """
+    Fetch the services and tasks of an API endpoint concurrently
+
+    Args:
+        client (AuthenticatedClient)
+        base_url (str)
+
+    Raises:
+        Exception: If a listing failed
+
+    Returns:
+        Catalog
+    """
+    async with async_session(client):
+        services, tasks = await asyncio.gather(
+            get_services.asyncio_detailed(client=client),
+            get_tasks.asyncio_detailed(client=client),
+        )
+    for kind, response in (("services", services), ("tasks", tasks)):
+        if response.status_code != HTTPStatus.OK:
+            raise Exception(f"Listing {kind} failed with status {response.status_code}")
+    return Catalog(
+        base_url=base_url,
+        services=parse_names(services.content, "services"),
+        tasks=parse_names(tasks.content, "tasks"),
+        updated_at=time.time(),
+    )
+
+
+def get_catalog(env: "Settings", profile: Optional[str] = None, refresh: bool = False) -> Optional[Catalog]:
+    """
+    Get the catalog of a profile, refreshing it once its TTL has expired
+
+    Args:
+        env (Settings)
+        profile (str, optional): Defaults to None.
+        refresh (bool, optional): Ignore the cached catalog. Defaults to False.
+
+    Returns:
+        Catalog | None: None if the catalog is unavailable, e.g. the listing is not permitted
+    """
+    try:
+        base_url = f"{env.api_base_url}/{env.api_version}"
+        catalog = None if refresh else load_catalog(profile, base_url)
+        if catalog is None or not catalog.is_fresh(env.catalog_ttl):
+            catalog = asyncio.run(fetch_catalog(env.api_client, base_url)).model_copy(update={"ttl": env.catalog_ttl})
+            save_catalog(profile, catalog)
+        return catalog
+    except Exception:
+        return None
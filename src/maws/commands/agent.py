@@ -0,0 +1,83 @@
+import os
+import time
+from datetime import datetime
+from typing import Annotated, Optional
+
+import typer
+from rich.console import Console
+
+from maws.agent import IDLE_TIMEOUT, control, socket_path, start_agent
+
+app = typer.Typer(no_args_is_help=True)
+console = Console()
+
+
+@app.command()
+def start(
+    detach: Annotated[bool, typer.Option("--detach", "-d", help="Run in the background")] = False,
+    idle_timeout: Annotated[
+        Optional[float], typer.Option(help="Exit after this many seconds without a command, 0 to never exit")
+    ] = IDLE_TIMEOUT,
+):
+    """
+    Start the agent, which runs subsequent maws commands in a warm process
+    """
+    try:
+        server = start_agent(idle_timeout=idle_timeout or None)
+    except (OSError, RuntimeError) as e:
+        console.print(e, style="red")
+        raise typer.Exit(code=1)
+
+    if detach and hasattr(os, "fork"):
+        if pid := os.fork():
+            server.socket.close()
+            console.print(f"Agent started with pid {pid} on {server.path}", style="green")
+            return
+        # child: detach from the terminal
+        try:
+            os.setsid()
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            server.serve()
+        finally:
+            os._exit(0)
+
+    console.print(f"Agent listening on {server.path}", style="green")
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def stop():
+    """
+    Stop the agent
+    """
+    status = control("stop")
+    if status is None:
+        console.print("Agent is not running", style="yellow")
+        raise typer.Exit(code=1)
+    # the agent exits once its current poll interval has passed
+    for _ in range(50):
+        if not socket_path().exists():
+            break
+        time.sleep(0.1)
+    console.print(f"Agent with pid {status['pid']} stopped", style="green")
+
+
+@app.command()
+def status():
+    """
+    Show whether the agent is running
+    """
+    status = control("ping")
+    if status is None:
+        console.print("Agent is not running", style="yellow")
+        raise typer.Exit(code=1)
+    started_at = datetime.fromtimestamp(status["started_at"]).isoformat(sep=" ", timespec="seconds")
+    console.print(
+        f"Agent {status['version']} running with pid {status['pid']} since {started_at}, "
+        f"{status['commands']} commands served"
+    )
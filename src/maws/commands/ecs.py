@@ -1,36 +1,512 @@
 import json
 import time
 from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Optional
 
 import typer
 from rich.console import Console
 
-from maws.clients.ecs_service_deployment_client.api.services import (
-    get_service,
-    patch_service,
-)
-from maws.clients.ecs_service_deployment_client.models import (
-    ServiceDeploymentRequest,
-)
-from maws.config import CONFIG_FILE_PATH, get_settings
+from maws import CONFIG_FILE_PATH
+from maws.completion import complete_services, complete_tasks
+from maws.events import EventStream, OutputFormat
+
+if TYPE_CHECKING:
+    from maws.catalog import Catalog
+    from maws.config import Settings
+    from maws.fleet import DeploymentResult
+    from maws.journal import Journal
+    from maws.manifest import ServiceDeployment, TaskDeployment
+    from maws.polling import PollingPolicy
+    from maws.state import PlannedDeployment
+
 
 app = typer.Typer(no_args_is_help=True)
+task_app = typer.Typer(no_args_is_help=True)
+app.add_typer(task_app, name="task", help="ECS scheduled task commands")
 console = Console()
 
+EXIT_FAILED = 1
+EXIT_PENDING = 3
+
+ResumeOption = Annotated[
+    bool,
+    typer.Option(
+        help="Continue an interrupted run of the manifest, services which succeeded are skipped and deployments "
+        "in progress are awaited without triggering them again"
+    ),
+]
+
+ProfilesOption = Annotated[
+    Optional[str],
+    typer.Option(
+        "--profile",
+        help=f"Profile name from {str(CONFIG_FILE_PATH)}, several comma separated names or globs (e.g. 'prod-*') "
+        "deploy to all of them concurrently",
+    ),
+]
+
+OutputOption = Annotated[
+    OutputFormat, typer.Option("--output", "-o", help="Output format, json streams one NDJSON event per line")
+]
+
+PLAN_STYLES = {
+    "create": "green",
+    "update": "yellow",
+    "force": "magenta",
+    "unchanged": "dim",
+}
+
+STATE_STYLES = {
+    "pending": "yellow",
+    "succeeded": "green",
+    "failed": "red",
+    "skipped": "dim",
+}
+
+
+def polling_policy(env: "Settings", delay: Optional[int] = None, timeout: Optional[float] = None) -> "PollingPolicy":
+    """
+    Get the polling policy of a command
+
+    Args:
+        env (Settings)
+        delay (int, optional): Fixed delay overriding the profile policy
+        timeout (float, optional): Timeout overriding the profile policy
+
+    Returns:
+        PollingPolicy
+    """
+    from maws.polling import PollingPolicy
+
+    policy = PollingPolicy.fixed(delay) if delay else env.polling_policy
+    if timeout is not None:
+        policy = policy.model_copy(update={"timeout": timeout})
+    return policy
+
+
+def fail(message: str, events: Optional[EventStream] = None, service: Optional[str] = None) -> None:
+    """
+    Report an error and exit
+
+    Args:
+        message (str)
+        events (EventStream, optional): Emit an `error` event instead of printing
+        service (str, optional): Service the error belongs to
+
+    Raises:
+        typer.Exit
+    """
+    if events:
+        events.emit("error", service, message=message)
+    else:
+        console.print(message, overflow="fold", style="red")
+    raise typer.Exit(code=EXIT_FAILED)
+
+
+def report(
+    results: list["DeploymentResult"], events: Optional[EventStream] = None, title: str = "Deployment summary"
+) -> None:
+    """
+    Report the results of a fleet operation and exit with its outcome
+
+    Args:
+        results (list[DeploymentResult])
+        events (EventStream, optional): Emit a `summary` event instead of printing a table
+        title (str, optional): Defaults to "Deployment summary".
+
+    Raises:
+        typer.Exit: If any deployment failed, was skipped or is still pending
+    """
+    counts = count_states(results)
+    if events:
+        events.emit("summary", **counts)
+    else:
+        print_summary(results, title=title)
+    exit_with(counts)
+
+
+def count_states(results: list["DeploymentResult"]) -> dict[str, int]:
+    from maws.fleet import DeploymentState
+
+    return {state.value: sum(result.state == state for result in results) for state in DeploymentState}
+
+
+def exit_with(counts: dict[str, int]) -> None:
+    """
+    Exit with the outcome of a fleet operation
+
+    Args:
+        counts (dict[str, int]): Number of results per state
+
+    Raises:
+        typer.Exit: If any deployment failed, was skipped or is still pending
+    """
+    from maws.fleet import DeploymentState
+
+    if counts[DeploymentState.FAILED] or counts[DeploymentState.SKIPPED]:
+        raise typer.Exit(code=EXIT_FAILED)
+    if counts[DeploymentState.PENDING]:
+        raise typer.Exit(code=EXIT_PENDING)
+
+
+def report_profiles(results: dict[str, list["DeploymentResult"]], events: Optional[EventStream] = None) -> None:
+    """
+    Report the results of a multi-profile deployment as a service by profile matrix and exit with its outcome
+
+    Args:
+        results (dict[str, list[DeploymentResult]]): Results per profile
+        events (EventStream, optional): Emit a `summary` event with the counts per profile instead of printing
+
+    Raises:
+        typer.Exit: If any deployment failed or is still pending
+    """
+    from rich.table import Table
+
+    counts = count_states([result for profile_results in results.values() for result in profile_results])
+    if events:
+        events.emit(
+            "summary",
+            **counts,
+            profiles={profile: count_states(profile_results) for profile, profile_results in results.items()},
+        )
+        exit_with(counts)
+
+    table = Table(title="Deployment results")
+    table.add_column("Service", style="italic")
+    for profile in results:
+        table.add_column(profile)
+    services = dict.fromkeys(result.service for profile_results in results.values() for result in profile_results)
+    cells = {
+        (profile, result.service): result for profile, profile_results in results.items() for result in profile_results
+    }
+    for service in services:
+        row = []
+        for profile in results:
+            result = cells.get((profile, service))
+            if result is None:
+                row.append("-")
+                continue
+            status_code = f" ({result.status_code})" if result.status_code else ""
+            row.append(f"[{STATE_STYLES[result.state]}]{result.state}[/]{status_code}")
+        table.add_row(service, *row)
+    console.print(table)
+    for profile, profile_results in results.items():
+        for result in profile_results:
+            if result.message:
+                console.print(f"{profile}/{result.service}: {result.message}", overflow="fold", style="red")
+    exit_with(counts)
+
+
+def deploy_to_profiles(
+    pattern: str,
+    deployments: list["ServiceDeployment"],
+    output: OutputFormat = OutputFormat.TEXT,
+    refresh: bool = False,
+    delay: Optional[int] = None,
+    timeout: Optional[float] = None,
+    concurrency: int = 10,
+) -> None:
+    """
+    Deploy services through every profile selected by a pattern and wait for them
+
+    Args:
+        pattern (str): Comma separated profile names and globs, e.g. `prod-*`
+        deployments (list[ServiceDeployment])
+        output (OutputFormat, optional): Defaults to text.
+        refresh (bool, optional): Refresh the service catalogs. Defaults to False.
+        delay (int, optional): Defaults to the polling policy of each profile.
+        timeout (float, optional): Defaults to the polling timeout of each profile.
+        concurrency (int, optional): Maximum number of requests in flight per profile. Defaults to 10.
+
+    Raises:
+        typer.Exit: With the outcome of the deployments
+    """
+    import asyncio
+
+    from maws.config import get_settings, match_profiles
+    from maws.fleet import deploy_profiles
+
+    events = EventStream() if output == OutputFormat.JSON else None
+    try:
+        profiles = match_profiles(pattern)
+    except ValueError as e:
+        fail(str(e), events)
+    envs = {profile: get_settings(profile) for profile in profiles}
+    names = [deployment.name for deployment in deployments]
+    for profile, env in envs.items():
+        check_catalog(env, profile, names, refresh=refresh, events=events)
+
+    targets = {profile: (env.api_client, polling_policy(env, delay, timeout)) for profile, env in envs.items()}
+    if events:
+        streams = {profile: EventStream(profile=profile) for profile in profiles}
+        for profile in profiles:
+            estimate(profile, names, streams[profile])
+        results = asyncio.run(deploy_profiles(targets, deployments, concurrency=concurrency, events=streams))
+    else:
+        eta = max(filter(None, (estimate(profile, names) for profile in profiles)), default=None)
+        with console.status(
+            f"Deploying {len(deployments)} services to {len(profiles)} profiles{eta_text(eta)}", spinner="dots"
+        ):
+            results = asyncio.run(deploy_profiles(targets, deployments, concurrency=concurrency))
+    for profile, env in envs.items():
+        record(env, profile, deployments, results[profile])
+    report_profiles(results, events)
+
+
+def record(
+    env: "Settings",
+    profile: Optional[str],
+    deployments: list["ServiceDeployment"],
+    results: list["DeploymentResult"],
+) -> None:
+    """
+    Record the deployments in the history and the successful ones in the deployment state of the profile
+
+    Args:
+        env (Settings)
+        profile (str | None): Profile name
+        deployments (list[ServiceDeployment])
+        results (list[DeploymentResult])
+    """
+    from maws.history import log_deployments
+    from maws.state import record_deployments
+
+    log_deployments(profile, deployments, results)
+    record_deployments(profile, f"{env.api_base_url}/{env.api_version}", deployments, results)
+
+
+def open_journal(
+    env: "Settings",
+    profile: Optional[str],
+    command: str,
+    manifest: Path,
+    deployments: list["ServiceDeployment"],
+    events: Optional[EventStream] = None,
+    resume: bool = False,
+) -> tuple["Journal", list["ServiceDeployment"], dict[str, float]]:
+    """
+    Start the journal of a fleet operation or resume the one of an interrupted run
+
+    Args:
+        env (Settings)
+        profile (str | None): Profile name
+        command (str): Name of the command, runs of different commands are journaled separately
+        manifest (Path)
+        deployments (list[ServiceDeployment])
+        events (EventStream, optional): Receives the events of the operation through the journal and a `resume` event
+        resume (bool, optional): Defaults to False.
+
+    Returns:
+        tuple[Journal, list[ServiceDeployment], dict[str, float]]: The journal to pass as event stream, the
+            deployments left with prerequisites which succeeded before removed, and the deployments to reattach to
+    """
+    from maws.journal import Journal, journal_path
+
+    base_url = f"{env.api_base_url}/{env.api_version}"
+    journal = Journal(journal_path(command, profile, base_url, manifest), deployments, events, resume=resume)
+    done = set(journal.succeeded)
+    remaining = [
+        deployment.model_copy(update={"depends_on": [name for name in deployment.depends_on if name not in done]})
+        for deployment in deployments
+        if deployment.name not in done
+    ]
+    reattach = journal.in_progress
+    if resume:
+        counts = {"succeeded": len(done), "reattached": len(reattach), "outstanding": len(remaining) - len(reattach)}
+        if events:
+            events.emit("resume", **counts)
+        else:
+            console.print(
+                f"Resuming: {counts['succeeded']} services succeeded before, {counts['reattached']} in progress, "
+                f"{counts['outstanding']} to deploy",
+                style="dim",
+            )
+    return journal, remaining, reattach
+
+
+def close_journal(
+    journal: "Journal",
+    env: "Settings",
+    profile: Optional[str],
+    deployments: list["ServiceDeployment"],
+    results: list["DeploymentResult"],
+    events: Optional[EventStream] = None,
+) -> list["DeploymentResult"]:
+    """
+    Record the results of a journaled fleet operation together with those of the run it resumed
+
+    Args:
+        journal (Journal)
+        env (Settings)
+        profile (str | None): Profile name
+        deployments (list[ServiceDeployment]): All deployments of the manifest
+        results (list[DeploymentResult]): Results of the deployments run by this command
+        events (EventStream, optional): Skip the hint how to continue
+
+    Returns:
+        list[DeploymentResult]: Results of all deployments
+    """
+    by_name = {result.service: result for result in results}
+    results = [by_name.get(deployment.name) or journal.result(deployment.name) for deployment in deployments]
+    # deployments which succeeded before are recorded unless the interrupted run got to it
+    unrecorded = [
+        (deployment, result)
+        for deployment, result in zip(deployments, results)
+        if deployment.name in by_name or deployment.name not in journal.recorded
+    ]
+    record(env, profile, [deployment for deployment, _ in unrecorded], [result for _, result in unrecorded])
+    journal.finish(results)
+    if not events and not all(result.succeeded for result in results):
+        console.print(
+            "Run again with --resume to continue, services which succeeded are not deployed again", style="dim"
+        )
+    return results
+
+
+def estimate(
+    profile: Optional[str],
+    names: list[str],
+    events: Optional[EventStream] = None,
+    graph: Optional[dict[str, set[str]]] = None,
+) -> Optional[float]:
+    """
+    Estimate when deployments started now will have settled from their median durations
+
+    Args:
+        profile (str | None): Profile name
+        names (list[str]): Services to deploy
+        events (EventStream, optional): Emit an `estimate` event per service with recorded durations
+        graph (dict[str, set[str]], optional): Prerequisites of every service if they are deployed in order,
+            the estimate follows the longest chain. Defaults to all services deployed at once.
+
+    Returns:
+        float | None: Epoch timestamp, None if no durations are recorded
+    """
+    from maws.history import duration_stats
+
+    stats = duration_stats(profile, names)
+    if events:
+        for service in names:
+            if service in stats:
+                events.emit(
+                    "estimate",
+                    service,
+                    p50=round(stats[service].p50, 3),
+                    p95=round(stats[service].p95, 3),
+                    deployments=stats[service].deployments,
+                )
+    if not stats:
+        return None
+
+    finished: dict[str, float] = {}
+
+    def finish(name: str) -> float:
+        if name not in finished:
+            prerequisites = (graph or {}).get(name, ())
+            finished[name] = (stats[name].p50 if name in stats else 0) + max(map(finish, prerequisites), default=0)
+        return finished[name]
+
+    return time.time() + max(map(finish, names))
+
+
+def eta_text(eta: Optional[float]) -> str:
+    return f", usually done around {time.strftime('%H:%M:%S', time.localtime(eta))}" if eta else ""
+
+
+def validate(
+    deployments: list["ServiceDeployment"] | list["TaskDeployment"],
+    events: Optional[EventStream] = None,
+    schema: str = "ServiceDeploymentRequest",
+) -> None:
+    """
+    Check all deployment requests against the API schema before sending any of them
+
+    Args:
+        deployments (list[ServiceDeployment] | list[TaskDeployment])
+        events (EventStream, optional): Emit an `error` event per error instead of printing
+        schema (str, optional): Request schema. Defaults to "ServiceDeploymentRequest".
+
+    Raises:
+        typer.Exit: If any request is invalid
+    """
+    from maws.validation import validate_requests
+
+    errors = validate_requests(deployments, schema)
+    if not errors:
+        return
+    if events:
+        for name, message in errors:
+            events.emit("error", name, message=message)
+    else:
+        console.print("Invalid deployment requests, nothing has been deployed:", style="red")
+        for name, message in errors:
+            console.print(f"  [italic]{name}[/italic]: {message}", overflow="fold", style="red", highlight=False)
+    raise typer.Exit(code=EXIT_FAILED)
+
+
+def check_catalog(
+    env: "Settings",
+    profile: Optional[str],
+    names: list[str],
+    kind: str = "services",
+    refresh: bool = False,
+    events: Optional[EventStream] = None,
+) -> Optional["Catalog"]:
+    """
+    Check service or task names against the local catalog before touching the API
+
+    A cached catalog is refreshed once if it misses a name.
+
+    Args:
+        env (Settings)
+        profile (str | None): Profile name
+        names (list[str]): Names to check
+        kind (str, optional): `services` or `tasks`. Defaults to "services".
+        refresh (bool, optional): Refresh the catalog. Defaults to False.
+        events (EventStream, optional): Emit `error` events instead of printing
+
+    Raises:
+        typer.Exit: If any name is unknown
+
+    Returns:
+        Catalog | None: None if the catalog is unavailable
+    """
+    from maws.catalog import get_catalog
+
+    started_at = time.time()
+    catalog = get_catalog(env, profile, refresh=refresh)
+    if catalog is None:
+        return None
+
+    known = getattr(catalog, kind)
+    if catalog.updated_at < started_at and any(name not in known for name in names):
+        # the cached catalog may predate a new service or task, look it up once more before rejecting it
+        catalog = get_catalog(env, profile, refresh=True) or catalog
+        known = getattr(catalog, kind)
+    unknown = [name for name in names if name not in known]
+    for name in unknown:
+        suggestion = catalog.suggest(name, known)
+        if events:
+            events.emit("error", name, message=f"Unknown {kind.removesuffix('s')}", suggestion=suggestion)
+            continue
+        hint = f", did you mean [italic]{suggestion}[/italic]?" if suggestion else ""
+        console.print(f"Unknown {kind.removesuffix('s')} [italic]{name}[/italic]{hint}", style="red")
+    if unknown:
+        raise typer.Exit(code=EXIT_FAILED)
+    return catalog
+
 
 @app.command()
 def deploy(
-    service_name: str = typer.Argument(help="The name of the service to be updated"),
+    service_name: str = typer.Argument(help="The name of the service to be updated", autocompletion=complete_services),
     image: str = typer.Argument(help="The container image to use for the service"),
-    force: bool = typer.Option(
-        False,
-        help="Force new deployment, event if images has not changed",
-    ),
-    secret_arns: list[str] = typer.Option(
-        [],
-        help="List of secret ARNs to attach to the service",
-    ),
-    profile: str = typer.Option(None, help=f"Profile name from {str(CONFIG_FILE_PATH)}"),
+    force: Annotated[bool, typer.Option(help="Force new deployment, event if images has not changed")] = False,
+    secret_arns: Annotated[list[str], typer.Option(help="List of secret ARNs to attach to the service")] = [],
+    profile: ProfilesOption = None,
+    timeout: Annotated[Optional[float], typer.Option(help="Maximum time in seconds to wait for the deployment")] = None,
+    refresh: Annotated[bool, typer.Option(help="Refresh the local service catalog")] = False,
+    output: OutputOption = OutputFormat.TEXT,
 ) -> None:
     """
     ECS Service Deployment Request
@@ -41,11 +517,45 @@ def deploy(
         force (str, Optional):  Defaults to False.
         secret_arns (list[str], Optional)
         profile (str, Optional): Profile name
+        timeout (float, Optional): Defaults to the profile polling timeout.
+        refresh (bool, Optional): Defaults to False.
+        output (OutputFormat, Optional): Defaults to text.
 
     Raises:
-        Exception
+        typer.Exit: If the deployment failed or is still pending
     """
+    import asyncio
+
+    from maws.clients.ecs_service_deployment_client.api.services import patch_service
+    from maws.clients.ecs_service_deployment_client.models import (
+        ServiceDeploymentRequest,
+    )
+    from maws.config import get_settings, is_profile_pattern
+    from maws.fleet import DeploymentResult, DeploymentState, deploy_fleet
+    from maws.history import log_deployments
+    from maws.manifest import ServiceDeployment
+    from maws.state import record_deployments
+
+    deployment = ServiceDeployment(name=service_name, image=image, force=force, secret_arns=secret_arns)
+    if is_profile_pattern(profile):
+        validate([deployment], EventStream() if output == OutputFormat.JSON else None)
+        return deploy_to_profiles(profile, [deployment], output=output, refresh=refresh, timeout=timeout)
+
     env = get_settings(profile)
+    if output == OutputFormat.JSON:
+        events = EventStream()
+        validate([deployment], events)
+        check_catalog(env, profile, [service_name], refresh=refresh, events=events)
+        estimate(profile, [service_name], events)
+        results = asyncio.run(
+            deploy_fleet(env.api_client, [deployment], polling_policy(env, timeout=timeout), events=events)
+        )
+        record(env, profile, [deployment], results)
+        return report(results, events)
+
+    validate([deployment])
+    check_catalog(env, profile, [service_name], refresh=refresh)
+    started_at = time.time()
     try:
         response = patch_service.sync_detailed(
             service=service_name,
@@ -57,42 +567,136 @@ def deploy(
                 f"Deployment successfully started for service [italic]{service_name}[/italic]",
                 style="green",
             )
-            return status(service_name=service_name, delay=5, profile=profile)
+            # recorded as pending, the status check completes it
+            log_deployments(
+                profile,
+                [deployment],
+                [DeploymentResult(service=service_name, state=DeploymentState.PENDING, started_at=started_at)],
+            )
+            succeeded = status(service_names=[service_name], profile=profile, timeout=timeout)
+            if succeeded is True:
+                record_deployments(
+                    profile,
+                    f"{env.api_base_url}/{env.api_version}",
+                    [deployment],
+                    [DeploymentResult(service=service_name, state=DeploymentState.SUCCEEDED)],
+                )
+            return succeeded
         else:
             content = json.loads(response.content)
             console.print(f"[ERROR] {content.get("error")}", style="red", new_line_start=True)
             raise Exception(f"Deployment failed with status {response.status_code}")
+    except typer.Exit:
+        raise  # exit code of the status check, e.g. EXIT_PENDING on timeout
     except Exception as e:
         console.print(e, overflow="fold", style="red")
-        return typer.Abort()
+        log_deployments(
+            profile,
+            [deployment],
+            [
+                DeploymentResult(
+                    service=service_name,
+                    state=DeploymentState.FAILED,
+                    message=str(e),
+                    started_at=started_at,
+                    finished_at=time.time(),
+                )
+            ],
+        )
+        raise typer.Exit(code=EXIT_FAILED)
 
 
 @app.command()
 def status(
-    service_name: str = typer.Argument(help="Name of the ECS service to check"),
-    delay: int = typer.Option(5, help="The delay to check if the ECS service status"),
+    service_names: list[str] = typer.Argument(
+        None, help="Names of the ECS services to check", autocompletion=complete_services
+    ),
+    delay: Annotated[
+        Optional[int], typer.Option(help="Fixed delay between status checks, adaptive polling is used if omitted")
+    ] = None,
     profile: str = typer.Option(help=f"Profile name from {str(CONFIG_FILE_PATH)}"),
+    all_services: Annotated[bool, typer.Option("--all", help="Check the status of all ECS services")] = False,
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of concurrent API requests")] = 10,
+    timeout: Annotated[Optional[float], typer.Option(help="Maximum time in seconds to wait for the deployment")] = None,
+    refresh: Annotated[bool, typer.Option(help="Refresh the local service catalog")] = False,
+    output: OutputOption = OutputFormat.TEXT,
 ) -> None:
     """
-    Get the status of an ECS service deployment
+    Get the status of ECS service deployments
+
+    A single service is polled until its deployment has settled, many services
+    (or --all) are checked once concurrently and reported in a table.
 
     Args:
-        service_name (str)
-        delay (int, optional):  Defaults to 5.
+        service_names (list[str])
+        delay (int, optional):  Defaults to the profile polling policy.
         profile (str, Optional): Profile name
+        all_services (bool, optional): Defaults to False.
+        concurrency (int, optional): Defaults to 10.
+        timeout (float, optional): Defaults to the profile polling timeout.
+        refresh (bool, optional): Defaults to False.
+        output (OutputFormat, optional): Defaults to text.
 
     Raises:
-        Exception
+        typer.Exit: If the deployment failed or is still pending
     """
+    import asyncio
+
+    from maws.clients.ecs_service_deployment_client.api.services import get_service
+    from maws.config import get_settings
+    from maws.fleet import DeploymentResult, DeploymentState, fleet_status
+    from maws.history import duration_stats, format_duration, log_status, pending_since
+    from maws.polling import StatusWaits
+
+    if not all_services and not service_names:
+        raise typer.BadParameter("Provide at least one service name or use --all")
+
     env = get_settings(profile)
+    events = EventStream() if output == OutputFormat.JSON else None
+    catalog = check_catalog(env, profile, [] if all_services else service_names, refresh=refresh, events=events)
+    policy = polling_policy(env, delay, timeout)
+    many = all_services or len(service_names) > 1
+    if many or events:
+        if all_services:
+            service_names = sorted(catalog.services) if catalog else None
+        try:
+            results = asyncio.run(
+                fleet_status(
+                    env.api_client,
+                    service_names,
+                    concurrency=concurrency,
+                    # a single service is watched until its deployment has settled
+                    policy=None if many else policy,
+                    events=events,
+                )
+            )
+        except Exception as e:
+            return fail(str(e), events)
+        log_status(profile, results)
+        return report(results, events, title="Deployment status")
+
+    service_name = service_names[0]
+    timed_out = succeeded = False
+    if stats := duration_stats(profile, [service_name]).get(service_name):
+        eta = (pending_since(profile, service_name) or time.time()) + stats.p50
+        console.print(
+            f"Deployments of [italic]{service_name}[/italic] usually take {format_duration(stats.p50)}"
+            f"{eta_text(eta)}",
+            style="dim",
+        )
     console.print(
         f"Checking deployment status for service [italic]{service_name}[/italic]",
         end="",
         style="cyan",
     )
+    result = DeploymentResult(service=service_name, state=DeploymentState.PENDING, started_at=time.time())
     try:
+        intervals = policy.intervals()
+        waits = StatusWaits(policy)
         while True:
-            response = get_service.sync_detailed(service=service_name, client=env.api_client)
+            response = get_service.sync_detailed(service=service_name, client=env.api_client, **waits.request())
+            result.polls += 1
+            result.status_code = response.status_code
             match response.status_code:
                 case HTTPStatus.ACCEPTED:
                     console.print(".", end="", style="cyan")
@@ -101,16 +705,633 @@ def status(
                         f"\nDeployment failed with status {response.status_code}.",
                         style="red",
                     )
+                    result.state = DeploymentState.FAILED
                     break
                 case HTTPStatus.OK:
                     console.print(
                         f"\nDeployment succeeded with status {response.status_code}.",
                         style="green",
                     )
+                    succeeded = True
+                    result.state = DeploymentState.SUCCEEDED
                     break
                 case _:
                     raise Exception(f"\nDeployment failed with status {response.status_code}.")
-            time.sleep(delay)
+            if (interval := next(intervals, None)) is None:
+                timed_out = True
+                break
+            if waits.pending(response.headers):
+                time.sleep(interval)
+    except Exception as e:
+        console.print(e, overflow="fold", style="red")
+        result.state, result.message, result.finished_at = DeploymentState.FAILED, str(e).strip(), time.time()
+        log_status(profile, [result])
+        raise typer.Exit(code=EXIT_FAILED)
+
+    if not timed_out:
+        result.finished_at = time.time()
+    log_status(profile, [result])
+    if timed_out:
+        console.print(f"\nDeployment still in progress after {policy.timeout}s.", style="yellow")
+        raise typer.Exit(code=EXIT_PENDING)
+    if not succeeded:
+        raise typer.Exit(code=EXIT_FAILED)
+    return succeeded
+
+
+@app.command()
+def watch(
+    service_names: list[str] = typer.Argument(
+        None, help="Names of the ECS services to watch, defaults to all services", autocompletion=complete_services
+    ),
+    profile: Annotated[Optional[str], typer.Option(help=f"Profile name from {str(CONFIG_FILE_PATH)}")] = None,
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of concurrent API requests")] = 10,
+    delay: Annotated[
+        Optional[int],
+        typer.Option(help="Fixed delay between status checks of deployments in progress, adaptive if omitted"),
+    ] = None,
+    settled_delay: Annotated[
+        float, typer.Option(min=1, help="Seconds before a settled service is checked again, doubled up to 10 times")
+    ] = 30,
+    until_settled: Annotated[bool, typer.Option(help="Exit once no deployment is in progress")] = False,
+    refresh: Annotated[bool, typer.Option(help="Refresh the local service catalog")] = False,
+    output: OutputOption = OutputFormat.TEXT,
+) -> None:
+    """
+    Watch the deployment state of many ECS services in a live table
+
+    Deployments in progress are polled, settled services are checked again
+    with a growing delay and only changed rows are rendered again.
+
+    Args:
+        service_names (list[str], optional): Defaults to all services.
+        profile (str, Optional): Profile name
+        concurrency (int, optional): Defaults to 10.
+        delay (int, optional): Defaults to the profile polling policy.
+        settled_delay (float, optional): Defaults to 30.
+        until_settled (bool, optional): Defaults to False.
+        refresh (bool, optional): Defaults to False.
+        output (OutputFormat, optional): Defaults to text.
+
+    Raises:
+        typer.Exit: With the outcome of the deployments if `--until-settled` is given
+    """
+    import asyncio
+
+    from rich.live import Live
+
+    from maws.config import get_settings
+    from maws.dashboard import Dashboard
+    from maws.watch import FleetWatcher
+
+    env = get_settings(profile)
+    events = EventStream() if output == OutputFormat.JSON else None
+    catalog = check_catalog(env, profile, service_names or [], refresh=refresh, events=events)
+    if not service_names and catalog:
+        service_names = sorted(catalog.services)
+    watcher = FleetWatcher(
+        env.api_client,
+        service_names or None,
+        polling_policy(env, delay),
+        concurrency=concurrency,
+        settled_delay=settled_delay,
+        settled_max_delay=settled_delay * 10,
+        events=events,
+    )
+
+    try:
+        if events:
+            results = asyncio.run(watcher.watch(lambda changes: None, until_settled=until_settled))
+        else:
+            dashboard = Dashboard(STATE_STYLES)
+            with Live(dashboard, console=console, auto_refresh=False) as live:
+
+                def redraw(changes: list["DeploymentResult"]) -> None:
+                    dashboard.update(changes, watcher.checks)
+                    live.refresh()
+
+                results = asyncio.run(watcher.watch(redraw, until_settled=until_settled))
+    except KeyboardInterrupt:
+        return
+    except Exception as e:
+        fail(str(e), events)
+
+    if until_settled:
+        counts = count_states(list(results.values()))
+        if events:
+            events.emit("summary", **counts)
+        exit_with(counts)
+
+
+def print_summary(
+    results: list["DeploymentResult"], title: str = "Deployment summary", column: str = "Service"
+) -> None:
+    """
+    Print a per-service deployment summary
+
+    Args:
+        results (list[DeploymentResult])
+        title (str, optional): Defaults to "Deployment summary".
+        column (str, optional): Header of the name column. Defaults to "Service".
+    """
+    from rich.table import Table
+
+    table = Table(title=title)
+    table.add_column(column, style="italic")
+    table.add_column("Result")
+    table.add_column("Status")
+    table.add_column("Message", overflow="fold")
+    for result in results:
+        table.add_row(
+            result.service,
+            f"[{STATE_STYLES[result.state]}]{result.state}[/]",
+            str(result.status_code or "-"),
+            result.message,
+        )
+    console.print(table)
+
+
+@app.command("deploy-many")
+def deploy_many(
+    manifest: Path = typer.Argument(
+        help="YAML, TOML or JSON manifest with the services to be updated",
+        exists=True,
+        dir_okay=False,
+    ),
+    concurrency: int = typer.Option(10, min=1, help="Maximum number of concurrent API requests"),
+    delay: int = typer.Option(
+        None,
+        help="Fixed delay between status checks, adaptive polling is used if omitted",
+    ),
+    timeout: float = typer.Option(None, help="Maximum time in seconds to wait for the deployments"),
+    profile: ProfilesOption = None,
+    refresh: Annotated[bool, typer.Option(help="Refresh the local service catalog")] = False,
+    resume: ResumeOption = False,
+    output: OutputOption = OutputFormat.TEXT,
+) -> None:
+    """
+    Deploy many ECS services concurrently from a manifest
+
+    Args:
+        manifest (Path)
+        concurrency (int, optional): Defaults to 10.
+        delay (int, optional): Defaults to the profile polling policy.
+        timeout (float, optional): Defaults to the profile polling timeout.
+        profile (str, Optional): Profile name
+        refresh (bool, optional): Defaults to False.
+        resume (bool, optional): Defaults to False.
+        output (OutputFormat, optional): Defaults to text.
+
+    Raises:
+        typer.Exit: If any deployment failed or timed out
+    """
+    import asyncio
+
+    from maws.config import get_settings, is_profile_pattern
+    from maws.fleet import deploy_fleet
+    from maws.manifest import load_manifest
+
+    events = EventStream() if output == OutputFormat.JSON else None
+    try:
+        deployments = load_manifest(manifest)
+    except Exception as e:
+        fail(str(e), events)
+    validate(deployments, events)
+    if is_profile_pattern(profile):
+        if resume:
+            fail("--resume supports a single profile", events)
+        return deploy_to_profiles(
+            profile,
+            deployments,
+            output=output,
+            refresh=refresh,
+            delay=delay,
+            timeout=timeout,
+            concurrency=concurrency,
+        )
+
+    env = get_settings(profile)
+    check_catalog(env, profile, [deployment.name for deployment in deployments], refresh=refresh, events=events)
+
+    policy = polling_policy(env, delay, timeout)
+    journal, remaining, reattach = open_journal(env, profile, "deploy-many", manifest, deployments, events, resume)
+    eta = estimate(profile, [deployment.name for deployment in remaining], events)
+
+    arguments = {"concurrency": concurrency, "events": journal, "reattach": reattach}
+    if events:
+        results = asyncio.run(deploy_fleet(env.api_client, remaining, policy, **arguments))
+    else:
+        with console.status(f"Deploying {len(remaining)} services{eta_text(eta)}", spinner="dots"):
+            results = asyncio.run(deploy_fleet(env.api_client, remaining, policy, **arguments))
+    report(close_journal(journal, env, profile, deployments, results, events), events)
+
+
+@app.command()
+def rollout(
+    manifest: Path = typer.Argument(
+        help="YAML, TOML or JSON manifest with the services, their dependencies and waves",
+        exists=True,
+        dir_okay=False,
+    ),
+    concurrency: int = typer.Option(10, min=1, help="Maximum number of concurrent API requests"),
+    delay: int = typer.Option(
+        None,
+        help="Fixed delay between status checks, adaptive polling is used if omitted",
+    ),
+    timeout: float = typer.Option(None, help="Maximum time in seconds to wait for each deployment"),
+    profile: str = typer.Option(None, help=f"Profile name from {str(CONFIG_FILE_PATH)}"),
+    refresh: Annotated[bool, typer.Option(help="Refresh the local service catalog")] = False,
+    resume: ResumeOption = False,
+    output: OutputOption = OutputFormat.TEXT,
+) -> None:
+    """
+    Deploy ECS services in dependency order from a manifest
+
+    A service is deployed as soon as its prerequisites have succeeded, no
+    further deployments are started after a failure.
+
+    Args:
+        manifest (Path)
+        concurrency (int, optional): Defaults to 10.
+        delay (int, optional): Defaults to the profile polling policy.
+        timeout (float, optional): Defaults to the profile polling timeout.
+        profile (str, Optional): Profile name
+        refresh (bool, optional): Defaults to False.
+        resume (bool, optional): Defaults to False.
+        output (OutputFormat, optional): Defaults to text.
+
+    Raises:
+        typer.Exit: If any deployment failed, timed out or was skipped
+    """
+    import asyncio
+
+    from maws.config import get_settings
+    from maws.manifest import load_manifest
+    from maws.rollout import deploy_rollout, rollout_graph
+
+    env = get_settings(profile)
+    events = EventStream() if output == OutputFormat.JSON else None
+    try:
+        deployments = load_manifest(manifest)
+        graph = rollout_graph(deployments)
+    except Exception as e:
+        fail(str(e), events)
+    validate(deployments, events)
+    check_catalog(env, profile, [deployment.name for deployment in deployments], refresh=refresh, events=events)
+
+    policy = polling_policy(env, delay, timeout)
+    journal, remaining, reattach = open_journal(env, profile, "rollout", manifest, deployments, events, resume)
+    if len(remaining) < len(deployments):
+        graph = rollout_graph(remaining)
+    eta = estimate(profile, [deployment.name for deployment in remaining], events, graph)
+
+    arguments = {"concurrency": concurrency, "events": journal, "reattach": reattach}
+    if events:
+        results = asyncio.run(deploy_rollout(env.api_client, remaining, policy, **arguments))
+    else:
+        with console.status(f"Rolling out {len(remaining)} services{eta_text(eta)}", spinner="dots"):
+            results = asyncio.run(deploy_rollout(env.api_client, remaining, policy, **arguments))
+    report(close_journal(journal, env, profile, deployments, results, events), events, title="Rollout summary")
+
+
+def load_plan(
+    env: "Settings", profile: Optional[str], manifest: Path, events: Optional[EventStream] = None
+) -> list["PlannedDeployment"]:
+    """
+    Compare a manifest with the deployment state of a profile
+
+    Args:
+        env (Settings)
+        profile (str | None): Profile name
+        manifest (Path)
+        events (EventStream, optional): Emit a `plan` event per service instead of printing a table
+
+    Raises:
+        typer.Exit: If the manifest is invalid
+
+    Returns:
+        list[PlannedDeployment]
+    """
+    from rich.table import Table
+
+    from maws.manifest import load_manifest
+    from maws.rollout import rollout_graph
+    from maws.state import PlanAction, load_state, plan_deployments
+
+    try:
+        deployments = load_manifest(manifest)
+        rollout_graph(deployments)
+    except Exception as e:
+        fail(str(e), events)
+    validate(deployments, events)
+    plan = plan_deployments(deployments, load_state(profile, f"{env.api_base_url}/{env.api_version}"))
+
+    if events:
+        for planned in plan:
+            events.emit(
+                "plan",
+                planned.deployment.name,
+                action=planned.action,
+                image=planned.deployment.image,
+                previous_image=planned.previous.image if planned.previous else None,
+            )
+        return plan
+
+    table = Table(title="Deployment plan")
+    table.add_column("Service", style="italic")
+    table.add_column("Action")
+    table.add_column("Image")
+    for planned in plan:
+        image = planned.deployment.image
+        if planned.action == PlanAction.UPDATE and planned.previous.image != image:
+            image = f"{planned.previous.image} -> {image}"
+        table.add_row(planned.deployment.name, f"[{PLAN_STYLES[planned.action]}]{planned.action}[/]", image)
+    console.print(table)
+    changed = sum(planned.changed for planned in plan)
+    console.print(f"{changed} to deploy, {len(plan) - changed} unchanged")
+    return plan
+
+
+@app.command()
+def plan(
+    manifest: Path = typer.Argument(
+        help="YAML, TOML or JSON manifest with the services to be updated",
+        exists=True,
+        dir_okay=False,
+    ),
+    profile: str = typer.Option(None, help=f"Profile name from {str(CONFIG_FILE_PATH)}"),
+    output: OutputOption = OutputFormat.TEXT,
+) -> None:
+    """
+    Show which services of a manifest differ from their last deployment by maws
+
+    Args:
+        manifest (Path)
+        profile (str, Optional): Profile name
+        output (OutputFormat, optional): Defaults to text.
+    """
+    from maws.config import get_settings
+
+    env = get_settings(profile)
+    load_plan(env, profile, manifest, EventStream() if output == OutputFormat.JSON else None)
+
+
+@app.command()
+def apply(
+    manifest: Path = typer.Argument(
+        help="YAML, TOML or JSON manifest with the services to be updated",
+        exists=True,
+        dir_okay=False,
+    ),
+    concurrency: int = typer.Option(10, min=1, help="Maximum number of concurrent API requests"),
+    delay: int = typer.Option(
+        None,
+        help="Fixed delay between status checks, adaptive polling is used if omitted",
+    ),
+    timeout: float = typer.Option(None, help="Maximum time in seconds to wait for the deployments"),
+    profile: str = typer.Option(None, help=f"Profile name from {str(CONFIG_FILE_PATH)}"),
+    refresh: Annotated[bool, typer.Option(help="Refresh the local service catalog")] = False,
+    resume: ResumeOption = False,
+    output: OutputOption = OutputFormat.TEXT,
+) -> None:
+    """
+    Deploy only the services of a manifest which differ from their last deployment by maws
+
+    Dependencies and waves are honoured between the changed services,
+    unchanged prerequisites count as deployed.
+
+    Args:
+        manifest (Path)
+        concurrency (int, optional): Defaults to 10.
+        delay (int, optional): Defaults to the profile polling policy.
+        timeout (float, optional): Defaults to the profile polling timeout.
+        profile (str, Optional): Profile name
+        refresh (bool, optional): Defaults to False.
+        resume (bool, optional): Defaults to False.
+        output (OutputFormat, optional): Defaults to text.
+
+    Raises:
+        typer.Exit: If any deployment failed or timed out
+    """
+    import asyncio
+
+    from maws.config import get_settings
+    from maws.fleet import deploy_fleet
+    from maws.rollout import deploy_rollout, rollout_graph
+
+    env = get_settings(profile)
+    events = EventStream() if output == OutputFormat.JSON else None
+    plan = [planned for planned in load_plan(env, profile, manifest, events) if planned.changed]
+    names = {planned.deployment.name for planned in plan}
+    deployments = [
+        planned.deployment.model_copy(
+            update={"depends_on": [name for name in planned.deployment.depends_on if name in names]}
+        )
+        for planned in plan
+    ]
+    if not deployments:
+        if not events:
+            console.print("No changes to deploy", style="green")
+        return report([], events)
+    check_catalog(env, profile, list(names), refresh=refresh, events=events)
+
+    policy = polling_policy(env, delay, timeout)
+    ordered = any(deployment.depends_on or deployment.wave is not None for deployment in deployments)
+    deploy = deploy_rollout if ordered else deploy_fleet
+    journal, remaining, reattach = open_journal(env, profile, "apply", manifest, deployments, events, resume)
+    eta = estimate(
+        profile,
+        [deployment.name for deployment in remaining],
+        events,
+        rollout_graph(remaining) if ordered else None,
+    )
+
+    arguments = {"concurrency": concurrency, "events": journal, "reattach": reattach}
+    if events:
+        results = asyncio.run(deploy(env.api_client, remaining, policy, **arguments))
+    else:
+        with console.status(f"Deploying {len(remaining)} changed services{eta_text(eta)}", spinner="dots"):
+            results = asyncio.run(deploy(env.api_client, remaining, policy, **arguments))
+    report(close_journal(journal, env, profile, deployments, results, events), events)
+
+
+@app.command()
+def history(
+    service_names: list[str] = typer.Argument(
+        None, help="Names of the ECS services, defaults to all recorded services", autocompletion=complete_services
+    ),
+    profile: Annotated[Optional[str], typer.Option(help=f"Profile name from {str(CONFIG_FILE_PATH)}")] = None,
+    limit: Annotated[int, typer.Option(min=1, help="Number of recent deployments per service")] = 50,
+    output: OutputOption = OutputFormat.TEXT,
+) -> None:
+    """
+    Show how long the deployments of ECS services took, from the deployment request until they succeeded
+
+    Args:
+        service_names (list[str], optional): Defaults to all recorded services.
+        profile (str, Optional): Profile name
+        limit (int, optional): Defaults to 50.
+        output (OutputFormat, optional): Defaults to text.
+    """
+    from rich.table import Table
+
+    from maws.history import duration_stats, format_duration
+
+    stats = duration_stats(profile, service_names or None, limit=limit)
+    if output == OutputFormat.JSON:
+        events = EventStream()
+        for service in sorted(stats):
+            row = stats[service]
+            events.emit(
+                "history",
+                service,
+                deployments=row.deployments,
+                failed=row.failed,
+                p50=round(row.p50, 3),
+                p95=round(row.p95, 3),
+                last=round(row.last, 3),
+            )
+        return
+    if not stats:
+        console.print("No deployments recorded yet", style="yellow")
+        return
+
+    table = Table(title="Deployment durations")
+    table.add_column("Service", style="italic")
+    table.add_column("Deployments", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("Last", justify="right")
+    for service in sorted(stats):
+        row = stats[service]
+        # a last deployment beyond the 95th percentile hints at rollouts getting slower
+        last_style = "yellow" if row.last > row.p95 else ""
+        table.add_row(
+            service,
+            str(row.deployments),
+            f"[red]{row.failed}[/]" if row.failed else "0",
+            format_duration(row.p50),
+            format_duration(row.p95),
+            f"[{last_style}]{format_duration(row.last)}[/]" if last_style else format_duration(row.last),
+        )
+    console.print(table)
+
+
+@task_app.command("deploy")
+def task_deploy(
+    task_name: str = typer.Argument(help="The name of the scheduled task to be updated", autocompletion=complete_tasks),
+    image: str = typer.Argument(help="The container image to use for the task"),
+    profile: str = typer.Option(None, help=f"Profile name from {str(CONFIG_FILE_PATH)}"),
+    refresh: Annotated[bool, typer.Option(help="Refresh the local task catalog")] = False,
+) -> None:
+    """
+    ECS Scheduled Task Deployment Request
+
+    Args:
+        task_name (str)
+        image (str)
+        profile (str, Optional): Profile name
+        refresh (bool, Optional): Defaults to False.
+
+    Raises:
+        typer.Exit: If the update failed
+    """
+    from maws.clients.ecs_service_deployment_client.api.tasks import patch_task
+    from maws.clients.ecs_service_deployment_client.models import TaskDeploymentRequest
+    from maws.config import get_settings
+    from maws.manifest import TaskDeployment
+
+    env = get_settings(profile)
+    validate([TaskDeployment(name=task_name, image=image)], schema="TaskDeploymentRequest")
+    check_catalog(env, profile, [task_name], kind="tasks", refresh=refresh)
+    try:
+        response = patch_task.sync_detailed(
+            task=task_name,
+            client=env.api_client,
+            body=TaskDeploymentRequest(image=image),
+        )
+        if response.status_code != HTTPStatus.CREATED:
+            content = json.loads(response.content or b"{}")
+            console.print(f"[ERROR] {content.get("error")}", style="red", new_line_start=True)
+            raise Exception(f"Update failed with status {response.status_code}")
+    except Exception as e:
+        console.print(e, overflow="fold", style="red")
+        raise typer.Exit(code=EXIT_FAILED)
+    console.print(f"Task [italic]{task_name}[/italic] updated to [italic]{image}[/italic]", style="green")
+
+
+@task_app.command("deploy-many")
+def task_deploy_many(
+    manifest: Path = typer.Argument(
+        help="YAML, TOML or JSON manifest with the tasks to be updated",
+        exists=True,
+        dir_okay=False,
+    ),
+    concurrency: Annotated[int, typer.Option(min=1, help="Maximum number of concurrent API requests")] = 10,
+    profile: Annotated[Optional[str], typer.Option(help=f"Profile name from {str(CONFIG_FILE_PATH)}")] = None,
+    refresh: Annotated[bool, typer.Option(help="Refresh the local task catalog")] = False,
+) -> None:
+    """
+    Update many ECS scheduled tasks concurrently from a manifest
+
+    Args:
+        manifest (Path)
+        concurrency (int, optional): Defaults to 10.
+        profile (str, Optional): Profile name
+        refresh (bool, optional): Defaults to False.
+
+    Raises:
+        typer.Exit: If any update failed
+    """
+    import asyncio
+
+    from maws.config import get_settings
+    from maws.fleet import deploy_tasks
+    from maws.manifest import load_task_manifest
+
+    env = get_settings(profile)
+    try:
+        deployments = load_task_manifest(manifest)
+    except Exception as e:
+        console.print(e, overflow="fold", style="red")
+        raise typer.Exit(code=EXIT_FAILED)
+    validate(deployments, schema="TaskDeploymentRequest")
+    check_catalog(env, profile, [deployment.name for deployment in deployments], kind="tasks", refresh=refresh)
+
+    with console.status(f"Updating {len(deployments)} tasks", spinner="dots"):
+        results = asyncio.run(deploy_tasks(env.api_client, deployments, concurrency=concurrency))
+
+    print_summary(results, column="Task")
+    if any(result.failed for result in results):
+        raise typer.Exit(code=EXIT_FAILED)
+
+
+@task_app.command("list")
+def task_list(
+    profile: Annotated[Optional[str], typer.Option(help=f"Profile name from {str(CONFIG_FILE_PATH)}")] = None,
+) -> None:
+    """
+    List the available ECS scheduled tasks
+
+    Args:
+        profile (str, Optional): Profile name
+
+    Raises:
+        typer.Exit: If the tasks cannot be listed
+    """
+    from maws.clients.ecs_service_deployment_client.api.tasks import get_tasks
+    from maws.config import get_settings
+    from maws.fleet import parse_names
+
+    env = get_settings(profile)
+    try:
+        response = get_tasks.sync_detailed(client=env.api_client)
+        if response.status_code != HTTPStatus.OK:
+            raise Exception(f"Listing tasks failed with status {response.status_code}")
+        names = parse_names(response.content, "tasks")
     except Exception as e:
         console.print(e, overflow="fold", style="red")
-        return typer.Abort()
+        raise typer.Exit(code=EXIT_FAILED)
+    for name in sorted(names):
+        console.print(name, highlight=False)
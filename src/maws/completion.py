@@ -0,0 +1,114 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from maws import cache_dir
+
+# Minimum seconds between two background refreshes of the same catalog
+REFRESH_INTERVAL = 60
+
+
+def catalog_path(profile: Optional[str] = None) -> Path:
+    """
+    Get the path of the catalog cache of a profile
+
+    Args:
+        profile (str, optional): Defaults to None.
+
+    Returns:
+        Path
+    """
+    return cache_dir() / "catalog" / f"{profile or 'default'}.json"
+
+
+def read_catalog(profile: Optional[str]) -> dict:
+    """
+    Read the raw cached catalog of a profile
+
+    Args:
+        profile (str | None)
+
+    Returns:
+        dict: Empty if there is no cached catalog
+    """
+    try:
+        data = json.loads(catalog_path(profile).read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def refresh_in_background(profile: Optional[str]) -> None:
+    """
+    Refresh the catalog of a profile in a detached child process
+
+    Refreshes are throttled by a marker file so a burst of completion requests
+    spawns a single refresh. Platforms without `fork` are skipped.
+
+    Args:
+        profile (str | None)
+    """
+    marker = catalog_path(profile).with_suffix(".refresh")
+    try:
+        if time.time() - marker.stat().st_mtime < REFRESH_INTERVAL:
+            return
+    except OSError:
+        pass
+    if not hasattr(os, "fork"):
+        return
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+        pid = os.fork()
+    except OSError:
+        return
+    if pid:
+        return
+
+    # child: detach from the shell, which waits for the completion output to be closed
+    try:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+
+        from maws.catalog import get_catalog
+        from maws.config import get_settings
+
+        get_catalog(get_settings(profile), profile, refresh=True)
+    finally:
+        os._exit(0)
+
+
+def complete_names(ctx: typer.Context, incomplete: str, kind: str) -> list[str]:
+    """
+    Complete resource names from the cached catalog of the selected profile
+
+    Never touches the API: a missing or expired catalog triggers a background
+    refresh and the cached names (if any) are returned right away.
+
+    Args:
+        ctx (typer.Context)
+        incomplete (str): Prefix typed so far
+        kind (str): `services` or `tasks`
+
+    Returns:
+        list[str]
+    """
+    profile = ctx.params.get("profile")
+    catalog = read_catalog(profile)
+    if time.time() - catalog.get("updated_at", 0) >= catalog.get("ttl", 300):
+        refresh_in_background(profile)
+    return sorted(name for name in catalog.get(kind, []) if name.startswith(incomplete))
+
+
+def complete_services(ctx: typer.Context, incomplete: str) -> list[str]:
+    return complete_names(ctx, incomplete, "services")
+
+
+def complete_tasks(ctx: typer.Context, incomplete: str) -> list[str]:
+    return complete_names(ctx, incomplete, "tasks")
@@ -1,21 +1,61 @@
+import atexit
+import fnmatch
+import hashlib
+import json
 import os
+import threading
 import tomllib
-from pathlib import Path
-from typing import Optional
+from contextlib import asynccontextmanager
+from importlib.util import find_spec
+from typing import AsyncIterator, Optional
 
+import httpx
 from pydantic_settings import BaseSettings
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
 
 from maws.clients.ecs_service_deployment_client import AuthenticatedClient
+from maws.httpcache import CacheTransport, HttpCache
+from maws.polling import PollingPolicy
+from maws.ratelimit import RateLimiter, RateLimitTransport
+from maws.retry import CircuitBreaker, RetryPolicy, RetryTransport
+from maws.tracing import TracingTransport
 
-from . import __app_name__, __version__
+from . import CONFIG_FILE_PATH, __app_name__, __version__, cache_dir
 
-CONFIG_FILE_PATH = Path.home() / ".skaylink" / "profile.toml"
+POLLING_KEYS = ("POLL_INITIAL_DELAY", "POLL_MAX_DELAY", "POLL_MULTIPLIER", "POLL_JITTER", "POLL_TIMEOUT", "POLL_WAIT")
+CATALOG_KEYS = ("CATALOG_TTL",)
+HTTP_KEYS = (
+    "HTTP_TIMEOUT",
+    "HTTP_MAX_CONNECTIONS",
+    "HTTP_MAX_KEEPALIVE_CONNECTIONS",
+    "HTTP_KEEPALIVE_EXPIRY",
+    "HTTP2",
+    "HTTP_CACHE",
+)
+RETRY_KEYS = (
+    "RETRY_ATTEMPTS",
+    "RETRY_INITIAL_DELAY",
+    "RETRY_MAX_DELAY",
+    "CIRCUIT_FAILURE_THRESHOLD",
+    "CIRCUIT_RESET_TIMEOUT",
+)
+RATE_LIMIT_KEYS = ("RATE_LIMIT", "RATE_LIMIT_BURST")
+
+# Characters of a profile option selecting several profiles
+PROFILE_PATTERN_CHARS = ",*?["
+
+# Seconds of HTTP_TIMEOUT left for the response of a held status check
+LONG_POLL_MARGIN = 5
+
+_api_clients: dict[tuple, AuthenticatedClient] = {}
+_rate_limiters: dict[tuple[str, float, float], RateLimiter] = {}
+_api_clients_lock = threading.Lock()
 
 
 def show_config_help():
+    from rich.console import Console
+    from rich.panel import Panel
+    from rich.text import Text
+
     console = Console()
 
     help_text = Text()
@@ -48,11 +88,10 @@ def load_profile(name: str = None) -> dict:
         show_config_help()
         raise SystemExit(1)
 
-    with open(CONFIG_FILE_PATH, "rb") as f:
-        data = tomllib.load(f)
-
-    profiles = data.get("profiles", {})
+    profiles = registry.profiles()
     if name not in profiles:
+        from rich.console import Console
+
         console = Console()
         console.print(f"Profile '{name}' not found in {CONFIG_FILE_PATH}", style="red")
         console.print(f"Available profiles: {', '.join(profiles.keys())}", style="yellow")
@@ -61,10 +100,71 @@ def load_profile(name: str = None) -> dict:
     return profiles.get(name)
 
 
+def is_profile_pattern(profile: Optional[str]) -> bool:
+    """
+    Check whether a profile option selects several profiles, e.g. `prod-*` or `dev,staging`
+
+    Args:
+        profile (str | None)
+
+    Returns:
+        bool
+    """
+    return bool(profile) and any(char in profile for char in PROFILE_PATTERN_CHARS)
+
+
+def match_profiles(pattern: str) -> list[str]:
+    """
+    Get the profiles selected by a comma separated list of names and globs
+
+    Args:
+        pattern (str): e.g. `prod-*,staging`
+
+    Raises:
+        ValueError: If a name or glob matches no profile
+
+    Returns:
+        list[str]: Profile names in the order of the patterns and the profile file, without duplicates
+    """
+    if not CONFIG_FILE_PATH.exists():
+        show_config_help()
+        raise SystemExit(1)
+
+    profiles = list(registry.profiles())
+    selected = []
+    for part in filter(None, (part.strip() for part in pattern.split(","))):
+        matches = [name for name in profiles if fnmatch.fnmatchcase(name, part)]
+        if not matches:
+            raise ValueError(f"No profile matches '{part}', available profiles: {', '.join(profiles)}")
+        selected += [name for name in matches if name not in selected]
+    return selected
+
+
 class DotEnvSettings(BaseSettings):
-    api_version: str = os.getenv("API_VERSION", "v1")
-    api_base_url: Optional[str] = os.getenv("API_BASE_URL")
-    api_access_token: Optional[str] = os.getenv("API_ACCESS_TOKEN")
+    # read from the environment on construction, the agent runs commands with the environment of their caller
+    api_version: str = "v1"
+    api_base_url: Optional[str] = None
+    api_access_token: Optional[str] = None
+    poll_initial_delay: float = 1
+    poll_max_delay: float = 15
+    poll_multiplier: float = 2
+    poll_jitter: float = 0.2
+    poll_timeout: Optional[float] = None
+    poll_wait: float = 20
+    http_timeout: float = 30
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30
+    http2: bool = False
+    http_cache: bool = True
+    retry_attempts: int = 3
+    retry_initial_delay: float = 0.5
+    retry_max_delay: float = 30
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30
+    catalog_ttl: float = 300
+    rate_limit: float = 0
+    rate_limit_burst: float = 0
 
 
 class Settings(DotEnvSettings):
@@ -85,25 +185,238 @@ class Settings(DotEnvSettings):
             cls.api_access_token = data.get("API_ACCESS_TOKEN")
             if data.get("API_VERSION"):
                 cls.api_version = data.get("API_VERSION")
+            for key in POLLING_KEYS + HTTP_KEYS + RETRY_KEYS + RATE_LIMIT_KEYS + CATALOG_KEYS:
+                if key in data:
+                    setattr(cls, key.lower(), data.get(key))
 
     @property
     def api_client(cls) -> AuthenticatedClient:
         """
-        Get API client
+        Get the pooled API client
+
+        The client is created once per base URL, token and HTTP, retry and rate
+        limit settings and shared by every caller in the process, so connections
+        are kept alive between requests. Transient failures are retried and a
+        circuit breaker shared by all requests of the client rejects requests
+        while the API is down. All clients of a base URL with the same rate
+        limit draw from one rate limiter. With HTTP_CACHE,
+        listings and status checks are revalidated with the API instead of
+        downloaded again if they have not changed.
 
         Returns:
             AuthenticatedClient
         """
-        return AuthenticatedClient(
-            base_url=f"{cls.api_base_url}/{cls.api_version}",
-            token=cls.api_access_token,
-            auth_header_name="x-api-token",
-            prefix="",
+        base_url = f"{cls.api_base_url}/{cls.api_version}"
+        # profiles sharing an endpoint and token may still configure the transport differently
+        transport_keys = HTTP_KEYS + RETRY_KEYS + RATE_LIMIT_KEYS
+        key = (base_url, cls.api_access_token, *(getattr(cls, name.lower()) for name in transport_keys))
+        limiter_key = (base_url, cls.rate_limit, cls.rate_limit_burst)
+        with _api_clients_lock:
+            if key not in _api_clients:
+                if limiter_key not in _rate_limiters:
+                    _rate_limiters[limiter_key] = RateLimiter(cls.rate_limit or None, cls.rate_limit_burst or None)
+                limiter = _rate_limiters[limiter_key]
+                transport_args = {
+                    "limits": httpx.Limits(
+                        max_connections=cls.http_max_connections,
+                        max_keepalive_connections=cls.http_max_keepalive_connections,
+                        keepalive_expiry=cls.http_keepalive_expiry,
+                    ),
+                    # HTTP/2 requires the optional h2 package
+                    "http2": cls.http2 and find_spec("h2") is not None,
+                }
+                transport = RetryTransport(
+                    # every attempt is paced and gets its own span if --trace is active
+                    lambda: RateLimitTransport(TracingTransport(httpx.HTTPTransport(**transport_args)), limiter),
+                    lambda: RateLimitTransport(TracingTransport(httpx.AsyncHTTPTransport(**transport_args)), limiter),
+                    policy=cls.retry_policy,
+                    breaker=CircuitBreaker(cls.circuit_failure_threshold, cls.circuit_reset_timeout),
+                )
+                if cls.http_cache:
+                    # responses differ per token, so every client keeps its own entries
+                    digest = hashlib.sha256(f"{base_url}\n{cls.api_access_token}".encode()).hexdigest()
+                    transport = CacheTransport(transport, HttpCache(cache_dir() / "http" / digest[:16]))
+                _api_clients[key] = AuthenticatedClient(
+                    base_url=base_url,
+                    token=cls.api_access_token,
+                    auth_header_name="x-api-token",
+                    prefix="",
+                    timeout=httpx.Timeout(cls.http_timeout),
+                    httpx_args={"transport": transport},
+                )
+            return _api_clients[key]
+
+    @property
+    def retry_policy(cls) -> RetryPolicy:
+        """
+        Get the retry policy of transient API failures
+
+        Returns:
+            RetryPolicy
+        """
+        return RetryPolicy(
+            attempts=cls.retry_attempts,
+            initial_delay=cls.retry_initial_delay,
+            max_delay=cls.retry_max_delay,
         )
 
+    @property
+    def polling_policy(cls) -> PollingPolicy:
+        """
+        Get the deployment status polling policy
+
+        Returns:
+            PollingPolicy
+        """
+        return PollingPolicy(
+            initial_delay=cls.poll_initial_delay,
+            max_delay=cls.poll_max_delay,
+            multiplier=cls.poll_multiplier,
+            jitter=cls.poll_jitter,
+            timeout=cls.poll_timeout,
+            # a held status check has to be answered well within the HTTP timeout
+            max_wait=max(0, min(cls.poll_wait, cls.http_timeout - LONG_POLL_MARGIN)),
+        )
+
+
+class ProfileRegistry:
+    """
+    Process-wide cache of parsed profiles and settings
+
+    The profile file is parsed once per process and settings are built once
+    per profile. Both are additionally kept in an on-disk cache keyed by the
+    modification time and size of the profile file (and the relevant
+    environment variables), so repeated invocations skip TOML parsing and
+    settings validation entirely. The cache holds API tokens and is therefore
+    only readable by the current user.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._file_key: Optional[list] = None
+        self._profiles: dict = {}
+        self._compiled: dict[str, dict] = {}
+        self._settings: dict[str, Settings] = {}
+
+    @property
+    def cache_path(self):
+        return cache_dir() / "profiles.json"
+
+    def profiles(self) -> dict:
+        """
+        Get the parsed profiles of the profile file
+
+        Returns:
+            dict
+        """
+        with self._lock:
+            stat = CONFIG_FILE_PATH.stat()
+            file_key = [str(CONFIG_FILE_PATH), stat.st_mtime_ns, stat.st_size]
+            if file_key != self._file_key:
+                self._load(file_key)
+            return self._profiles
+
+    def settings(self, profile: str = None) -> "Settings":
+        """
+        Get the settings of a profile
+
+        Args:
+            profile (str, optional): Defaults to None.
+
+        Returns:
+            Settings
+        """
+        with self._lock:
+            if profile and CONFIG_FILE_PATH.exists():
+                self.profiles()
+            env = sorted((k, v) for k, v in os.environ.items() if k.lower() in Settings.model_fields)
+            key = hashlib.sha256(json.dumps([profile, self._file_key if profile else None, env]).encode()).hexdigest()
+
+            if key not in self._settings:
+                if profile and key in self._compiled:
+                    self._settings[key] = Settings.model_construct(**self._compiled[key])
+                else:
+                    self._settings[key] = Settings(profile=profile)
+                    if profile:
+                        self._compiled[key] = self._settings[key].model_dump(mode="json")
+                        self._save()
+            return self._settings[key]
+
+    def clear(self) -> None:
+        """
+        Forget all cached profiles and settings of the process
+        """
+        with self._lock:
+            self._file_key = None
+            self._profiles = {}
+            self._compiled = {}
+            self._settings = {}
+
+    def _load(self, file_key: list) -> None:
+        try:
+            cache = json.loads(self.cache_path.read_text())
+            if cache["file"] != file_key:
+                raise ValueError("Profile file has changed")
+            self._profiles, self._compiled = cache["profiles"], cache["settings"]
+        except (OSError, ValueError, KeyError):
+            with open(CONFIG_FILE_PATH, "rb") as f:
+                self._profiles = tomllib.load(f).get("profiles", {})
+            self._compiled = {}
+        self._file_key = file_key
+        self._settings = {}
+
+    def _save(self) -> None:
+        cache = {"file": self._file_key, "profiles": self._profiles, "settings": self._compiled}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass  # the cache is an optimization only
+
+
+registry = ProfileRegistry()
+
 
 def get_settings(profile: str = None):
-    return Settings(profile=profile)
+    return registry.settings(profile)
+
+
+@asynccontextmanager
+async def async_session(client: AuthenticatedClient) -> AsyncIterator[AuthenticatedClient]:
+    """
+    Share the async connection pool of a client within the running event loop
+
+    The async pool is bound to its event loop, so it is closed on exit and
+    recreated by the next event loop using the client.
+
+    Args:
+        client (AuthenticatedClient)
+
+    Yields:
+        AuthenticatedClient
+    """
+    try:
+        yield client
+    finally:
+        await client.get_async_httpx_client().aclose()
+        client.set_async_httpx_client(None)
+
+
+def close_api_clients() -> None:
+    """
+    Close the connection pools of all API clients
+    """
+    with _api_clients_lock:
+        for client in _api_clients.values():
+            # only close pools which have actually been opened
+            if client._client is not None:
+                client.get_httpx_client().close()
+        _api_clients.clear()
+        _rate_limiters.clear()
 
 
-env = get_settings()
+atexit.register(close_api_clients)
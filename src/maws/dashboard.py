@@ -0,0 +1,89 @@
+import heapq
+import time
+from collections import Counter
+
+from rich.console import Console, ConsoleOptions, RenderResult
+from rich.table import Table
+from rich.text import Text
+
+from maws.fleet import DeploymentResult, DeploymentState
+
+# Rows of services in progress come first, then failures, then the rest
+STATE_RANKS = {
+    DeploymentState.PENDING: 0,
+    DeploymentState.FAILED: 1,
+    DeploymentState.SUCCEEDED: 2,
+    DeploymentState.SKIPPED: 3,
+}
+
+# Lines taken by the summary, the table header and borders and the footer
+CHROME_LINES = 7
+
+
+class Dashboard:
+    """
+    Rich renderable of the deployment state of a fleet
+
+    The cells of a row are formatted once per change of the service and kept.
+    A refresh only lays out the rows fitting the terminal, services in progress
+    and failed ones first and otherwise the most recently changed, so the cost
+    of a refresh does not grow with the size of the fleet.
+    """
+
+    def __init__(self, styles: dict[str, str], title: str = "Deployment status"):
+        """
+        Args:
+            styles (dict[str, str]): Rich style per deployment state
+            title (str, optional): Defaults to "Deployment status".
+        """
+        self.styles = styles
+        self.title = title
+        self.states: dict[str, DeploymentState] = {}
+        self.rows: dict[str, tuple[tuple, tuple[Text, ...]]] = {}
+        self.counts: Counter[str] = Counter()
+        self.checks = 0
+
+    def update(self, results: list[DeploymentResult], checks: int = 0) -> None:
+        """
+        Replace the rows of changed services
+
+        Args:
+            results (list[DeploymentResult]): Changed results
+            checks (int, optional): Total number of status checks so far. Defaults to 0.
+        """
+        now = time.time()
+        for result in results:
+            if result.service in self.states:
+                self.counts[self.states[result.service]] -= 1
+            self.counts[result.state] += 1
+            self.states[result.service] = result.state
+            key = (STATE_RANKS[result.state], -now, result.service)
+            self.rows[result.service] = (
+                key,
+                (
+                    Text(result.service, style="italic"),
+                    Text(result.state, style=self.styles[result.state]),
+                    Text(str(result.status_code or "-")),
+                    Text(time.strftime("%H:%M:%S", time.localtime(now))),
+                    Text(result.message, overflow="fold"),
+                ),
+            )
+        self.checks = checks
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        height = options.height or console.height
+        visible = heapq.nsmallest(max(1, height - CHROME_LINES), self.rows.values(), key=lambda row: row[0])
+        summary = ", ".join(f"[{self.styles[state]}]{self.counts[state]} {state}[/]" for state in STATE_RANKS)
+        yield Text.from_markup(f"{len(self.rows)} services: {summary}, {self.checks} status checks")
+
+        table = Table(title=self.title, expand=True)
+        table.add_column("Service", no_wrap=True)
+        table.add_column("State", no_wrap=True)
+        table.add_column("Status", no_wrap=True)
+        table.add_column("Changed", no_wrap=True)
+        table.add_column("Message", ratio=1)
+        for _, cells in visible:
+            table.add_row(*cells)
+        yield table
+        if hidden := len(self.rows) - len(visible):
+            yield Text(f"{hidden} more services", style="dim")
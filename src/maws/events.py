@@ -0,0 +1,84 @@
+import json
+import sys
+import time
+from enum import StrEnum
+from typing import Optional, TextIO
+
+
+class OutputFormat(StrEnum):
+    TEXT = "text"
+    JSON = "json"
+
+
+class EventStream:
+    """
+    Stream deployment progress as newline delimited JSON
+
+    Every status check emits a `poll` event and every change of the deployment
+    state of a service a `state` event. Events are written unbuffered, one per
+    line, with the seconds elapsed since the first event of the service.
+
+    Example output:
+
+        {"event":"started","service":"api","elapsed":0.0,"status_code":201}
+        {"event":"poll","service":"api","elapsed":1.02,"status_code":202,"state":"pending","attempt":1}
+        {"event":"state","service":"api","elapsed":1.02,"state":"pending","previous":null,"status_code":202}
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, **context):
+        """
+        Args:
+            stream (TextIO, optional): Defaults to stdout.
+            **context: Attributes added to every event, e.g. the profile
+        """
+        self.stream = stream or sys.stdout
+        self.context = context
+        self.started = time.monotonic()
+        self.service_started: dict[str, float] = {}
+        self.attempts: dict[str, int] = {}
+        self.states: dict[str, str] = {}
+
+    def emit(self, event: str, service: Optional[str] = None, **fields) -> None:
+        """
+        Write a single event
+
+        Args:
+            event (str): Event type
+            service (str, optional): Service or task the event belongs to
+            **fields: Additional JSON serializable attributes
+        """
+        now = time.monotonic()
+        started = self.service_started.setdefault(service, now) if service else self.started
+        record = {"event": event, "service": service, "elapsed": round(now - started, 3), **self.context, **fields}
+        self.stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.stream.flush()
+
+    def transition(self, service: str, state: str, status_code: Optional[int] = None, message: str = "") -> None:
+        """
+        Emit a `state` event if the deployment state of a service has changed
+
+        Args:
+            service (str)
+            state (str)
+            status_code (int, optional)
+            message (str, optional)
+        """
+        previous = self.states.get(service)
+        if previous == state:
+            return
+        self.states[service] = state
+        self.emit("state", service, state=state, previous=previous, status_code=status_code, message=message or None)
+
+    def poll(self, service: str, status_code: Optional[int], state: str, message: str = "") -> None:
+        """
+        Emit a `poll` event for a status check and the resulting state transition
+
+        Args:
+            service (str)
+            status_code (int | None)
+            state (str)
+            message (str, optional)
+        """
+        attempt = self.attempts[service] = self.attempts.get(service, 0) + 1
+        self.emit("poll", service, status_code=status_code, state=state, attempt=attempt)
+        self.transition(service, state, status_code, message)
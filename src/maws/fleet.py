@@ -0,0 +1,699 @@
+import asyncio
+import json
+import time
+from contextlib import AsyncExitStack
+from enum import StrEnum
+from http import HTTPStatus
+from typing import Awaitable, Optional
+
+from pydantic import BaseModel
+
+from maws.clients.ecs_service_deployment_client import AuthenticatedClient
+from maws.clients.ecs_service_deployment_client.api.services import (
+    get_service,
+    get_services,
+    patch_service,
+    patch_services,
+)
+from maws.clients.ecs_service_deployment_client.api.tasks import get_tasks, patch_task
+from maws.clients.ecs_service_deployment_client.models import (
+    ServiceBatchDeployment,
+    ServiceBatchDeploymentRequest,
+    ServiceDeploymentRequest,
+    TaskDeploymentRequest,
+)
+from maws.config import async_session
+from maws.events import EventStream
+from maws.manifest import ServiceDeployment, TaskDeployment
+from maws.polling import PollingPolicy, StatusWaits
+
+# Deployments per batch request, the `maxItems` of ServiceBatchDeploymentRequest in openapi.yaml
+BATCH_SIZE = 100
+
+# Status codes of a batch deployment request to an API without batch deployments
+BATCH_UNSUPPORTED = (HTTPStatus.NOT_FOUND, HTTPStatus.METHOD_NOT_ALLOWED, HTTPStatus.NOT_IMPLEMENTED)
+
+# Base URLs of APIs which answered a batch deployment as unsupported
+_unbatched: set[str] = set()
+
+
+class DeploymentState(StrEnum):
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+class DeploymentResult(BaseModel):
+    """
+    Outcome of a single service deployment
+
+    `started_at` and `finished_at` are epoch timestamps of the deployment
+    request (or the first status check) and of the check which saw the
+    deployment settle, `polls` counts the status checks.
+    """
+
+    service: str
+    state: DeploymentState
+    status_code: int | None = None
+    message: str = ""
+    started_at: float | None = None
+    finished_at: float | None = None
+    polls: int = 0
+
+    @property
+    def succeeded(self) -> bool:
+        return self.state == DeploymentState.SUCCEEDED
+
+    @property
+    def failed(self) -> bool:
+        return self.state == DeploymentState.FAILED
+
+
+def error_message(content: bytes) -> str:
+    """
+    Extract the error message of an API error response
+
+    Args:
+        content (bytes): Raw response body
+
+    Returns:
+        str
+    """
+    try:
+        error = json.loads(content).get("error")
+    except (ValueError, AttributeError):
+        return ""
+    if isinstance(error, list):
+        return ", ".join(str(item) for item in error)
+    return str(error or "")
+
+
+def parse_names(content: bytes, key: str) -> list[str]:
+    """
+    Extract the resource names of a listing response
+
+    Accepts a plain list of names, a list of objects with a `name` attribute
+    or an object holding such a list under `key`.
+
+    Args:
+        content (bytes): Raw response body
+        key (str): Attribute holding the list, e.g. `services`
+
+    Returns:
+        list[str]
+    """
+    data = json.loads(content) if content else []
+    if isinstance(data, dict):
+        data = data.get(key, [])
+    return [item if isinstance(item, str) else item["name"] for item in data]
+
+
+def deployment_result(service: str, status_code: int, content: bytes = b"") -> DeploymentResult:
+    """
+    Map a deployment status response to a result
+
+    Args:
+        service (str)
+        status_code (int)
+        content (bytes, optional): Raw response body
+
+    Returns:
+        DeploymentResult
+    """
+    match status_code:
+        case HTTPStatus.ACCEPTED:
+            return DeploymentResult(service=service, state=DeploymentState.PENDING, status_code=status_code)
+        case HTTPStatus.OK:
+            return DeploymentResult(service=service, state=DeploymentState.SUCCEEDED, status_code=status_code)
+        case HTTPStatus.EXPECTATION_FAILED:
+            return DeploymentResult(
+                service=service,
+                state=DeploymentState.FAILED,
+                status_code=status_code,
+                message=error_message(content),
+            )
+        case _:
+            return DeploymentResult(
+                service=service,
+                state=DeploymentState.FAILED,
+                status_code=status_code,
+                message=f"Unexpected status {status_code}",
+            )
+
+
+async def list_services(client: AuthenticatedClient) -> list[str]:
+    """
+    Get the names of all available services
+
+    Args:
+        client (AuthenticatedClient)
+
+    Raises:
+        Exception: If the services cannot be listed
+
+    Returns:
+        list[str]
+    """
+    response = await get_services.asyncio_detailed(client=client)
+    if response.status_code != HTTPStatus.OK:
+        raise Exception(f"Listing services failed with status {response.status_code}")
+    return parse_names(response.content, "services")
+
+
+def deployment_request(deployment: ServiceDeployment) -> ServiceDeploymentRequest:
+    return ServiceDeploymentRequest(image=deployment.image, force=deployment.force, secret_arns=deployment.secret_arns)
+
+
+def rejected_deployment(service: str, status_code: int, message: str = "") -> DeploymentResult:
+    return DeploymentResult(
+        service=service,
+        state=DeploymentState.FAILED,
+        status_code=status_code,
+        message=message or f"Deployment failed with status {status_code}",
+    )
+
+
+def parse_batch_results(content: bytes) -> dict[str, tuple[int, str]]:
+    """
+    Extract the per-service results of a batch deployment response
+
+    Args:
+        content (bytes): Raw response body
+
+    Returns:
+        dict[str, tuple[int, str]]: Status code and error message per service
+    """
+    data = json.loads(content) if content else {}
+    return {item["service"]: (item["status_code"], str(item.get("error") or "")) for item in data.get("results", [])}
+
+
+async def start_deployment(
+    client: AuthenticatedClient,
+    deployment: ServiceDeployment,
+    semaphore: asyncio.Semaphore,
+    events: Optional[EventStream] = None,
+) -> DeploymentResult | None:
+    """
+    Trigger the deployment of a service
+
+    Args:
+        client (AuthenticatedClient)
+        deployment (ServiceDeployment)
+        semaphore (asyncio.Semaphore): Limits the number of concurrent requests
+        events (EventStream, optional): Receives a `started` event
+
+    Returns:
+        DeploymentResult | None: The failed result, None if the deployment has been started
+    """
+    async with semaphore:
+        response = await patch_service.asyncio_detailed(
+            service=deployment.name, client=client, body=deployment_request(deployment)
+        )
+    if response.status_code == HTTPStatus.CREATED:
+        if events:
+            events.emit("started", deployment.name, status_code=response.status_code)
+        return None
+    return rejected_deployment(deployment.name, response.status_code, error_message(response.content))
+
+
+async def start_batch(
+    client: AuthenticatedClient,
+    deployments: list[ServiceDeployment],
+    semaphore: asyncio.Semaphore,
+    events: Optional[EventStream] = None,
+) -> list[DeploymentResult | None] | None:
+    """
+    Trigger the deployments of many services with one request
+
+    An API answering that it does not support batch deployments is remembered,
+    so later deployments through it go straight to individual requests.
+
+    Args:
+        client (AuthenticatedClient)
+        deployments (list[ServiceDeployment]): At most BATCH_SIZE deployments
+        semaphore (asyncio.Semaphore): Limits the number of concurrent requests
+        events (EventStream, optional): Receives a `started` event per deployment
+
+    Returns:
+        list[DeploymentResult | None] | None: The failed result or None per deployment as `start_deployment`,
+            None if the API did not accept the batch and the deployments have to be started one by one
+    """
+    async with semaphore:
+        response = await patch_services.asyncio_detailed(
+            client=client,
+            body=ServiceBatchDeploymentRequest(
+                deployments=[
+                    ServiceBatchDeployment(service=deployment.name, request=deployment_request(deployment))
+                    for deployment in deployments
+                ]
+            ),
+        )
+    if response.status_code in BATCH_UNSUPPORTED:
+        _unbatched.add(client._base_url)
+        return None
+    if response.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE:
+        return None
+    if response.status_code != HTTPStatus.MULTI_STATUS:
+        message = error_message(response.content)
+        return [rejected_deployment(deployment.name, response.status_code, message) for deployment in deployments]
+
+    try:
+        items = parse_batch_results(response.content)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        items = {}
+    results: list[DeploymentResult | None] = []
+    for deployment in deployments:
+        if deployment.name not in items:
+            results.append(
+                DeploymentResult(
+                    service=deployment.name, state=DeploymentState.FAILED, message="Missing from the batch response"
+                )
+            )
+            continue
+        status_code, message = items[deployment.name]
+        if status_code == HTTPStatus.CREATED:
+            if events:
+                events.emit("started", deployment.name, status_code=status_code)
+            results.append(None)
+        else:
+            results.append(rejected_deployment(deployment.name, status_code, message))
+    return results
+
+
+async def check_deployment(
+    client: AuthenticatedClient,
+    service: str,
+    semaphore: asyncio.Semaphore,
+) -> DeploymentResult:
+    """
+    Get the current deployment status of a service
+
+    Args:
+        client (AuthenticatedClient)
+        service (str)
+        semaphore (asyncio.Semaphore): Limits the number of concurrent requests
+
+    Returns:
+        DeploymentResult
+    """
+    async with semaphore:
+        response = await get_service.asyncio_detailed(service=service, client=client)
+    return deployment_result(service, response.status_code, response.content)
+
+
+async def wait_for_deployment(
+    client: AuthenticatedClient,
+    service: str,
+    semaphore: asyncio.Semaphore,
+    policy: PollingPolicy,
+    events: Optional[EventStream] = None,
+) -> DeploymentResult:
+    """
+    Poll the deployment status of a service until it has settled or the policy timed out
+
+    Status checks are held by the API while the deployment is in progress if it
+    supports long polling, unless other requests are queueing for the semaphore.
+
+    Args:
+        client (AuthenticatedClient)
+        service (str)
+        semaphore (asyncio.Semaphore): Limits the number of concurrent requests
+        policy (PollingPolicy)
+        events (EventStream, optional): Receives a `poll` event per status check
+
+    Returns:
+        DeploymentResult: A pending result if the policy timed out
+    """
+    intervals = policy.intervals()
+    waits = StatusWaits(policy)
+    polls = 0
+    while True:
+        arguments = waits.request(allowed=not semaphore.locked())
+        async with semaphore:
+            response = await get_service.asyncio_detailed(service=service, client=client, **arguments)
+        result = deployment_result(service, response.status_code, response.content)
+        result.polls = polls = polls + 1
+        if events:
+            events.poll(service, result.status_code, result.state, result.message)
+        if result.state != DeploymentState.PENDING:
+            result.finished_at = time.time()
+            return result
+        interval = next(intervals, None)
+        if interval is None:
+            result.message = f"Timed out after {policy.timeout}s"
+            if events:
+                events.emit("timeout", service, timeout=policy.timeout)
+            return result
+        if waits.pending(response.headers):
+            await asyncio.sleep(interval)
+
+
+async def settle_deployment(
+    client: AuthenticatedClient,
+    service: str,
+    failure: DeploymentResult | None,
+    started_at: float,
+    semaphore: asyncio.Semaphore,
+    policy: PollingPolicy,
+    events: Optional[EventStream] = None,
+) -> DeploymentResult:
+    """
+    Wait for a triggered deployment to settle
+
+    Args:
+        client (AuthenticatedClient)
+        service (str)
+        failure (DeploymentResult | None): Outcome of the deployment request, None if the deployment has been started
+        started_at (float): Epoch timestamp of the deployment request
+        semaphore (asyncio.Semaphore): Limits the number of concurrent requests
+        policy (PollingPolicy)
+        events (EventStream, optional)
+
+    Returns:
+        DeploymentResult
+    """
+    try:
+        if failure is None:
+            result = await wait_for_deployment(client, service, semaphore, policy, events)
+            result.started_at = started_at
+            return result
+    except Exception as e:
+        failure = DeploymentResult(service=service, state=DeploymentState.FAILED, message=str(e))
+    failure.started_at, failure.finished_at = started_at, time.time()
+    if events:
+        events.transition(failure.service, failure.state, failure.status_code, failure.message)
+    return failure
+
+
+async def deploy_service(
+    client: AuthenticatedClient,
+    deployment: ServiceDeployment,
+    semaphore: asyncio.Semaphore,
+    policy: PollingPolicy,
+    events: Optional[EventStream] = None,
+) -> DeploymentResult:
+    """
+    Deploy a service and wait for the deployment to settle
+
+    Args:
+        client (AuthenticatedClient)
+        deployment (ServiceDeployment)
+        semaphore (asyncio.Semaphore): Limits the number of concurrent requests
+        policy (PollingPolicy)
+        events (EventStream, optional)
+
+    Returns:
+        DeploymentResult
+    """
+    started_at = time.time()
+    try:
+        failure = await start_deployment(client, deployment, semaphore, events)
+    except Exception as e:
+        failure = DeploymentResult(service=deployment.name, state=DeploymentState.FAILED, message=str(e))
+    return await settle_deployment(client, deployment.name, failure, started_at, semaphore, policy, events)
+
+
+def deploy_services(
+    client: AuthenticatedClient,
+    deployments: list[ServiceDeployment],
+    semaphore: asyncio.Semaphore,
+    policy: PollingPolicy,
+    events: Optional[EventStream] = None,
+    reattach: Optional[dict[str, float]] = None,
+) -> list[Awaitable[DeploymentResult]]:
+    """
+    Deploy many services and wait for each deployment to settle
+
+    The deployments are triggered with batch requests of up to BATCH_SIZE
+    services if the API supports them, otherwise every service is deployed on
+    its own as by `deploy_service`. Must be called from a running event loop,
+    the batch requests are sent right away.
+
+    Args:
+        client (AuthenticatedClient)
+        deployments (list[ServiceDeployment])
+        semaphore (asyncio.Semaphore): Limits the number of concurrent requests
+        policy (PollingPolicy)
+        events (EventStream, optional)
+        reattach (dict[str, float], optional): Services whose deployment has already been triggered, e.g. by an
+            interrupted command, with the epoch timestamp of the request. They are only awaited.
+
+    Returns:
+        list[Awaitable[DeploymentResult]]: One awaitable per deployment, in the order of the deployments
+    """
+    reattach = reattach or {}
+    triggered = []
+    for deployment in deployments:
+        if deployment.name not in reattach:
+            triggered.append(deployment)
+        elif events:
+            events.emit("reattached", deployment.name)
+    settling = iter(trigger_services(client, triggered, semaphore, policy, events))
+    return [
+        (
+            settle_deployment(client, deployment.name, None, reattach[deployment.name], semaphore, policy, events)
+            if deployment.name in reattach
+            else next(settling)
+        )
+        for deployment in deployments
+    ]
+
+
+def trigger_services(
+    client: AuthenticatedClient,
+    deployments: list[ServiceDeployment],
+    semaphore: asyncio.Semaphore,
+    policy: PollingPolicy,
+    events: Optional[EventStream] = None,
+) -> list[Awaitable[DeploymentResult]]:
+    """
+    Trigger the deployments of many services, in batches if possible, see `deploy_services`
+    """
+    if len(deployments) < 2 or client._base_url in _unbatched:
+        return [deploy_service(client, deployment, semaphore, policy, events) for deployment in deployments]
+
+    started_at = time.time()
+    batches = []
+    for offset in range(0, len(deployments), BATCH_SIZE):
+        end = offset + BATCH_SIZE
+        batches.append(asyncio.ensure_future(start_batch(client, deployments[offset:end], semaphore, events)))
+
+    async def settle(index: int, deployment: ServiceDeployment) -> DeploymentResult:
+        try:
+            failures = await batches[index // BATCH_SIZE]
+        except Exception as e:
+            failure = DeploymentResult(service=deployment.name, state=DeploymentState.FAILED, message=str(e))
+        else:
+            if failures is None:
+                return await deploy_service(client, deployment, semaphore, policy, events)
+            failure = failures[index % BATCH_SIZE]
+        return await settle_deployment(client, deployment.name, failure, started_at, semaphore, policy, events)
+
+    return [settle(index, deployment) for index, deployment in enumerate(deployments)]
+
+
+async def deploy_fleet(
+    client: AuthenticatedClient,
+    deployments: list[ServiceDeployment],
+    policy: PollingPolicy,
+    concurrency: int = 10,
+    events: Optional[EventStream] = None,
+    reattach: Optional[dict[str, float]] = None,
+) -> list[DeploymentResult]:
+    """
+    Deploy many services concurrently and wait for all of them
+
+    Args:
+        client (AuthenticatedClient): Shared by all deployments
+        deployments (list[ServiceDeployment])
+        policy (PollingPolicy)
+        concurrency (int, optional): Maximum number of requests in flight. Defaults to 10.
+        events (EventStream, optional): Receives the progress of every deployment
+        reattach (dict[str, float], optional): Deployments already triggered, see `deploy_services`
+
+    Returns:
+        list[DeploymentResult]: Results in manifest order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    async with async_session(client):
+        return await asyncio.gather(*deploy_services(client, deployments, semaphore, policy, events, reattach))
+
+
+async def deploy_profiles(
+    targets: dict[str, tuple[AuthenticatedClient, PollingPolicy]],
+    deployments: list[ServiceDeployment],
+    concurrency: int = 10,
+    events: Optional[dict[str, EventStream]] = None,
+) -> dict[str, list[DeploymentResult]]:
+    """
+    Deploy the same services through many profiles concurrently
+
+    Profiles sharing a client, e.g. with the same base URL and token, share
+    one session of its async connection pool, so no profile closes the pool
+    while another one still deploys.
+
+    Args:
+        targets (dict[str, tuple[AuthenticatedClient, PollingPolicy]]): Client and polling policy per profile
+        deployments (list[ServiceDeployment])
+        concurrency (int, optional): Maximum number of requests in flight per profile. Defaults to 10.
+        events (dict[str, EventStream], optional): Event stream per profile
+
+    Returns:
+        dict[str, list[DeploymentResult]]: Results per profile in manifest order
+    """
+    clients = {id(client): client for client, _ in targets.values()}
+    async with AsyncExitStack() as stack:
+        for client in clients.values():
+            await stack.enter_async_context(async_session(client))
+        results = await asyncio.gather(
+            *(
+                asyncio.gather(
+                    *deploy_services(
+                        client, deployments, asyncio.Semaphore(concurrency), policy, (events or {}).get(profile)
+                    )
+                )
+                for profile, (client, policy) in targets.items()
+            )
+        )
+    return dict(zip(targets, results))
+
+
+async def service_status(
+    client: AuthenticatedClient,
+    service: str,
+    semaphore: asyncio.Semaphore,
+    policy: Optional[PollingPolicy] = None,
+    events: Optional[EventStream] = None,
+) -> DeploymentResult:
+    started_at = time.time()
+    try:
+        if policy:
+            result = await wait_for_deployment(client, service, semaphore, policy, events)
+        else:
+            result = await check_deployment(client, service, semaphore)
+            result.polls = 1
+            if result.state != DeploymentState.PENDING:
+                result.finished_at = time.time()
+            if events:
+                events.poll(service, result.status_code, result.state, result.message)
+        result.started_at = started_at
+        return result
+    except Exception as e:
+        if events:
+            events.transition(service, DeploymentState.FAILED, message=str(e))
+        return DeploymentResult(
+            service=service,
+            state=DeploymentState.FAILED,
+            message=str(e),
+            started_at=started_at,
+            finished_at=time.time(),
+        )
+
+
+async def fleet_status(
+    client: AuthenticatedClient,
+    services: list[str] | None = None,
+    concurrency: int = 10,
+    policy: Optional[PollingPolicy] = None,
+    events: Optional[EventStream] = None,
+) -> list[DeploymentResult]:
+    """
+    Get the deployment status of many services concurrently
+
+    Args:
+        client (AuthenticatedClient): Shared by all requests
+        services (list[str], optional): Defaults to all available services.
+        concurrency (int, optional): Maximum number of requests in flight. Defaults to 10.
+        policy (PollingPolicy, optional): Wait until the deployments have settled. Defaults to a single check.
+        events (EventStream, optional): Receives the progress of every service
+
+    Returns:
+        list[DeploymentResult]
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    async with async_session(client):
+        if services is None:
+            services = await list_services(client)
+        return await asyncio.gather(
+            *(service_status(client, service, semaphore, policy, events) for service in services)
+        )
+
+
+async def list_tasks(client: AuthenticatedClient) -> list[str]:
+    """
+    Get the names of all available scheduled tasks
+
+    Args:
+        client (AuthenticatedClient)
+
+    Raises:
+        Exception: If the tasks cannot be listed
+
+    Returns:
+        list[str]
+    """
+    response = await get_tasks.asyncio_detailed(client=client)
+    if response.status_code != HTTPStatus.OK:
+        raise Exception(f"Listing tasks failed with status {response.status_code}")
+    return parse_names(response.content, "tasks")
+
+
+async def deploy_task(
+    client: AuthenticatedClient,
+    deployment: TaskDeployment,
+    semaphore: asyncio.Semaphore,
+) -> DeploymentResult:
+    """
+    Update the image of a scheduled task
+
+    Tasks have no deployment status, the update has succeeded once it is accepted.
+
+    Args:
+        client (AuthenticatedClient)
+        deployment (TaskDeployment)
+        semaphore (asyncio.Semaphore): Limits the number of concurrent requests
+
+    Returns:
+        DeploymentResult
+    """
+    try:
+        async with semaphore:
+            response = await patch_task.asyncio_detailed(
+                task=deployment.name,
+                client=client,
+                body=TaskDeploymentRequest(image=deployment.image),
+            )
+    except Exception as e:
+        return DeploymentResult(service=deployment.name, state=DeploymentState.FAILED, message=str(e))
+    if response.status_code == HTTPStatus.CREATED:
+        return DeploymentResult(
+            service=deployment.name, state=DeploymentState.SUCCEEDED, status_code=response.status_code
+        )
+    return DeploymentResult(
+        service=deployment.name,
+        state=DeploymentState.FAILED,
+        status_code=response.status_code,
+        message=error_message(response.content) or f"Update failed with status {response.status_code}",
+    )
+
+
+async def deploy_tasks(
+    client: AuthenticatedClient,
+    deployments: list[TaskDeployment],
+    concurrency: int = 10,
+) -> list[DeploymentResult]:
+    """
+    Update many scheduled tasks concurrently
+
+    Args:
+        client (AuthenticatedClient): Shared by all updates
+        deployments (list[TaskDeployment])
+        concurrency (int, optional): Maximum number of requests in flight. Defaults to 10.
+
+    Returns:
+        list[DeploymentResult]: Results in manifest order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    async with async_session(client):
+        return await asyncio.gather(*(deploy_task(client, deployment, semaphore) for deployment in deployments))
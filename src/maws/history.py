@@ -0,0 +1,277 @@
+import math
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+from maws import cache_dir
+from maws.fleet import DeploymentResult, DeploymentState
+from maws.manifest import ServiceDeployment
+
+# Recent settled deployments per service the durations are computed from
+HISTORY_LIMIT = 50
+
+# Seconds after which a pending deployment is no longer settled by a status check, it most likely
+# timed out and a later check could not tell how long it took
+PENDING_EXPIRY = 6 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deployments (
+    id INTEGER PRIMARY KEY,
+    profile TEXT NOT NULL,
+    service TEXT NOT NULL,
+    image TEXT,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    polls INTEGER NOT NULL DEFAULT 0,
+    result TEXT NOT NULL,
+    status_code INTEGER,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS deployments_service ON deployments (profile, service, started_at);
+"""
+
+
+class DurationStats(BaseModel):
+    """
+    Durations of the recent deployments of a service, from the deployment request until it succeeded
+    """
+
+    service: str
+    deployments: int
+    failed: int
+    p50: float
+    p95: float
+    last: float
+
+
+def history_path() -> Path:
+    """
+    Get the path of the deployment history database, follows MAWS_CACHE_DIR
+
+    Returns:
+        Path
+    """
+    return cache_dir() / "history.db"
+
+
+def open_history(path: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Open the deployment history database, creating it if necessary
+
+    Args:
+        path (Path, optional): Defaults to `history_path()`.
+
+    Raises:
+        sqlite3.Error
+        OSError
+
+    Returns:
+        sqlite3.Connection
+    """
+    path = path or history_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path, timeout=5)
+    db.executescript(SCHEMA)
+    return db
+
+
+def _profile(profile: Optional[str]) -> str:
+    return profile or "default"
+
+
+def log_deployments(
+    profile: Optional[str], deployments: list[ServiceDeployment], results: list[DeploymentResult]
+) -> None:
+    """
+    Record the outcome of deployments started by maws
+
+    Skipped deployments are ignored. Deployments still pending are recorded
+    without an end, a later status check which sees them settle completes them.
+
+    Args:
+        profile (str | None)
+        deployments (list[ServiceDeployment])
+        results (list[DeploymentResult]): Results in the order of the deployments
+    """
+    rows = [
+        (
+            _profile(profile),
+            result.service,
+            deployment.image,
+            result.started_at or time.time(),
+            result.finished_at if result.state != DeploymentState.PENDING else None,
+            result.polls,
+            result.state.value,
+            result.status_code,
+            result.message or None,
+        )
+        for deployment, result in zip(deployments, results)
+        if result.state != DeploymentState.SKIPPED
+    ]
+    if not rows:
+        return
+    try:
+        with closing(open_history()) as db, db:
+            db.executemany(
+                "INSERT INTO deployments (profile, service, image, started_at, finished_at, polls, result, "
+                "status_code, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+    except (OSError, sqlite3.Error):
+        pass  # the history is best effort, it must never fail a deployment
+
+
+def log_status(profile: Optional[str], results: list[DeploymentResult]) -> None:
+    """
+    Record the outcome of status checks
+
+    A settled result completes the latest pending deployment of the service,
+    so its duration counts from the deployment request. Deployments pending
+    for longer than PENDING_EXPIRY are left alone, and checks without a
+    pending deployment are not recorded.
+
+    Args:
+        profile (str | None)
+        results (list[DeploymentResult])
+    """
+    rows = [
+        (
+            result.finished_at if result.state != DeploymentState.PENDING else None,
+            result.polls,
+            result.state.value,
+            result.status_code,
+            result.message or None,
+            _profile(profile),
+            result.service,
+            time.time() - PENDING_EXPIRY,
+        )
+        for result in results
+        if result.state != DeploymentState.SKIPPED
+    ]
+    if not rows:
+        return
+    try:
+        with closing(open_history()) as db, db:
+            db.executemany(
+                "UPDATE deployments SET finished_at = ?, polls = polls + ?, result = ?, status_code = ?, "
+                "message = ? WHERE id = (SELECT id FROM deployments WHERE profile = ? AND service = ? "
+                "AND finished_at IS NULL AND image IS NOT NULL AND started_at >= ? ORDER BY started_at DESC LIMIT 1)",
+                rows,
+            )
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def pending_since(profile: Optional[str], service: str) -> Optional[float]:
+    """
+    Get the start of the latest deployment of a service which has not settled yet
+
+    Args:
+        profile (str | None)
+        service (str)
+
+    Returns:
+        float | None: Epoch timestamp, None if no deployment is pending or it expired
+    """
+    try:
+        with closing(open_history()) as db:
+            row = db.execute(
+                "SELECT started_at FROM deployments WHERE profile = ? AND service = ? AND finished_at IS NULL "
+                "AND image IS NOT NULL AND started_at >= ? ORDER BY started_at DESC LIMIT 1",
+                (_profile(profile), service, time.time() - PENDING_EXPIRY),
+            ).fetchone()
+    except (OSError, sqlite3.Error):
+        return None
+    return row[0] if row else None
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Get a percentile with the nearest-rank method
+
+    Args:
+        values (list[float]): Sorted values, must not be empty
+        q (float): Percentile between 0 and 1
+
+    Returns:
+        float
+    """
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+def duration_stats(
+    profile: Optional[str], services: Optional[list[str]] = None, limit: int = HISTORY_LIMIT
+) -> dict[str, DurationStats]:
+    """
+    Get the deployment durations of services from their recent deployments
+
+    Only deployments started by maws count. Their duration spans from the
+    deployment request until a status check saw them succeed.
+
+    Args:
+        profile (str | None)
+        services (list[str], optional): Defaults to all recorded services.
+        limit (int, optional): Number of recent settled deployments per service. Defaults to HISTORY_LIMIT.
+
+    Returns:
+        dict[str, DurationStats]: Services without a successful deployment are omitted
+    """
+    query = (
+        "SELECT service, result, finished_at - started_at FROM ("
+        "SELECT *, ROW_NUMBER() OVER (PARTITION BY service ORDER BY started_at DESC, id DESC) AS n FROM deployments "
+        "WHERE profile = ? AND image IS NOT NULL AND finished_at IS NOT NULL"
+    )
+    parameters: list = [_profile(profile)]
+    if services is not None:
+        query += f" AND service IN ({', '.join('?' * len(services))})"
+        parameters += services
+    query += ") WHERE n <= ? ORDER BY service, started_at, id"
+    parameters.append(limit)
+    try:
+        with closing(open_history()) as db:
+            rows = db.execute(query, parameters).fetchall()
+    except (OSError, sqlite3.Error):
+        return {}
+
+    durations: dict[str, list[float]] = {}
+    failed: dict[str, int] = {}
+    for service, result, duration in rows:
+        if result == DeploymentState.SUCCEEDED:
+            durations.setdefault(service, []).append(duration)
+        else:
+            failed[service] = failed.get(service, 0) + 1
+    stats = {}
+    for service, values in durations.items():
+        ordered = sorted(values)
+        stats[service] = DurationStats(
+            service=service,
+            deployments=len(values) + failed.get(service, 0),
+            failed=failed.get(service, 0),
+            p50=percentile(ordered, 0.5),
+            p95=percentile(ordered, 0.95),
+            last=values[-1],
+        )
+    return stats
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format a duration for humans, e.g. `1m 05s`
+
+    Args:
+        seconds (float)
+
+    Returns:
+        str
+    """
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {seconds:02d}s"
+    return f"{seconds}s"
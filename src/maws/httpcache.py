@@ -0,0 +1,240 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from pathlib import Path
+from typing import Optional
+
+import httpx
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+# Headers of a cached response kept to rebuild it and to validate it
+STORED_HEADERS = ("content-type", "etag", "last-modified")
+
+# Conditional request headers, requests which already carry one bypass the cache
+CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+# Entries kept in memory per cache
+CACHE_SIZE = 256
+
+# Query parameters which only change when a response is sent, not its content, e.g. the long-poll `wait`
+UNCACHED_PARAMS = ("wait",)
+
+
+class CachedResponse(BaseModel):
+    """
+    Decoded body and validators of a GET response
+    """
+
+    model_config = ConfigDict(ser_json_bytes="base64", val_json_bytes="base64")
+
+    url: str
+    headers: dict[str, str]
+    content: bytes
+
+    @property
+    def conditions(self) -> dict[str, str]:
+        conditions = {}
+        if etag := self.headers.get("etag"):
+            conditions["If-None-Match"] = etag
+        if last_modified := self.headers.get("last-modified"):
+            conditions["If-Modified-Since"] = last_modified
+        return conditions
+
+
+class HttpCache:
+    """
+    Validated GET responses of one API client
+
+    The most recently used entries are kept in memory. With a directory every
+    entry is also stored on disk, so a later invocation of maws revalidates a
+    listing instead of downloading it again. The disk copy is an optimization
+    only, failures to read or write it are ignored. Entries hold authenticated
+    API responses, so the directory and its files are only accessible by the
+    current user.
+    """
+
+    def __init__(self, path: Optional[Path] = None, size: int = CACHE_SIZE):
+        """
+        Args:
+            path (Path, optional): Directory of the entries on disk. Defaults to None, memory only.
+            size (int, optional): Entries kept in memory. Defaults to CACHE_SIZE.
+        """
+        self.path = path
+        self.size = size
+        self.entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: httpx.URL) -> str:
+        return hashlib.sha256(str(url).encode()).hexdigest()
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def get(self, url: httpx.URL) -> Optional[CachedResponse]:
+        """
+        Get the cached response of a URL
+
+        Args:
+            url (httpx.URL)
+
+        Returns:
+            CachedResponse | None
+        """
+        key = self.key(url)
+        with self._lock:
+            if entry := self.entries.get(key):
+                self.entries.move_to_end(key)
+                return entry
+        if self.path is None:
+            return None
+        try:
+            entry = CachedResponse.model_validate_json((self.path / f"{key}.json").read_bytes())
+        except (OSError, ValidationError):
+            return None
+        if entry.url != str(url):
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, entry: CachedResponse) -> None:
+        """
+        Store the response of a URL
+
+        Args:
+            entry (CachedResponse)
+        """
+        key = self.key(httpx.URL(entry.url))
+        self._remember(key, entry)
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            self.path.mkdir(mode=0o700, exist_ok=True)
+            tmp_path = self.path / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(entry.model_dump_json().encode())
+            os.replace(tmp_path, self.path / f"{key}.json")
+        except OSError:
+            pass  # the cache is an optimization only
+
+
+def cache_url(url: httpx.URL) -> httpx.URL:
+    """
+    Get the URL a response is cached under, held status checks share the entry of the plain one
+
+    Args:
+        url (httpx.URL)
+
+    Returns:
+        httpx.URL
+    """
+    for name in UNCACHED_PARAMS:
+        url = url.copy_remove_param(name)
+    return url
+
+
+def cacheable(response: httpx.Response) -> bool:
+    return (
+        response.status_code == HTTPStatus.OK
+        and ("etag" in response.headers or "last-modified" in response.headers)
+        and "no-store" not in response.headers.get("cache-control", "")
+    )
+
+
+class CacheTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    httpx transport revalidating GET responses with their ETag or Last-Modified
+
+    A GET request for a URL with a cached response is sent with If-None-Match
+    and If-Modified-Since. A `304 Not Modified` is answered with the cached
+    body as a `200 OK`, so callers never see the difference. Responses are
+    cached decoded, whatever Content-Encoding the API chose.
+    """
+
+    def __init__(self, transport, cache: HttpCache):
+        """
+        Args:
+            transport (httpx.BaseTransport | httpx.AsyncBaseTransport): Wrapped transport
+            cache (HttpCache)
+        """
+        self.transport = transport
+        self.cache = cache
+
+    def _lookup(self, request: httpx.Request) -> Optional[CachedResponse]:
+        cached = self.cache.get(cache_url(request.url))
+        if cached:
+            request.headers.update(cached.conditions)
+        return cached
+
+    def _bypass(self, request: httpx.Request) -> bool:
+        return request.method != "GET" or any(name in request.headers for name in CONDITIONAL_HEADERS)
+
+    def _revalidated(self, request: httpx.Request, cached: CachedResponse, response: httpx.Response) -> httpx.Response:
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        if any(cached.headers.get(name) != value for name, value in headers.items()):
+            cached = cached.model_copy(update={"headers": {**cached.headers, **headers}})
+            self.cache.put(cached)
+        return httpx.Response(
+            HTTPStatus.OK,
+            headers=cached.headers,
+            content=cached.content,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def _store(self, request: httpx.Request, response: httpx.Response) -> httpx.Response:
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        self.cache.put(CachedResponse(url=str(cache_url(request.url)), headers=headers, content=response.content))
+        # the body has been decoded, so its encoding and length no longer apply
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name not in ("content-encoding", "content-length")
+        ]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=response.content,
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._bypass(request):
+            return self.transport.handle_request(request)
+        cached = self._lookup(request)
+        response = self.transport.handle_request(request)
+        if cached and response.status_code == HTTPStatus.NOT_MODIFIED:
+            response.close()
+            return self._revalidated(request, cached, response)
+        if not cacheable(response):
+            return response
+        response.read()
+        return self._store(request, response)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._bypass(request):
+            return await self.transport.handle_async_request(request)
+        cached = self._lookup(request)
+        response = await self.transport.handle_async_request(request)
+        if cached and response.status_code == HTTPStatus.NOT_MODIFIED:
+            await response.aclose()
+            return self._revalidated(request, cached, response)
+        if not cacheable(response):
+            return response
+        await response.aread()
+        return self._store(request, response)
+
+    def close(self) -> None:
+        self.transport.close()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import os
+import time
+from enum import StrEnum
+from http import HTTPStatus
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel, ValidationError
+
+from maws import cache_dir
+from maws.events import EventStream
+from maws.fleet import DeploymentResult, DeploymentState
+from maws.manifest import ServiceDeployment
+
+
+class JournalState(StrEnum):
+    PATCHED = "patched"
+    WAITING = "waiting"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JournalEntry(BaseModel):
+    """
+    Progress of the deployment of a service by an interrupted command
+    """
+
+    service: str
+    state: JournalState
+    request: str  # digest of the deployment request, a changed manifest entry is deployed again
+    started_at: float
+    finished_at: Optional[float] = None
+
+
+# Line appended once the results of a command have been recorded in the history and deployment state
+RECORDED = {"recorded": True}
+
+
+def request_digest(deployment: ServiceDeployment) -> str:
+    request = deployment.model_dump(include={"image", "force", "secret_arns"})
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def journal_path(command: str, profile: Optional[str], base_url: str, manifest: Path) -> Path:
+    """
+    Get the path of the journal of a command run with a manifest
+
+    Args:
+        command (str): e.g. `deploy-many`
+        profile (str | None)
+        base_url (str)
+        manifest (Path)
+
+    Returns:
+        Path
+    """
+    key = json.dumps([command, profile or "default", base_url, str(manifest.resolve())])
+    return cache_dir() / "journal" / f"{hashlib.sha256(key.encode()).hexdigest()[:16]}.ndjson"
+
+
+class Journal(EventStream):
+    """
+    Crash-safe record of the progress of a fleet operation
+
+    The journal receives the events of the operation like any event stream
+    and forwards them to `events` if given. Every change of the state of a
+    service is appended to the journal file as one JSON line, flushed and,
+    unless the service is merely waiting, synced to disk before the operation
+    continues, so the file survives the process being killed at any point. A
+    line torn by a crash is ignored when the journal is loaded.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        deployments: list[ServiceDeployment],
+        events: Optional[EventStream] = None,
+        resume: bool = False,
+    ):
+        """
+        Args:
+            path (Path): Journal file, see `journal_path`
+            deployments (list[ServiceDeployment]): Deployments of the operation
+            events (EventStream, optional): Receives all events of the operation
+            resume (bool, optional): Continue the journal of an interrupted run, otherwise start a new one.
+                Defaults to False.
+        """
+        super().__init__()
+        self.path = path
+        self.events = events
+        self.requests = {deployment.name: request_digest(deployment) for deployment in deployments}
+        self.entries: dict[str, JournalEntry] = {}
+        self.recorded: set[str] = set()
+        if resume:
+            self._load()
+        else:
+            self.path.unlink(missing_ok=True)
+
+    def _load(self) -> None:
+        try:
+            lines = self.path.read_bytes().splitlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn write of a crash
+            if record == RECORDED:
+                self.recorded = {name for name, entry in self.entries.items() if entry.state == JournalState.SUCCEEDED}
+                continue
+            try:
+                entry = JournalEntry.model_validate(record)
+            except ValidationError:
+                continue
+            if self.requests.get(entry.service) == entry.request:
+                self.entries[entry.service] = entry
+                self.recorded.discard(entry.service)
+            else:
+                self.entries.pop(entry.service, None)
+
+    def _append(self, record: dict, sync: bool = True) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+                f.flush()
+                if sync:
+                    os.fsync(f.fileno())
+        except OSError:
+            pass  # the journal must never fail a deployment
+
+    def _update(self, service: str, state: JournalState) -> None:
+        previous = self.entries.get(service)
+        if service not in self.requests or (previous and previous.state == state):
+            return
+        now = time.time()
+        started_at = previous.started_at if previous and state != JournalState.PATCHED else now
+        settled = state in (JournalState.SUCCEEDED, JournalState.FAILED)
+        entry = JournalEntry(
+            service=service,
+            state=state,
+            request=self.requests[service],
+            started_at=started_at,
+            finished_at=now if settled else None,
+        )
+        self.entries[service] = entry
+        self._append(entry.model_dump(), sync=state != JournalState.WAITING)
+
+    def emit(self, event: str, service: Optional[str] = None, **fields) -> None:
+        if self.events:
+            self.events.emit(event, service, **fields)
+        match event, fields.get("state"):
+            case "started", _:
+                self._update(service, JournalState.PATCHED)
+            case "poll", DeploymentState.PENDING:
+                self._update(service, JournalState.WAITING)
+            case "state", DeploymentState.SUCCEEDED:
+                self._update(service, JournalState.SUCCEEDED)
+            case "state", DeploymentState.FAILED:
+                self._update(service, JournalState.FAILED)
+
+    @property
+    def succeeded(self) -> list[str]:
+        return [name for name, entry in self.entries.items() if entry.state == JournalState.SUCCEEDED]
+
+    @property
+    def in_progress(self) -> dict[str, float]:
+        """
+        Get the deployments which have been triggered but have not settled yet
+
+        Returns:
+            dict[str, float]: Epoch timestamp of the deployment request per service
+        """
+        return {
+            name: entry.started_at
+            for name, entry in self.entries.items()
+            if entry.state in (JournalState.PATCHED, JournalState.WAITING)
+        }
+
+    def result(self, service: str) -> DeploymentResult:
+        """
+        Get the result of a deployment which succeeded before the operation was resumed
+
+        Args:
+            service (str)
+
+        Returns:
+            DeploymentResult
+        """
+        entry = self.entries[service]
+        return DeploymentResult(
+            service=service,
+            state=DeploymentState.SUCCEEDED,
+            status_code=HTTPStatus.OK,
+            message="Succeeded before resuming",
+            started_at=entry.started_at,
+            finished_at=entry.finished_at,
+        )
+
+    def finish(self, results: list[DeploymentResult]) -> None:
+        """
+        Close the journal once the results of the operation have been recorded
+
+        The journal is removed if every deployment succeeded, otherwise it is
+        kept for a resumed run.
+
+        Args:
+            results (list[DeploymentResult]): Results of all deployments of the operation
+        """
+        if all(result.succeeded for result in results):
+            self.path.unlink(missing_ok=True)
+        else:
+            self._append(RECORDED)
+            self.recorded = set(self.succeeded)
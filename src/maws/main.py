@@ -1,6 +1,13 @@
+import os
+import sys
+from pathlib import Path
+from typing import Annotated, Optional
+
+import click
 import typer
 
-from maws.commands import ecs
+from maws import __app_name__
+from maws.commands import agent, ecs
 
 # commands
 ecs_commands = typer.Typer(no_args_is_help=True)
@@ -8,10 +15,64 @@ ecs_commands.add_typer(ecs.app)
 
 app = typer.Typer(help="Welcome to Skaylink Managed AWS command line client.", no_args_is_help=True)
 app.add_typer(ecs_commands, name="ecs", help="ECS management commands")
+app.add_typer(agent.app, name="agent", help="Background agent keeping maws warm between commands")
+
+
+def command_path(ctx: typer.Context, args: list[str]) -> str:
+    """
+    Get the full name of the invoked subcommand, e.g. `maws ecs deploy`
+
+    Args:
+        ctx (typer.Context): Context of the root command
+        args (list[str]): Command line arguments
+
+    Returns:
+        str
+    """
+    words = [__app_name__]
+    command = ctx.command
+    tokens = iter(args)
+    for token in tokens:
+        if token == "--trace":
+            next(tokens, None)
+        if token.startswith("-"):
+            continue
+        if not isinstance(command, click.Group) or (command := command.get_command(ctx, token)) is None:
+            break
+        words.append(token)
+    return " ".join(words)
+
+
+@app.callback()
+def callback(
+    ctx: typer.Context,
+    trace: Annotated[
+        Optional[Path],
+        typer.Option(
+            envvar="MAWS_TRACE",
+            dir_okay=False,
+            help="Record a span per API request and write them to this file as OTLP/JSON",
+        ),
+    ] = None,
+) -> None:
+    if trace:
+        from maws.tracing import start_tracing, stop_tracing
+
+        # the subcommand arguments are not part of the root context anymore
+        args = sys.argv[1:]
+        start_tracing(command_path(ctx, args), {"maws.args": " ".join(args)})
+        ctx.call_on_close(lambda: stop_tracing(trace))
 
 
 def main():
-    app()  # pragma: no cover
+    args = sys.argv[1:]
+    # the agent never runs agent commands and completion is answered from the local cache
+    if args[:1] != ["agent"] and f"_{__app_name__.upper()}_COMPLETE" not in os.environ:
+        from maws.agent import forward
+
+        if (code := forward(args)) is not None:
+            sys.exit(code)
+    app()
 
 
 if __name__ == "__main__":
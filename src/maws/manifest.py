@@ -0,0 +1,160 @@
+import json
+import tomllib
+from collections import Counter
+from pathlib import Path
+from typing import Optional, TypeVar
+
+from pydantic import BaseModel
+
+MANIFEST_FORMATS = (".yaml", ".yml", ".toml", ".json")
+
+
+class ServiceDeployment(BaseModel):
+    """
+    A single service entry of a deployment manifest
+    """
+
+    name: str
+    image: str
+    force: bool = False
+    secret_arns: list[str] = []
+    # rollout ordering, see maws.rollout
+    depends_on: list[str] = []
+    wave: Optional[int] = None
+
+
+class TaskDeployment(BaseModel):
+    """
+    A single scheduled task entry of a deployment manifest
+    """
+
+    name: str
+    image: str
+
+
+Deployment = TypeVar("Deployment", ServiceDeployment, TaskDeployment)
+
+
+def read_manifest(path: Path) -> dict:
+    """
+    Read a YAML, TOML or JSON manifest file
+
+    Args:
+        path (Path): Path to the manifest file
+
+    Raises:
+        ValueError: If the file format is not supported
+
+    Returns:
+        dict
+    """
+    match path.suffix.lower():
+        case ".json":
+            data = json.loads(path.read_text())
+        case ".toml":
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        case ".yaml" | ".yml":
+            from ruamel.yaml import YAML
+
+            data = YAML(typ="safe").load(path.read_text())
+        case _:
+            raise ValueError(
+                f"Unsupported manifest format '{path.suffix}', expected one of: {', '.join(MANIFEST_FORMATS)}"
+            )
+    return data or {}
+
+
+def parse_entries(entries: dict | list) -> list[dict]:
+    """
+    Normalize manifest entries into a list of dicts with a `name` key
+
+    Entries can either be a mapping of `name: image` / `name: {image: ...}`
+    or a list of `{name: ..., image: ...}` items.
+
+    Args:
+        entries (dict | list)
+
+    Returns:
+        list[dict]
+    """
+    if isinstance(entries, list):
+        return entries
+    return [
+        {"name": name, "image": spec} if isinstance(spec, str) else {"name": name, **spec}
+        for name, spec in entries.items()
+    ]
+
+
+def load_deployments(path: Path, key: str, model: type[Deployment]) -> list[Deployment]:
+    """
+    Load the entries of a manifest section
+
+    Args:
+        path (Path): Path to the manifest file
+        key (str): Manifest section, e.g. `services`
+        model (type[ServiceDeployment | TaskDeployment])
+
+    Raises:
+        ValueError: If the section contains duplicate names
+
+    Returns:
+        list[ServiceDeployment | TaskDeployment]
+    """
+    data = read_manifest(path)
+    deployments = [model.model_validate(entry) for entry in parse_entries(data.get(key, {}))]
+
+    counts = Counter(deployment.name for deployment in deployments)
+    duplicates = sorted(name for name, count in counts.items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Duplicate {key} in manifest: {', '.join(duplicates)}")
+    return deployments
+
+
+def load_manifest(path: Path) -> list[ServiceDeployment]:
+    """
+    Load the service deployments of a manifest
+
+    Example manifest:
+
+        services:
+          my-service: registry/image:1.2.3
+          other-service:
+            image: registry/other:4.5.6
+            force: true
+            secret_arns:
+              - arn:aws:secretsmanager:eu-central-1:123456789012:secret:my-secret
+
+    Args:
+        path (Path): Path to the manifest file
+
+    Raises:
+        ValueError: If the manifest contains duplicate services
+
+    Returns:
+        list[ServiceDeployment]
+    """
+    return load_deployments(path, "services", ServiceDeployment)
+
+
+def load_task_manifest(path: Path) -> list[TaskDeployment]:
+    """
+    Load the scheduled task deployments of a manifest
+
+    Example manifest:
+
+        tasks:
+          my-task: registry/image:1.2.3
+          other-task:
+            image: registry/other:4.5.6
+
+    Args:
+        path (Path): Path to the manifest file
+
+    Raises:
+        ValueError: If the manifest contains duplicate tasks
+
+    Returns:
+        list[TaskDeployment]
+    """
+    return load_deployments(path, "tasks", TaskDeployment)
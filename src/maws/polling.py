@@ -0,0 +1,144 @@
+import random
+import time
+from typing import Iterator, Mapping, Optional
+
+from pydantic import BaseModel
+
+# Response header of status checks advertising how many seconds the API holds a request with `wait`
+WAIT_HEADER = "X-Max-Wait"
+
+
+class PollingPolicy(BaseModel):
+    """
+    Intervals between deployment status checks
+
+    Polling starts with `initial_delay` seconds, grows by `multiplier` after
+    every check up to `max_delay` and is randomized by +/- `jitter` (fraction
+    of the interval) so concurrent pollers do not hit the API in lockstep.
+    `timeout` bounds the overall waiting time in seconds. If the API supports
+    long polling, status checks ask it to hold the response for up to
+    `max_wait` seconds instead of sleeping, 0 disables long polling.
+    """
+
+    initial_delay: float = 1
+    max_delay: float = 15
+    multiplier: float = 2
+    jitter: float = 0.2
+    timeout: Optional[float] = None
+    max_wait: float = 0
+
+    @classmethod
+    def fixed(cls, delay: float, timeout: Optional[float] = None) -> "PollingPolicy":
+        """
+        Get a policy polling at a fixed interval, without long polling
+
+        Args:
+            delay (float): Interval in seconds
+            timeout (float, optional): Defaults to None.
+
+        Returns:
+            PollingPolicy
+        """
+        return cls(initial_delay=delay, max_delay=delay, multiplier=1, jitter=0, timeout=timeout)
+
+    def intervals(self) -> Iterator[float]:
+        """
+        Get the intervals to sleep between consecutive status checks
+
+        The iterator is exhausted once the timeout, counted from this call, has been reached.
+
+        Returns:
+            Iterator[float]
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        return self._intervals(deadline)
+
+    def _intervals(self, deadline: Optional[float]) -> Iterator[float]:
+        delay = self.initial_delay
+        while True:
+            interval = delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                interval = min(interval, remaining)
+            yield interval
+            delay = min(delay * self.multiplier, self.max_delay)
+
+
+def advertised_wait(headers: Mapping[str, str]) -> float:
+    """
+    Get the longest wait the API supports for status checks
+
+    Args:
+        headers (Mapping[str, str]): Headers of a status response
+
+    Returns:
+        float: 0 if the API does not support long polling
+    """
+    try:
+        return max(0.0, float(headers.get(WAIT_HEADER)))
+    except (TypeError, ValueError):
+        return 0
+
+
+class StatusWaits:
+    """
+    Server-side waits of consecutive deployment status checks
+
+    Once a status response advertises long polling, every following check
+    asks the API to hold the response while the deployment is in progress,
+    bounded by the policy and its remaining timeout, and the client does not
+    sleep in between. Without the header, or if the API answered a wait right
+    away, the intervals of the policy are slept as before.
+    """
+
+    def __init__(self, policy: PollingPolicy):
+        """
+        Args:
+            policy (PollingPolicy)
+        """
+        self.max_wait = policy.max_wait
+        self.deadline = None if policy.timeout is None else time.monotonic() + policy.timeout
+        self.wait = 0
+        self.requested = 0
+        self.sent = 0.0
+
+    def request(self, allowed: bool = True) -> dict:
+        """
+        Get the additional arguments of the next status check
+
+        Args:
+            allowed (bool, optional): Ask the API to wait, e.g. False while requests queue up. Defaults to True.
+
+        Returns:
+            dict: `wait` if the API is asked to hold the response
+        """
+        self.requested = self.wait if allowed else 0
+        self.sent = time.monotonic()
+        return {"wait": self.requested} if self.requested else {}
+
+    def pending(self, headers: Mapping[str, str]) -> bool:
+        """
+        Plan the next status check after a response of a deployment in progress
+
+        Args:
+            headers (Mapping[str, str]): Headers of the status response
+
+        Returns:
+            bool: True if the polling interval has to be slept before the next check
+        """
+        held = time.monotonic() - self.sent
+        discovered = not self.wait
+        advertised = advertised_wait(headers)
+        if not advertised:
+            self.wait = 0
+            return True
+        limit = min(self.max_wait, advertised)
+        if self.deadline is not None:
+            limit = min(limit, self.deadline - time.monotonic())
+        self.wait = int(limit) if limit >= 1 else 0
+        if not self.wait:
+            return True
+        # the first check after the API advertised long polling is sent right away
+        return not (discovered or (self.requested and held >= self.requested / 2))
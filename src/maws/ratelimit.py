@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from http import HTTPStatus
+from typing import Optional
+
+import httpx
+
+from maws.retry import IDEMPOTENT_METHODS
+
+# Seconds between two adjustments of the rate
+ADJUST_INTERVAL = 1
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all requests to an API endpoint
+
+    Deployment requests (non-idempotent methods) always take the next token,
+    going into debt if necessary, while status checks and listings wait until
+    a token is left over, so writes are never queued behind polling.
+
+    The rate adapts to throttling: a 429 response halves it, starting from the
+    observed request rate if the limiter is unbounded. Every second without
+    throttling raises it again by a tenth of the configured rate (or of the
+    current rate if unbounded) until the configured rate is reached.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None, min_rate: float = 0.5):
+        """
+        Args:
+            rate (float, optional): Requests per second. Defaults to None, unbounded until the API throttles.
+            burst (float, optional): Bucket size. Defaults to one second worth of requests.
+            min_rate (float, optional): Lower bound of the adapted rate. Defaults to 0.5.
+        """
+        self.configured_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.adjusted = 0.0
+        self.sent: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> float:
+        return self.burst or max(1.0, self.rate or 1.0)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _sent(self, now: float) -> None:
+        self.sent.append(now)
+        while self.sent and now - self.sent[0] > ADJUST_INTERVAL:
+            self.sent.popleft()
+
+    def reserve(self, priority: bool = False) -> float:
+        """
+        Take a token or get the time until one may be available
+
+        Args:
+            priority (bool, optional): Take the next token even if it is not available yet. Defaults to False.
+
+        Returns:
+            float: Seconds to wait, the request may be sent right away if 0 and has to reserve again otherwise
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._sent(now)
+            if self.rate is None:
+                return 0
+            self._refill(now)
+            if priority:
+                self.tokens -= 1
+                return max(0.0, -self.tokens / self.rate)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            # re-checked after waking up, a deployment request may take the token first
+            self.sent.pop()
+            return (1 - self.tokens) / self.rate
+
+    def record(self, response: httpx.Response) -> None:
+        """
+        Adapt the rate to a response
+
+        Args:
+            response (httpx.Response)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self.adjusted < ADJUST_INTERVAL:
+                return
+            if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                observed = self.rate or max(len(self.sent) / ADJUST_INTERVAL, 1.0)
+                if self.rate is None:
+                    self.tokens, self.updated = 0.0, now
+                else:
+                    self._refill(now)
+                self.rate = max(self.min_rate, observed / 2)
+                self.tokens = min(self.tokens, self.capacity)
+                self.adjusted = now
+            elif self.rate is not None and self.configured_rate != self.rate:
+                self._refill(now)
+                step = (self.configured_rate or self.rate) / 10
+                self.rate = self.rate + step
+                if self.configured_rate is not None:
+                    self.rate = min(self.rate, self.configured_rate)
+                self.adjusted = now
+
+    def wait(self, request: httpx.Request) -> None:
+        priority = request.method not in IDEMPOTENT_METHODS
+        while delay := self.reserve(priority):
+            time.sleep(delay)
+            if priority:
+                return
+
+    async def async_wait(self, request: httpx.Request) -> None:
+        priority = request.method not in IDEMPOTENT_METHODS
+        while delay := self.reserve(priority):
+            await asyncio.sleep(delay)
+            if priority:
+                return
+
+
+class RateLimitTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    httpx transport pacing requests with a rate limiter shared across transports
+    """
+
+    def __init__(self, transport, limiter: RateLimiter):
+        """
+        Args:
+            transport (httpx.BaseTransport | httpx.AsyncBaseTransport): Wrapped transport
+            limiter (RateLimiter)
+        """
+        self.transport = transport
+        self.limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.limiter.wait(request)
+        response = self.transport.handle_request(request)
+        self.limiter.record(response)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.async_wait(request)
+        response = await self.transport.handle_async_request(request)
+        self.limiter.record(response)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,266 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Callable, Optional
+
+import httpx
+from pydantic import BaseModel
+
+# Methods which can be repeated without side effects
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+RETRY_STATUS_CODES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+# Errors raised before the request has been sent, safe to retry for any method
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """
+    The API failed repeatedly and requests are rejected without being sent
+    """
+
+
+class RetryPolicy(BaseModel):
+    """
+    Retries of transient API failures
+
+    Idempotent requests are retried on transport errors and on the status
+    codes in `RETRY_STATUS_CODES`, other requests (e.g. PATCH) only if the
+    connection could not be established. Retries back off exponentially from
+    `initial_delay` up to `max_delay` with +/- `jitter`, a `Retry-After`
+    header is honoured as long as it does not exceed `max_delay`.
+    """
+
+    attempts: int = 3
+    initial_delay: float = 0.5
+    max_delay: float = 30
+    multiplier: float = 2
+    jitter: float = 0.2
+
+    def backoff(self, retry: int) -> float:
+        """
+        Get the delay before a retry
+
+        Args:
+            retry (int): Number of the retry, starting at 0
+
+        Returns:
+            float
+        """
+        delay = min(self.initial_delay * self.multiplier**retry, self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class CircuitBreaker:
+    """
+    Reject requests for `reset_timeout` seconds after `failure_threshold` consecutive failures
+
+    Once the timeout has passed a single trial request is let through, its
+    outcome closes the circuit again or restarts the timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        """
+        Args:
+            failure_threshold (int, optional): Defaults to 5.
+            reset_timeout (float, optional): Seconds the circuit stays open. Defaults to 30.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def check(self) -> bool:
+        """
+        Raises:
+            CircuitOpenError: If requests are currently rejected
+
+        Returns:
+            bool: True for the trial request, which has to be ended with `end_trial`
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            if not self._trial and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._trial = True
+                return True
+            raise CircuitOpenError(f"API unavailable after {self.failures} consecutive failures")
+
+    def end_trial(self) -> None:
+        # a trial request which was cancelled or failed without an outcome lets the next one through
+        with self._lock:
+            self._trial = False
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            self._trial = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Get the delay requested by the `Retry-After` header of a response
+
+    Args:
+        response (httpx.Response)
+
+    Returns:
+        float | None: Seconds, None if the header is missing or invalid
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    httpx transport adding retries and a circuit breaker to the sync and async clients of an endpoint
+
+    Example:
+
+        transport = RetryTransport(lambda: httpx.HTTPTransport(), lambda: httpx.AsyncHTTPTransport())
+        client = AuthenticatedClient(base_url=..., token=..., httpx_args={"transport": transport})
+    """
+
+    def __init__(
+        self,
+        transport: Callable[[], httpx.BaseTransport],
+        async_transport: Callable[[], httpx.AsyncBaseTransport],
+        policy: RetryPolicy = RetryPolicy(),
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Args:
+            transport (Callable[[], httpx.BaseTransport]): Factory of the wrapped sync transport
+            async_transport (Callable[[], httpx.AsyncBaseTransport]): Factory of the wrapped async transport
+            policy (RetryPolicy, optional)
+            breaker (CircuitBreaker, optional): Defaults to a new circuit breaker.
+        """
+        self._transport_factory = transport
+        self._async_transport_factory = async_transport
+        self._transport: Optional[httpx.BaseTransport] = None
+        self._async_transport: Optional[httpx.AsyncBaseTransport] = None
+        self.policy = policy
+        self.breaker = breaker or CircuitBreaker()
+
+    def delay(self, request: httpx.Request, retry: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """
+        Get the delay before retrying a failed attempt
+
+        Args:
+            request (httpx.Request)
+            retry (int): Number of the retry, starting at 0
+            response (httpx.Response, optional): None if the attempt raised
+
+        Returns:
+            float | None: None if the attempt must not be retried
+        """
+        if retry + 1 >= self.policy.attempts:
+            return None
+        if response is None:
+            return self.policy.backoff(retry)
+        if request.method not in IDEMPOTENT_METHODS or response.status_code not in RETRY_STATUS_CODES:
+            return None
+        requested = retry_after(response)
+        if requested is None:
+            return self.policy.backoff(retry)
+        return requested if requested <= self.policy.max_delay else None
+
+    def retryable(self, request: httpx.Request, error: httpx.TransportError) -> bool:
+        return isinstance(error, UNSENT_ERRORS) or request.method in IDEMPOTENT_METHODS
+
+    def record(self, response: Optional[httpx.Response]) -> None:
+        # throttling is not an outage
+        self.breaker.record(response is not None and response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._transport is None:
+            self._transport = self._transport_factory()
+        retry = 0
+        while True:
+            trial = self.breaker.check()
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError as e:
+                self.record(None)
+                delay = self.delay(request, retry) if self.retryable(request, e) else None
+                if delay is None:
+                    raise
+            else:
+                self.record(response)
+                delay = self.delay(request, retry, response)
+                if delay is None:
+                    return response
+                response.close()
+            finally:
+                if trial:
+                    self.breaker.end_trial()
+            time.sleep(delay)
+            retry += 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._async_transport is None:
+            self._async_transport = self._async_transport_factory()
+        retry = 0
+        while True:
+            trial = self.breaker.check()
+            try:
+                response = await self._async_transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                self.record(None)
+                delay = self.delay(request, retry) if self.retryable(request, e) else None
+                if delay is None:
+                    raise
+            else:
+                self.record(response)
+                delay = self.delay(request, retry, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+            finally:
+                if trial:
+                    self.breaker.end_trial()
+            await asyncio.sleep(delay)
+            retry += 1
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def aclose(self) -> None:
+        # the async pool is closed after every fleet operation and recreated on demand
+        if self._async_transport is not None:
+            await self._async_transport.aclose()
+            self._async_transport = None
@@ -0,0 +1,120 @@
+import asyncio
+from graphlib import CycleError, TopologicalSorter
+from typing import Optional
+
+from maws.clients.ecs_service_deployment_client import AuthenticatedClient
+from maws.config import async_session
+from maws.events import EventStream
+from maws.fleet import DeploymentResult, DeploymentState, deploy_services
+from maws.manifest import ServiceDeployment
+from maws.polling import PollingPolicy
+
+
+def rollout_graph(deployments: list[ServiceDeployment]) -> dict[str, set[str]]:
+    """
+    Get the prerequisites of every service of a rollout
+
+    A service depends on the services listed in its `depends_on` and on all
+    services of the previous wave, so waves are deployed in ascending order.
+    Services without a wave only wait for their explicit dependencies.
+
+    Args:
+        deployments (list[ServiceDeployment])
+
+    Raises:
+        ValueError: If a dependency is unknown or the dependencies are cyclic
+
+    Returns:
+        dict[str, set[str]]
+    """
+    names = {deployment.name for deployment in deployments}
+    waves: dict[int, set[str]] = {}
+    for deployment in deployments:
+        if deployment.wave is not None:
+            waves.setdefault(deployment.wave, set()).add(deployment.name)
+    previous_wave = dict(zip(sorted(waves)[1:], sorted(waves)))
+
+    graph = {}
+    for deployment in deployments:
+        unknown = sorted(set(deployment.depends_on) - names)
+        if unknown:
+            raise ValueError(f"Unknown dependencies of {deployment.name}: {', '.join(unknown)}")
+        graph[deployment.name] = set(deployment.depends_on)
+        if deployment.wave in previous_wave:
+            graph[deployment.name] |= waves[previous_wave[deployment.wave]]
+
+    try:
+        TopologicalSorter(graph).prepare()
+    except CycleError as e:
+        raise ValueError(f"Cyclic dependencies: {' -> '.join(e.args[1])}") from None
+    return graph
+
+
+async def deploy_rollout(
+    client: AuthenticatedClient,
+    deployments: list[ServiceDeployment],
+    policy: PollingPolicy,
+    concurrency: int = 10,
+    events: Optional[EventStream] = None,
+    reattach: Optional[dict[str, float]] = None,
+) -> list[DeploymentResult]:
+    """
+    Deploy services in dependency order with as much parallelism as the dependencies allow
+
+    Every service is started as soon as all of its prerequisites have
+    succeeded. Once a deployment fails or times out no further deployments are
+    started, the ones in progress are awaited and the rest is skipped.
+
+    Args:
+        client (AuthenticatedClient): Shared by all deployments
+        deployments (list[ServiceDeployment])
+        policy (PollingPolicy)
+        concurrency (int, optional): Maximum number of requests in flight. Defaults to 10.
+        events (EventStream, optional): Receives the progress of every deployment
+        reattach (dict[str, float], optional): Deployments already triggered, they are awaited once their
+            prerequisites have succeeded instead of being triggered again
+
+    Raises:
+        ValueError: If the dependencies are invalid
+
+    Returns:
+        list[DeploymentResult]: Results in manifest order
+    """
+    sorter = TopologicalSorter(rollout_graph(deployments))
+    sorter.prepare()
+    by_name = {deployment.name: deployment for deployment in deployments}
+    order = {deployment.name: index for index, deployment in enumerate(deployments)}
+    semaphore = asyncio.Semaphore(concurrency)
+    results: dict[str, DeploymentResult] = {}
+    running: dict[asyncio.Task, str] = {}
+    halted = False
+
+    async with async_session(client):
+        while True:
+            if not halted:
+                # ready services start together, in manifest order
+                ready = sorted(sorter.get_ready(), key=order.__getitem__)
+                for name, settle in zip(
+                    ready,
+                    deploy_services(client, [by_name[name] for name in ready], semaphore, policy, events, reattach),
+                ):
+                    running[asyncio.create_task(settle)] = name
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                results[name] = task.result()
+                if results[name].succeeded:
+                    sorter.done(name)
+                else:
+                    halted = True
+
+    for deployment in deployments:
+        if deployment.name not in results:
+            results[deployment.name] = DeploymentResult(
+                service=deployment.name, state=DeploymentState.SKIPPED, message="Not started after a failed deployment"
+            )
+            if events:
+                events.transition(deployment.name, DeploymentState.SKIPPED)
+    return [results[deployment.name] for deployment in deployments]
@@ -0,0 +1,157 @@
+import os
+import time
+from enum import StrEnum
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+from maws import cache_dir
+from maws.fleet import DeploymentResult
+from maws.manifest import ServiceDeployment
+
+
+class ServiceState(BaseModel):
+    """
+    Last successful deployment of a service
+    """
+
+    image: str
+    secret_arns: list[str] = []
+    deployed_at: float = 0
+
+
+class ReleaseState(BaseModel):
+    """
+    Services deployed by maws through an API endpoint
+    """
+
+    base_url: str
+    services: dict[str, ServiceState] = {}
+
+
+class PlanAction(StrEnum):
+    CREATE = "create"
+    UPDATE = "update"
+    FORCE = "force"
+    UNCHANGED = "unchanged"
+
+
+class PlannedDeployment(BaseModel):
+    """
+    A manifest entry compared with the recorded state
+    """
+
+    deployment: ServiceDeployment
+    action: PlanAction
+    previous: Optional[ServiceState] = None
+
+    @property
+    def changed(self) -> bool:
+        return self.action != PlanAction.UNCHANGED
+
+
+def state_path(profile: Optional[str] = None) -> Path:
+    """
+    Get the path of the deployment state of a profile
+
+    Args:
+        profile (str, optional): Defaults to None.
+
+    Returns:
+        Path
+    """
+    return cache_dir() / "state" / f"{profile or 'default'}.json"
+
+
+def load_state(profile: Optional[str], base_url: str) -> ReleaseState:
+    """
+    Load the deployment state of a profile
+
+    Args:
+        profile (str | None)
+        base_url (str): State of other endpoints is ignored
+
+    Returns:
+        ReleaseState: Empty if nothing has been recorded yet
+    """
+    try:
+        state = ReleaseState.model_validate_json(state_path(profile).read_text())
+    except (OSError, ValueError):
+        return ReleaseState(base_url=base_url)
+    return state if state.base_url == base_url else ReleaseState(base_url=base_url)
+
+
+def save_state(profile: Optional[str], state: ReleaseState) -> None:
+    """
+    Store the deployment state of a profile
+
+    Args:
+        profile (str | None)
+        state (ReleaseState)
+    """
+    path = state_path(profile)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(state.model_dump_json(indent=2))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # the next plan deploys the services again
+
+
+def record_deployments(
+    profile: Optional[str],
+    base_url: str,
+    deployments: list[ServiceDeployment],
+    results: list[DeploymentResult],
+) -> None:
+    """
+    Record the successful deployments of a command
+
+    Args:
+        profile (str | None)
+        base_url (str)
+        deployments (list[ServiceDeployment])
+        results (list[DeploymentResult]): Results of the deployments, failed ones are ignored
+    """
+    succeeded = {result.service for result in results if result.succeeded}
+    if not succeeded:
+        return
+    # reload right before saving to keep the records of concurrent commands
+    state = load_state(profile, base_url)
+    for deployment in deployments:
+        if deployment.name in succeeded:
+            state.services[deployment.name] = ServiceState(
+                image=deployment.image, secret_arns=deployment.secret_arns, deployed_at=time.time()
+            )
+    save_state(profile, state)
+
+
+def plan_deployments(deployments: list[ServiceDeployment], state: ReleaseState) -> list[PlannedDeployment]:
+    """
+    Compare manifest entries with the recorded state
+
+    A service is unchanged if its last successful deployment used the same
+    image and secrets and the entry does not force a new deployment.
+
+    Args:
+        deployments (list[ServiceDeployment])
+        state (ReleaseState)
+
+    Returns:
+        list[PlannedDeployment]: In manifest order
+    """
+    plan = []
+    for deployment in deployments:
+        previous = state.services.get(deployment.name)
+        if previous is None:
+            action = PlanAction.CREATE
+        elif deployment.force:
+            action = PlanAction.FORCE
+        elif previous.image != deployment.image or sorted(previous.secret_arns) != sorted(deployment.secret_arns):
+            action = PlanAction.UPDATE
+        else:
+            action = PlanAction.UNCHANGED
+        plan.append(PlannedDeployment(deployment=deployment, action=action, previous=previous))
+    return plan
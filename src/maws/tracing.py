@@ -0,0 +1,325 @@
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator, Optional
+
+import httpx
+from pydantic import BaseModel
+
+from maws import __app_name__, __version__
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+RESOURCE_PATH = re.compile(r"/(services|tasks)/([^/?]+)")
+
+# httpcore trace events marking the phases of a request
+CONNECT_EVENTS = ("connection.connect_tcp", "connection.connect_unix")
+TLS_EVENT = "connection.start_tls"
+REQUEST_EVENTS = ("http11.send_request_headers", "http2.send_request_headers")
+RESPONSE_EVENTS = ("http11.receive_response_headers", "http2.receive_response_headers")
+
+
+def otlp_value(value: Any) -> dict:
+    match value:
+        case bool():
+            return {"boolValue": value}
+        case int():
+            return {"intValue": str(value)}
+        case float():
+            return {"doubleValue": value}
+        case _:
+            return {"stringValue": str(value)}
+
+
+class Span(BaseModel):
+    """
+    A timed operation of a trace
+    """
+
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    name: str
+    kind: int = SPAN_KIND_INTERNAL
+    start_time: int  # unix nanoseconds
+    end_time: Optional[int] = None
+    attributes: dict[str, Any] = {}
+    error: Optional[str] = None
+
+    def end(self, error: Optional[str] = None) -> None:
+        if self.end_time is None:
+            self.end_time = time.time_ns()
+            self.error = error
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time),
+            "endTimeUnixNano": str(self.end_time or time.time_ns()),
+            "attributes": [{"key": key, "value": otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": STATUS_ERROR, "message": self.error} if self.error else {"code": STATUS_OK},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+class Tracer:
+    """
+    Collect the spans of a single command below a root span
+
+    Example:
+
+        tracer = start_tracing("maws ecs deploy")
+        ...
+        stop_tracing(Path("trace.json"))
+    """
+
+    def __init__(self, name: str, attributes: Optional[dict] = None):
+        """
+        Args:
+            name (str): Name of the root span, e.g. the command
+            attributes (dict, optional): Attributes of the root span
+        """
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self.root = self.start_span(name, parent=None, attributes=attributes)
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[dict] = None,
+    ) -> Span:
+        """
+        Start a span, nested under the root span by default
+
+        Args:
+            name (str)
+            parent (Span, optional): Defaults to the root span.
+            kind (int, optional): OTLP span kind. Defaults to SPAN_KIND_INTERNAL.
+            attributes (dict, optional)
+
+        Returns:
+            Span
+        """
+        parent = parent or getattr(self, "root", None)
+        span = Span(
+            trace_id=self.trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_span_id=parent.span_id if parent else None,
+            name=name,
+            kind=kind,
+            start_time=time.time_ns(),
+            attributes=attributes or {},
+        )
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def to_otlp(self) -> dict:
+        """
+        Get all spans as OTLP/JSON `ExportTraceServiceRequest`
+
+        Returns:
+            dict
+        """
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": otlp_value(__app_name__)},
+                            {"key": "service.version", "value": otlp_value(__version__)},
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "maws.tracing", "version": __version__},
+                            "spans": [span.to_otlp() for span in self.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def write(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_otlp(), indent=2))
+
+
+_tracer: Optional[Tracer] = None
+
+
+def start_tracing(name: str, attributes: Optional[dict] = None) -> Tracer:
+    """
+    Start recording spans of all API requests in this process
+
+    Args:
+        name (str): Name of the root span
+        attributes (dict, optional): Attributes of the root span
+
+    Returns:
+        Tracer
+    """
+    global _tracer
+    _tracer = Tracer(name, attributes)
+    return _tracer
+
+
+def stop_tracing(path: Optional[Path] = None, error: Optional[str] = None) -> Optional[Tracer]:
+    """
+    End the root span and stop recording
+
+    Args:
+        path (Path, optional): Write the trace to this file
+        error (str, optional): Mark the root span as failed
+
+    Returns:
+        Tracer | None: The stopped tracer, None if tracing was not started
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer:
+        tracer.root.end(error)
+        if path:
+            tracer.write(path)
+    return tracer
+
+
+def elapsed_ms(start: Optional[int], end: Optional[int]) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    return round((end - start) / 1e6, 3)
+
+
+class RequestTrace:
+    """
+    Timings of a single HTTP request, fed by httpcore trace events
+    """
+
+    def __init__(self, tracer: Tracer, request: httpx.Request):
+        self.tracer = tracer
+        self.events: dict[str, int] = {}
+        attributes = {
+            "http.request.method": request.method,
+            "url.full": str(request.url),
+            "server.address": request.url.host,
+        }
+        if match := RESOURCE_PATH.search(request.url.path):
+            attributes[f"maws.{match.group(1).removesuffix('s')}"] = match.group(2)
+        self.span = tracer.start_span(
+            f"{request.method} {request.url.path}", kind=SPAN_KIND_CLIENT, attributes=attributes
+        )
+
+    def event(self, name: str, info: dict) -> None:
+        self.events.setdefault(name, time.time_ns())
+
+    async def async_event(self, name: str, info: dict) -> None:
+        self.event(name, info)
+
+    def phase(self, names: tuple[str, ...], suffix: str) -> Optional[int]:
+        return next((self.events[f"{name}.{suffix}"] for name in names if f"{name}.{suffix}" in self.events), None)
+
+    def end(self, response: Optional[httpx.Response] = None, error: Optional[BaseException] = None) -> None:
+        if self.span.end_time is not None:
+            return
+        end = time.time_ns()
+        timings = {
+            "http.connect_ms": elapsed_ms(
+                self.phase(CONNECT_EVENTS, "started"), self.phase(CONNECT_EVENTS, "complete")
+            ),
+            "http.tls_ms": elapsed_ms(self.phase((TLS_EVENT,), "started"), self.phase((TLS_EVENT,), "complete")),
+            "http.ttfb_ms": elapsed_ms(self.phase(REQUEST_EVENTS, "started"), self.phase(RESPONSE_EVENTS, "complete")),
+            "http.total_ms": elapsed_ms(self.span.start_time, end),
+        }
+        self.span.attributes.update({key: value for key, value in timings.items() if value is not None})
+        self.span.attributes["http.connection_reused"] = self.phase(CONNECT_EVENTS, "started") is None
+        if response is not None:
+            self.span.attributes["http.response.status_code"] = response.status_code
+        message = repr(error) if error else None
+        if response is not None and response.status_code >= 500:
+            message = f"HTTP {response.status_code}"
+        self.span.end(message)
+
+
+class TracedStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Response stream ending the request span once the body has been read
+    """
+
+    def __init__(self, stream, trace: RequestTrace, response: httpx.Response):
+        self.stream = stream
+        self.trace = trace
+        self.response = response
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self.stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    def close(self) -> None:
+        self.stream.close()
+        self.trace.end(self.response)
+
+    async def aclose(self) -> None:
+        await self.stream.aclose()
+        self.trace.end(self.response)
+
+
+class TracingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    httpx transport recording a span per request while tracing is active
+    """
+
+    def __init__(self, transport):
+        """
+        Args:
+            transport (httpx.BaseTransport | httpx.AsyncBaseTransport): Wrapped transport
+        """
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if _tracer is None:
+            return self.transport.handle_request(request)
+        trace = RequestTrace(_tracer, request)
+        request.extensions = {**request.extensions, "trace": trace.event}
+        try:
+            response = self.transport.handle_request(request)
+        except Exception as e:
+            trace.end(error=e)
+            raise
+        response.stream = TracedStream(response.stream, trace, response)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if _tracer is None:
+            return await self.transport.handle_async_request(request)
+        trace = RequestTrace(_tracer, request)
+        request.extensions = {**request.extensions, "trace": trace.async_event}
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception as e:
+            trace.end(error=e)
+            raise
+        response.stream = TracedStream(response.stream, trace, response)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,106 @@
+import re
+from importlib.resources import files
+from typing import Any, Callable, Iterator
+
+from pydantic import BaseModel
+
+TYPES = {"string": str, "boolean": bool, "array": list, "object": dict}
+
+# A check yields the error messages of a value at a location
+Check = Callable[[Any, str], Iterator[str]]
+
+
+def compile_schema(schema: dict) -> Check:
+    """
+    Compile the subset of OpenAPI schema keywords used by the request schemas into a check
+
+    Patterns are compiled once and, as in JSON Schema, match anywhere in the value.
+
+    Args:
+        schema (dict)
+
+    Returns:
+        Check
+    """
+    expected = TYPES.get(schema.get("type"))
+    nullable = schema.get("nullable", False)
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+    items = compile_schema(schema["items"]) if "items" in schema else None
+    required = schema.get("required", [])
+    properties = {name: compile_schema(spec) for name, spec in schema.get("properties", {}).items()}
+
+    def check(value: Any, path: str) -> Iterator[str]:
+        if value is None:
+            if not nullable:
+                yield f"{path} must not be null"
+            return
+        if expected and not isinstance(value, expected):
+            yield f"{path} must be of type {schema['type']}"
+            return
+        if min_length is not None and len(value) < min_length:
+            yield f"{path} must not be shorter than {min_length}" if min_length > 1 else f"{path} must not be empty"
+        if max_length is not None and len(value) > max_length:
+            yield f"{path} must not be longer than {max_length}"
+        if pattern and not pattern.search(value):
+            yield f"{path} '{value}' does not match {pattern.pattern}"
+        if items:
+            for index, item in enumerate(value):
+                yield from items(item, f"{path}[{index}]")
+        for name in required:
+            if name not in value:
+                yield f"{name} is required"
+        for name, property_check in properties.items():
+            if name in value:
+                yield from property_check(value[name], f"{path}.{name}" if path else name)
+
+    return check
+
+
+# Schemas of openapi.yaml (`components.schemas`) and the compiled checks of request schemas, loaded on first use
+_schemas: dict[str, dict] = {}
+_request_checks: dict[str, Check] = {}
+
+
+def request_schema(name: str) -> dict:
+    """
+    Get a schema of the API specification shipped with maws, the one the client is generated from
+
+    Args:
+        name (str): e.g. `ServiceDeploymentRequest`
+
+    Raises:
+        KeyError: If the specification has no such schema
+
+    Returns:
+        dict
+    """
+    if not _schemas:
+        from ruamel.yaml import YAML
+
+        spec = YAML(typ="safe").load(files("maws").joinpath("openapi.yaml").read_text())
+        _schemas.update(spec["components"]["schemas"])
+    return _schemas[name]
+
+
+def validate_requests(deployments: list[BaseModel], schema: str) -> list[tuple[str, str]]:
+    """
+    Check deployments against a request schema before sending any of them
+
+    Args:
+        deployments (list[ServiceDeployment | TaskDeployment])
+        schema (str): Name of the request schema, e.g. `ServiceDeploymentRequest`
+
+    Returns:
+        list[tuple[str, str]]: Name of the deployment and message of every error
+    """
+    if schema not in _request_checks:
+        _request_checks[schema] = compile_schema(request_schema(schema))
+    check = _request_checks[schema]
+    fields = request_schema(schema)["properties"].keys()
+    return [
+        (deployment.name, message)
+        for deployment in deployments
+        for message in check(deployment.model_dump(include=set(fields)), "")
+    ]
@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import time
+from typing import Callable, Iterator, Optional
+
+from maws.clients.ecs_service_deployment_client import AuthenticatedClient
+from maws.config import async_session
+from maws.events import EventStream
+from maws.fleet import (
+    DeploymentResult,
+    DeploymentState,
+    check_deployment,
+    list_services,
+)
+from maws.polling import PollingPolicy
+
+
+class FleetWatcher:
+    """
+    Incrementally refreshed deployment status of many services
+
+    Checks are kept in a heap ordered by due time, so every round only
+    requests the services which are due. Services in progress are checked
+    with the intervals of the polling policy. Settled services are checked
+    again after `settled_delay` seconds, doubled after every check without a
+    change up to `settled_max_delay`, so a new deployment is still noticed.
+    Rounds are at least `tick` seconds apart, which batches the checks and
+    bounds how often listeners are notified.
+    """
+
+    def __init__(
+        self,
+        client: AuthenticatedClient,
+        services: Optional[list[str]],
+        policy: PollingPolicy,
+        concurrency: int = 10,
+        settled_delay: float = 30,
+        settled_max_delay: float = 300,
+        tick: float = 0.25,
+        events: Optional[EventStream] = None,
+    ):
+        """
+        Args:
+            client (AuthenticatedClient)
+            services (list[str] | None): Services to watch, None for all available services
+            policy (PollingPolicy): Polling of services in progress, its timeout is ignored
+            concurrency (int, optional): Maximum number of requests in flight. Defaults to 10.
+            settled_delay (float, optional): First delay before a settled service is checked again. Defaults to 30.
+            settled_max_delay (float, optional): Upper bound of that delay. Defaults to 300.
+            tick (float, optional): Minimum seconds between two rounds of checks. Defaults to 0.25.
+            events (EventStream, optional): Receives a `state` event per change
+        """
+        self.client = client
+        self.services = services
+        self.policy = policy.model_copy(update={"timeout": None})
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.settled_delay = settled_delay
+        self.settled_max_delay = settled_max_delay
+        self.tick = tick
+        self.events = events
+        self.results: dict[str, DeploymentResult] = {}
+        self.checks = 0
+        self._due: list[tuple[float, str]] = []
+        self._intervals: dict[str, Iterator[float]] = {}
+        self._delays: dict[str, float] = {}
+
+    @property
+    def settled(self) -> bool:
+        return bool(self.results) and all(result.state != DeploymentState.PENDING for result in self.results.values())
+
+    def _schedule(self, result: DeploymentResult, changed: bool, now: float) -> None:
+        service = result.service
+        if result.state == DeploymentState.PENDING:
+            self._delays.pop(service, None)
+            if changed or service not in self._intervals:
+                self._intervals[service] = self.policy.intervals()
+            delay = next(self._intervals[service])
+        else:
+            self._intervals.pop(service, None)
+            previous = self._delays.get(service)
+            delay = self.settled_delay if changed or previous is None else min(previous * 2, self.settled_max_delay)
+            self._delays[service] = delay
+        heapq.heappush(self._due, (now + delay, service))
+
+    async def _check(self, service: str) -> DeploymentResult:
+        try:
+            return await check_deployment(self.client, service, self.semaphore)
+        except Exception as e:
+            return DeploymentResult(service=service, state=DeploymentState.FAILED, message=str(e))
+
+    async def refresh(self) -> list[DeploymentResult]:
+        """
+        Check the services which are due
+
+        Returns:
+            list[DeploymentResult]: Results whose state, status code or message changed
+        """
+        now = time.monotonic()
+        due = []
+        while self._due and self._due[0][0] <= now:
+            due.append(heapq.heappop(self._due)[1])
+        if not due:
+            return []
+
+        results = await asyncio.gather(*(self._check(service) for service in due))
+        self.checks += len(results)
+        now, changes = time.monotonic(), []
+        for result in results:
+            previous = self.results.get(result.service)
+            result.polls = (previous.polls if previous else 0) + 1
+            changed = previous is None or (previous.state, previous.status_code, previous.message) != (
+                result.state,
+                result.status_code,
+                result.message,
+            )
+            self.results[result.service] = result
+            self._schedule(result, previous is None or previous.state != result.state, now)
+            if changed:
+                changes.append(result)
+                if self.events:
+                    self.events.transition(result.service, result.state, result.status_code, result.message)
+        return changes
+
+    def next_due(self) -> Optional[float]:
+        """
+        Get the seconds until the next check is due
+
+        Returns:
+            float | None: None if nothing is scheduled
+        """
+        return max(0.0, self._due[0][0] - time.monotonic()) if self._due else None
+
+    async def watch(
+        self,
+        on_change: Callable[[list[DeploymentResult]], None],
+        until_settled: bool = False,
+    ) -> dict[str, DeploymentResult]:
+        """
+        Refresh the services until cancelled or, optionally, all deployments have settled
+
+        Args:
+            on_change (Callable[[list[DeploymentResult]], None]): Called with the changed results of every round
+            until_settled (bool, optional): Stop once no deployment is in progress. Defaults to False.
+
+        Returns:
+            dict[str, DeploymentResult]: Latest result per service
+        """
+        async with async_session(self.client):
+            services = self.services if self.services is not None else await list_services(self.client)
+            now = time.monotonic()
+            self._due = [(now, service) for service in services]
+            heapq.heapify(self._due)
+            while self._due:
+                if changes := await self.refresh():
+                    on_change(changes)
+                if until_settled and self.settled and len(self.results) == len(services):
+                    break
+                await asyncio.sleep(max(self.tick, self.next_due() or 0))
+        return self.results
@@ -0,0 +1,232 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from unittest.mock import patch
+
+import pytest
+
+from maws import __version__
+from maws.agent import (
+    AgentServer,
+    FrameWriter,
+    connect,
+    control,
+    forward,
+    send_frame,
+    socket_path,
+    start_agent,
+)
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture(scope="function")
+def agent():
+    server = AgentServer(socket_path(), idle_timeout=None)
+    thread = threading.Thread(target=server.serve, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.stopping = True
+    thread.join(timeout=5)
+
+
+class TestForward:
+
+    def test_without_agent(self):
+        assert forward(["--help"]) is None
+
+    def test_disabled(self, agent, monkeypatch):
+        monkeypatch.setenv("MAWS_NO_AGENT", "1")
+        assert forward(["--help"]) is None
+        assert agent.commands == 0
+
+    def test_runs_command(self, agent, capsys):
+        assert forward(["ecs", "--help"]) == 0
+
+        assert "Usage: maws ecs" in capsys.readouterr().out
+        assert agent.commands == 1
+
+    def test_exit_code_and_stderr(self, agent, capsys):
+        assert forward(["ecs", "unknown-command"]) == 2
+        assert "No such command" in capsys.readouterr().err
+
+    def test_command_environment(self, agent, capsys, monkeypatch, tmp_path):
+        monkeypatch.setenv("MAWS_TEST_VALUE", "from-client")
+        monkeypatch.chdir(tmp_path)
+
+        def command(args, prog_name):
+            import os
+
+            print(os.environ["MAWS_TEST_VALUE"], os.getcwd())
+
+        with patch("maws.main.app", side_effect=command):
+            assert forward(["ecs"]) == 0
+
+        assert capsys.readouterr().out.split() == ["from-client", str(tmp_path)]
+
+    def test_settings_from_client_environment(self):
+        # the agent imported the settings with its own API_* variables, the client has none
+        script = (
+            "import os; from maws.config import get_settings; "
+            "os.environ.pop('API_BASE_URL'); os.environ.pop('API_ACCESS_TOKEN'); "
+            "settings = get_settings(None); print(settings.api_base_url, settings.api_access_token)"
+        )
+        env = {**os.environ, "API_BASE_URL": "https://agent-env.example", "API_ACCESS_TOKEN": "agent-token"}
+
+        result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+
+        assert result.stdout.split() == ["None", "None"]
+
+    def test_client_terminal(self, agent, capsys):
+        def command(args, prog_name):
+            from maws.commands import ecs
+
+            print(sys.stdout.isatty(), ecs.console.is_terminal, ecs.console.width)
+
+        with (
+            patch("maws.main.app", side_effect=command),
+            patch("maws.agent.terminal", return_value={"isatty": True, "width": 123}),
+        ):
+            assert forward(["ecs"]) == 0
+
+        assert capsys.readouterr().out.split() == ["True", "True", "123"]
+
+    def test_disconnect_interrupts_command(self, agent, tmp_path):
+        started, interrupted = tmp_path / "started", tmp_path / "interrupted"
+
+        def command(args, prog_name):
+            started.touch()
+            try:
+                while True:
+                    time.sleep(0.01)
+            except KeyboardInterrupt:
+                interrupted.touch()
+                raise
+
+        # the client runs in its own process, the forked command would otherwise hold its socket open
+        script = (
+            "import sys; from maws.agent import connect, send_frame; sock = connect(); stream = sock.makefile('rwb'); "
+            f"send_frame(stream, {{'version': {__version__!r}, 'args': ['ecs'], 'cwd': '.', 'env': {{}}}}); "
+            "print(stream.readline().decode(), flush=True); sys.stdin.read()"
+        )
+        with patch("maws.main.app", side_effect=command):
+            client = subprocess.Popen([sys.executable, "-c", script], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            try:
+                assert "accepted" in json.loads(client.stdout.readline())
+                assert wait_for(started.exists)
+            finally:
+                client.kill()
+                client.wait()
+
+            assert wait_for(lambda: agent.commands == 1)
+        assert interrupted.exists()
+        assert agent.children == set()
+
+    def test_concurrent_commands(self, agent):
+        def command(args, prog_name):
+            time.sleep(0.2)
+            print(os.environ["MAWS_TEST_VALUE"], os.getpid())
+
+        def run(value: str) -> tuple[list[str], int]:
+            with connect() as sock, sock.makefile("rwb") as stream:
+                send_frame(
+                    stream, {"version": __version__, "args": ["ecs"], "cwd": ".", "env": {"MAWS_TEST_VALUE": value}}
+                )
+                output = ""
+                for line in stream:
+                    frame = json.loads(line)
+                    if "exit" in frame:
+                        return output.split(), frame["exit"]
+                    output += frame.get("stdout", "")
+
+        with patch("maws.main.app", side_effect=command), ThreadPoolExecutor(2) as pool:
+            started_at = time.monotonic()
+            results = list(pool.map(run, ["first", "second"]))
+            elapsed = time.monotonic() - started_at
+
+        (first, first_code), (second, second_code) = results
+        assert first_code == second_code == 0
+        assert [first[0], second[0]] == ["first", "second"]
+        assert len({first[1], second[1], str(os.getpid())}) == 3
+        assert elapsed < 0.4
+        assert "MAWS_TEST_VALUE" not in os.environ
+
+    def test_other_version_hands_back(self, agent):
+        with connect() as sock, sock.makefile("rwb") as stream:
+            send_frame(stream, {"version": "0.0.0", "args": ["--help"], "cwd": ".", "env": {}})
+            assert "fallback" in json.loads(stream.readline())
+        assert agent.commands == 0
+
+
+class TestControl:
+
+    def test_ping(self, agent):
+        status = control("ping")
+
+        assert status["version"] == __version__
+        assert status["commands"] == 0
+        assert status["running"] == 0
+
+    def test_stop(self, agent):
+        assert control("stop") is not None
+        assert agent.stopping
+
+    def test_not_running(self):
+        assert control("ping") is None
+
+
+class TestStartAgent:
+
+    def test_socket_is_private(self):
+        server = start_agent(idle_timeout=None)
+        try:
+            assert socket_path().stat().st_mode & 0o077 == 0
+        finally:
+            server.server_close()
+
+    def test_replaces_stale_socket(self):
+        socket_path().parent.mkdir(parents=True)
+        socket_path().touch()
+
+        server = start_agent(idle_timeout=None)
+        server.server_close()
+
+    def test_already_running(self, agent):
+        with pytest.raises(RuntimeError, match="already running"):
+            start_agent()
+
+    def test_idle_timeout(self):
+        server = start_agent(idle_timeout=0)
+        server.serve(poll_interval=0.01)
+
+        assert not socket_path().exists()
+
+
+class TestFrames:
+
+    def test_send_frame(self):
+        stream = io.BytesIO()
+        send_frame(stream, {"stdout": "text\n"})
+        assert json.loads(stream.getvalue()) == {"stdout": "text\n"}
+
+    def test_frame_writer(self):
+        frames = []
+        writer = FrameWriter(frames.append, "stderr")
+
+        print("error", file=writer)
+
+        assert frames == [{"stderr": "error"}, {"stderr": "\n"}]
+        assert not writer.isatty()
@@ -0,0 +1,145 @@
+import asyncio
+import time
+from http import HTTPStatus
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from benchmarks.run import BenchmarkResult, Metric, compare, fleet_throughput
+from benchmarks.stub import TOKEN, DeploymentApiStub, StubConfig
+from maws.clients.ecs_service_deployment_client import AuthenticatedClient
+from maws.fleet import deploy_fleet, fleet_status, list_services
+from maws.httpcache import CacheTransport, HttpCache
+from maws.manifest import ServiceDeployment
+from maws.polling import PollingPolicy
+from maws.retry import RetryTransport
+
+
+@pytest.fixture(scope="function")
+def stub():
+    with DeploymentApiStub(StubConfig(services=["api", "worker"], sequence=[202, 202, 417])) as stub:
+        yield stub
+
+
+def client(stub: DeploymentApiStub, token: str = TOKEN) -> AuthenticatedClient:
+    return AuthenticatedClient(base_url=f"{stub.base_url}/v1", token=token, auth_header_name="x-api-token", prefix="")
+
+
+def result(**metrics: Metric) -> BenchmarkResult:
+    return BenchmarkResult(created_at="2025-01-01T00:00:00+00:00", config={}, metrics=metrics)
+
+
+class TestDeploymentApiStub:
+
+    def test_status_sequence(self, stub):
+        deployments = [ServiceDeployment(name="api", image="img")]
+
+        results = asyncio.run(deploy_fleet(client(stub), deployments, PollingPolicy.fixed(0)))
+
+        assert results[0].status_code == HTTPStatus.EXPECTATION_FAILED
+        assert results[0].message == "Deployment of api failed"
+        assert stub.requests == {"PATCH /services/{name}": 1, "GET /services/{name}": 3}
+
+    def test_listing_and_idle_services(self, stub):
+        results = asyncio.run(fleet_status(client(stub)))
+
+        assert [result.service for result in results] == ["api", "worker"]
+        assert all(result.succeeded for result in results)
+
+    def test_unknown_service(self, stub):
+        deployments = [ServiceDeployment(name="unknown", image="img")]
+        results = asyncio.run(deploy_fleet(client(stub), deployments, PollingPolicy.fixed(0)))
+        assert results[0].status_code == HTTPStatus.NOT_FOUND
+
+    def test_invalid_token(self, stub):
+        results = asyncio.run(fleet_status(client(stub, "invalid"), ["api"]))
+        assert results[0].status_code == HTTPStatus.FORBIDDEN
+
+    def test_error_rate(self):
+        with DeploymentApiStub(StubConfig(services=["api"], error_rate=1)) as stub:
+            results = asyncio.run(fleet_status(client(stub), ["api"]))
+        assert results[0].status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+
+    def test_long_polling(self):
+        config = StubConfig(services=["api"], sequence=[202] * 20 + [200], max_wait=5, step=0.005)
+        policy = PollingPolicy(initial_delay=30, max_delay=30, max_wait=5)
+        with DeploymentApiStub(config) as stub:
+            started = time.monotonic()
+            results = asyncio.run(deploy_fleet(client(stub), [ServiceDeployment(name="api", image="img")], policy))
+
+        assert results[0].succeeded
+        assert time.monotonic() - started < 5
+        # the first check discovers long polling, the second one is held until the deployment succeeded
+        assert stub.requests["GET /services/{name}"] == 2
+
+    def test_long_polling_not_advertised(self):
+        config = StubConfig(services=["api"], sequence=[202, 202, 200])
+        with DeploymentApiStub(config) as stub:
+            policy = PollingPolicy(initial_delay=0.01, max_delay=0.01, max_wait=5)
+            results = asyncio.run(deploy_fleet(client(stub), [ServiceDeployment(name="api", image="img")], policy))
+
+        assert results[0].succeeded
+        assert stub.requests["GET /services/{name}"] == 3
+
+    @pytest.mark.parametrize("batch", [True, False])
+    def test_batch_deployments(self, batch):
+        deployments = [ServiceDeployment(name=name, image="img") for name in ("api", "worker", "unknown")]
+        with DeploymentApiStub(StubConfig(services=["api", "worker"], batch=batch)) as stub:
+            results = asyncio.run(deploy_fleet(client(stub), deployments, PollingPolicy.fixed(0)))
+
+        assert [result.state for result in results] == ["succeeded", "succeeded", "failed"]
+        assert results[2].status_code == HTTPStatus.NOT_FOUND
+        assert stub.requests["PATCH /v1/services"] == 1
+        assert stub.requests["PATCH /services/{name}"] == (0 if batch else 3)
+
+    def test_conditional_listing(self, tmp_path):
+        config = StubConfig(services=["api", "worker"], validators=True, compress=True)
+        with DeploymentApiStub(config) as stub:
+            for _ in range(2):
+                # a new client per run, like separate invocations of maws sharing the cache on disk
+                cached = AuthenticatedClient(
+                    base_url=f"{stub.base_url}/v1",
+                    token=TOKEN,
+                    auth_header_name="x-api-token",
+                    prefix="",
+                    httpx_args={"transport": CacheTransport(httpx.AsyncHTTPTransport(), HttpCache(tmp_path))},
+                )
+                assert asyncio.run(list_services(cached)) == ["api", "worker"]
+
+        assert stub.requests["GET /v1/services"] == 2
+        assert stub.not_modified == 1
+
+    def test_fleet_throughput(self):
+        with DeploymentApiStub(StubConfig(services=[f"service-{i}" for i in range(10)])) as stub:
+            metric = fleet_throughput(stub, services=10, concurrency=5, poll_delay=0)
+        assert metric.value > 0
+        assert stub.requests["PATCH /services/{name}"] == 10
+
+    def test_fleet_throughput_uses_cli_client(self):
+        with (
+            DeploymentApiStub(StubConfig(services=["api"])) as stub,
+            patch("benchmarks.run.deploy_fleet", AsyncMock(return_value=[])) as mock_deploy_fleet,
+        ):
+            fleet_throughput(stub, services=1, concurrency=1, poll_delay=0)
+
+        client = mock_deploy_fleet.call_args.args[0]
+        assert client._base_url == f"{stub.base_url}/v1"
+        assert isinstance(client._httpx_args["transport"], CacheTransport)
+        assert isinstance(client._httpx_args["transport"].transport, RetryTransport)
+
+
+class TestCompare:
+
+    def test_regression(self):
+        baseline = result(latency=Metric(value=100, unit="ms"))
+        assert compare(baseline, result(latency=Metric(value=120, unit="ms")), threshold=0.1)
+        assert not compare(baseline, result(latency=Metric(value=105, unit="ms")), threshold=0.1)
+
+    def test_higher_is_better(self):
+        baseline = result(throughput=Metric(value=100, unit="deployments/s", lower_is_better=False))
+        assert compare(baseline, result(throughput=Metric(value=80, unit="deployments/s", lower_is_better=False)), 0.1)
+        assert not compare(baseline, result(throughput=Metric(value=150, unit="", lower_is_better=False)), 0.1)
+
+    def test_new_metrics_are_ignored(self):
+        assert not compare(result(), result(latency=Metric(value=100, unit="ms")), threshold=0.1)
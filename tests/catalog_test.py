@@ -0,0 +1,123 @@
+import json
+import time
+from http import HTTPStatus
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from maws.catalog import Catalog, catalog_path, get_catalog, load_catalog, save_catalog
+from maws.clients.ecs_service_deployment_client import AuthenticatedClient
+
+BASE_URL = "http://dummy-host/v1"
+
+
+def make_response(status_code: HTTPStatus, content: bytes = b"") -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    return response
+
+
+@pytest.fixture(scope="function")
+def env():
+    env = Mock()
+    env.api_base_url = "http://dummy-host"
+    env.api_version = "v1"
+    env.catalog_ttl = 300
+    env.api_client = AuthenticatedClient(base_url=BASE_URL, token="dummy-token")
+    return env
+
+
+class TestCatalog:
+
+    def test_is_fresh(self):
+        assert Catalog(base_url=BASE_URL, updated_at=time.time()).is_fresh(300)
+        assert not Catalog(base_url=BASE_URL, updated_at=time.time() - 301).is_fresh(300)
+
+    def test_suggest(self):
+        catalog = Catalog(base_url=BASE_URL, services={"api", "worker"})
+        assert catalog.suggest("wroker", catalog.services) == "worker"
+        assert catalog.suggest("unrelated", catalog.services) is None
+
+
+class TestCatalogCache:
+
+    def test_catalog_path(self, cache_dir):
+        assert catalog_path() == cache_dir / "catalog" / "default.json"
+        assert catalog_path("prod") == cache_dir / "catalog" / "prod.json"
+
+    def test_save_and_load(self):
+        catalog = Catalog(base_url=BASE_URL, services={"api"}, tasks={"migrate"}, updated_at=time.time())
+        save_catalog("prod", catalog)
+
+        assert load_catalog("prod", BASE_URL) == catalog
+        assert load_catalog("other", BASE_URL) is None
+
+    def test_load_other_endpoint(self):
+        save_catalog(None, Catalog(base_url=BASE_URL, services={"api"}))
+        assert load_catalog(None, "http://other-host/v1") is None
+
+    def test_load_reuses_parsed_catalog(self):
+        save_catalog(None, Catalog(base_url=BASE_URL, services={"api"}))
+
+        with patch("maws.catalog.Catalog.model_validate_json", wraps=Catalog.model_validate_json) as mock_validate:
+            first = load_catalog(None, BASE_URL)
+            assert load_catalog(None, BASE_URL) is first
+            mock_validate.assert_called_once()
+
+            save_catalog(None, Catalog(base_url=BASE_URL, services={"api", "worker"}))
+            assert load_catalog(None, BASE_URL).services == {"api", "worker"}
+
+    def test_load_corrupt(self):
+        path = catalog_path()
+        path.parent.mkdir(parents=True)
+        path.write_text("{not json")
+        assert load_catalog(None, BASE_URL) is None
+
+
+class TestGetCatalog:
+
+    @patch("maws.catalog.get_tasks")
+    @patch("maws.catalog.get_services")
+    def test_fetch_and_cache(self, mock_get_services, mock_get_tasks, env):
+        mock_get_services.asyncio_detailed = AsyncMock(
+            return_value=make_response(HTTPStatus.OK, json.dumps(["api", "worker"]).encode())
+        )
+        mock_get_tasks.asyncio_detailed = AsyncMock(
+            return_value=make_response(HTTPStatus.OK, json.dumps({"tasks": [{"name": "migrate"}]}).encode())
+        )
+
+        catalog = get_catalog(env)
+        assert catalog.services == {"api", "worker"}
+        assert catalog.tasks == {"migrate"}
+
+        assert get_catalog(env) == catalog
+        assert mock_get_services.asyncio_detailed.await_count == 1
+
+    @patch("maws.catalog.fetch_catalog", new_callable=AsyncMock)
+    def test_expired_catalog_is_refreshed(self, mock_fetch, env):
+        save_catalog(None, Catalog(base_url=BASE_URL, services={"api"}, updated_at=time.time() - 301))
+        mock_fetch.return_value = Catalog(base_url=BASE_URL, services={"worker"}, updated_at=time.time())
+
+        catalog = get_catalog(env)
+
+        mock_fetch.assert_awaited_once()
+        assert catalog.services == {"worker"}
+        assert load_catalog(None, BASE_URL).services == {"worker"}
+
+    @patch("maws.catalog.fetch_catalog", new_callable=AsyncMock)
+    def test_refresh_ignores_fresh_catalog(self, mock_fetch, env):
+        save_catalog(None, Catalog(base_url=BASE_URL, services={"api"}, updated_at=time.time()))
+        mock_fetch.return_value = Catalog(base_url=BASE_URL, services={"worker"}, updated_at=time.time())
+
+        assert get_catalog(env).services == {"api"}
+        assert get_catalog(env, refresh=True).services == {"worker"}
+        mock_fetch.assert_awaited_once()
+
+    @patch("maws.catalog.get_tasks")
+    @patch("maws.catalog.get_services")
+    def test_listing_denied(self, mock_get_services, mock_get_tasks, env):
+        mock_get_services.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.FORBIDDEN))
+        mock_get_tasks.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.OK, b"[]"))
+
+        assert get_catalog(env) is None
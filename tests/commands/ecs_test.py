@@ -1,11 +1,26 @@
 import json
+import time
 from http import HTTPStatus
-from unittest.mock import Mock, call, patch
+from unittest.mock import ANY, Mock, call, patch
 
+import pytest
 import typer
 from typer.testing import CliRunner
 
-from maws.commands.ecs import app, deploy, status
+from maws.catalog import Catalog
+from maws.commands.ecs import EXIT_FAILED, app, deploy, estimate, status
+from maws.events import EventStream
+from maws.fleet import DeploymentResult, DeploymentState
+from maws.history import duration_stats, log_deployments, pending_since
+from maws.manifest import ServiceDeployment
+from maws.polling import PollingPolicy
+from maws.state import (
+    ReleaseState,
+    ServiceState,
+    load_state,
+    record_deployments,
+    save_state,
+)
 
 runner = CliRunner()
 
@@ -25,8 +40,8 @@ class TestECSCommands:
         assert "Usage:" in result.stdout
 
 
-@patch("maws.commands.ecs.get_settings")
-@patch("maws.commands.ecs.patch_service")
+@patch("maws.config.get_settings")
+@patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
 def test_jowe(mock_patch_service, mock_get_settings, mock_response_failed, fake):
     mock_get_settings.return_value.api_client = Mock()
     mock_patch_service.sync_detailed.return_value = mock_response_failed()
@@ -43,8 +58,8 @@ def test_jowe(mock_patch_service, mock_get_settings, mock_response_failed, fake)
 
 class TestDeployCommand:
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.patch_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
     @patch("maws.commands.ecs.console")
     @patch("maws.commands.ecs.status")
     def test_deploy_success_pending_status(
@@ -61,8 +76,8 @@ class TestDeployCommand:
         mock_patch_service.sync_detailed.assert_called_once()
         mock_console.print.assert_called()
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.patch_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
     @patch("maws.commands.ecs.console")
     def test_deploy_success_non_pending_status(self, mock_console, mock_patch_service, mock_get_settings, fake):
         service_name = fake.word()
@@ -73,11 +88,41 @@ class TestDeployCommand:
         mock_patch_service.sync_detailed.return_value = mock_response
 
         mock_get_settings.return_value.api_client = Mock()
-        deploy(service_name, image)
+        with patch("maws.commands.ecs.status", return_value=True):
+            assert deploy(service_name, image) is True
         mock_patch_service.sync_detailed.assert_called_once()
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.patch_service")
+    @patch("maws.catalog.get_catalog", return_value=None)
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
+    def test_deploy_timeout_exit_code(self, mock_patch_service, mock_get_service, mock_get_settings, mock_get_catalog):
+        mock_get_settings.return_value.polling_policy = PollingPolicy.fixed(1)
+        mock_patch_service.sync_detailed.return_value = Mock(status_code=HTTPStatus.CREATED)
+        mock_get_service.sync_detailed.return_value = Mock(status_code=HTTPStatus.ACCEPTED, headers={})
+
+        result = runner.invoke(app, ["deploy", "api", "api:2", "--timeout", "0"])
+
+        assert result.exit_code == 3
+        assert "still in progress" in result.stdout
+        assert duration_stats(None) == {}
+
+    @patch("maws.catalog.get_catalog", return_value=None)
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
+    def test_deploy_failed_exit_code(self, mock_patch_service, mock_get_service, mock_get_settings, mock_get_catalog):
+        mock_get_settings.return_value.polling_policy = PollingPolicy.fixed(0)
+        mock_patch_service.sync_detailed.return_value = Mock(status_code=HTTPStatus.CREATED)
+        mock_get_service.sync_detailed.return_value = Mock(status_code=HTTPStatus.EXPECTATION_FAILED, headers={})
+
+        result = runner.invoke(app, ["deploy", "api", "api:2"])
+
+        assert result.exit_code == EXIT_FAILED
+        assert "Deployment failed" in result.stdout
+
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
     @patch("maws.commands.ecs.console")
     def test_deploy_failure_status(self, mock_console, mock_patch_service, mock_get_settings, fake):
         service_name = fake.word()
@@ -90,16 +135,17 @@ class TestDeployCommand:
         mock_patch_service.sync_detailed.return_value = mock_response
         mock_get_settings.return_value.api_client = Mock()
 
-        result = deploy(service_name, image)
+        with pytest.raises(typer.Exit) as exit_info:
+            deploy(service_name, image)
         # Check that an error message was printed
         error_calls = [
             call for call in mock_console.print.call_args_list if len(call[0]) > 0 and "[ERROR]" in str(call[0][0])
         ]
         assert len(error_calls) > 0, "Expected an error message to be printed"
-        assert isinstance(result, type(typer.Abort()))
+        assert exit_info.value.exit_code == EXIT_FAILED
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.patch_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
     @patch("maws.commands.ecs.console")
     def test_deploy_exception_handling(self, mock_console, mock_patch_service, mock_get_settings, fake):
         service_name = fake.word()
@@ -107,12 +153,13 @@ class TestDeployCommand:
         mock_patch_service.sync_detailed.side_effect = Exception("Test exception")
         mock_get_settings.return_value.api_client = Mock()
 
-        result = deploy(service_name, image)
-        assert isinstance(result, type(typer.Abort()))
+        with pytest.raises(typer.Exit) as exit_info:
+            deploy(service_name, image)
+        assert exit_info.value.exit_code == EXIT_FAILED
         mock_console.print.assert_called()
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.patch_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
     def test_deploy_with_various_service_names(self, mock_patch_service, mock_get_settings, fake):
         mock_response = Mock()
         mock_response.status_code = HTTPStatus.CREATED
@@ -129,13 +176,13 @@ class TestDeployCommand:
         image = fake.uuid4()
 
         for service_name in service_names:
-            with patch("maws.commands.ecs.console"):
+            with patch("maws.commands.ecs.console"), patch("maws.commands.ecs.status"):
                 deploy(service_name, image)
                 args, kwargs = mock_patch_service.sync_detailed.call_args
                 assert kwargs["body"].image == image
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.patch_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
     @patch("maws.commands.ecs.console")
     def test_deploy_with_profile(self, mock_console, mock_patch_service, mock_get_settings, fake):
         service_name = fake.word()
@@ -154,8 +201,8 @@ class TestDeployCommand:
 
 class TestStatusCommand:
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.get_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
     @patch("maws.commands.ecs.console")
     @patch("time.sleep")
     def test_status_successful_completion(self, mock_sleep, mock_console, mock_get_service, mock_get_settings, fake):
@@ -172,7 +219,7 @@ class TestStatusCommand:
         ]
         mock_get_settings.return_value.api_client = Mock()
 
-        status(service_name, delay)
+        status([service_name], delay)
 
         assert mock_get_service.sync_detailed.call_count == 2
         mock_sleep.assert_called_once_with(5)
@@ -183,8 +230,8 @@ class TestStatusCommand:
         )
         mock_console.print.assert_any_call(f"\nDeployment succeeded with status {HTTPStatus.OK}.", style="green")
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.get_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
     @patch("maws.commands.ecs.console")
     @patch("time.sleep")
     def test_status_with_custom_delay(self, mock_sleep, mock_console, mock_get_service, mock_get_settings, fake):
@@ -196,12 +243,12 @@ class TestStatusCommand:
         mock_get_service.sync_detailed.return_value = mock_response
         mock_get_settings.return_value.api_client = Mock()
 
-        status(service_name, delay=custom_delay)
+        status([service_name], delay=custom_delay)
 
         mock_sleep.assert_not_called()
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.get_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
     @patch("maws.commands.ecs.console")
     @patch("time.sleep")
     def test_status_in_progress_then_failed(self, mock_sleep, mock_console, mock_get_service, mock_get_settings, fake):
@@ -219,16 +266,18 @@ class TestStatusCommand:
         ]
         mock_get_settings.return_value.api_client = Mock()
 
-        status(service_name)
+        with pytest.raises(typer.Exit) as exit_info:
+            status([service_name])
 
+        assert exit_info.value.exit_code == EXIT_FAILED
         assert mock_get_service.sync_detailed.call_count == 2
         mock_console.print.assert_any_call(
             f"\nDeployment failed with status {HTTPStatus.EXPECTATION_FAILED}.",
             style="red",
         )
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.get_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
     @patch("maws.commands.ecs.console")
     def test_status_http_error(self, mock_console, mock_get_service, mock_get_settings, fake):
         service_name = fake.word()
@@ -238,13 +287,14 @@ class TestStatusCommand:
         mock_get_service.sync_detailed.return_value = mock_response
         mock_get_settings.return_value.api_client = Mock()
 
-        result = status(service_name)
+        with pytest.raises(typer.Exit) as exit_info:
+            status([service_name])
 
-        assert isinstance(result, type(typer.Abort()))
+        assert exit_info.value.exit_code == EXIT_FAILED
         mock_console.print.assert_called()
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.get_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
     @patch("maws.commands.ecs.console")
     def test_status_exception_handling(self, mock_console, mock_get_service, mock_get_settings, fake):
         service_name = fake.word()
@@ -252,13 +302,14 @@ class TestStatusCommand:
         mock_get_service.sync_detailed.side_effect = Exception("Test exception")
         mock_get_settings.return_value.api_client = Mock()
 
-        result = status(service_name)
+        with pytest.raises(typer.Exit) as exit_info:
+            status([service_name])
 
-        assert isinstance(result, type(typer.Abort()))
+        assert exit_info.value.exit_code == EXIT_FAILED
         mock_console.print.assert_called()
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.get_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
     @patch("maws.commands.ecs.console")
     @patch("time.sleep")
     def test_status_multiple_pending_cycles(self, mock_sleep, mock_console, mock_get_service, mock_get_settings, fake):
@@ -278,7 +329,7 @@ class TestStatusCommand:
         ]
         mock_get_settings.return_value.api_client = Mock()
 
-        status(service_name)
+        status([service_name])
 
         assert mock_get_service.sync_detailed.call_count == 4
         assert mock_sleep.call_count == 3
@@ -296,8 +347,8 @@ class TestStatusCommand:
 
         for service_name in service_names:
             with (
-                patch("maws.commands.ecs.get_settings") as mock_get_settings,
-                patch("maws.commands.ecs.get_service") as mock_get_service,
+                patch("maws.config.get_settings") as mock_get_settings,
+                patch("maws.clients.ecs_service_deployment_client.api.services.get_service") as mock_get_service,
                 patch("maws.commands.ecs.console"),
             ):
 
@@ -306,15 +357,15 @@ class TestStatusCommand:
                 mock_get_service.sync_detailed.return_value = mock_response
                 mock_get_settings.return_value.api_client = Mock()
 
-                status(service_name)
+                status([service_name])
 
                 mock_get_service.sync_detailed.assert_called_with(
                     service=service_name,
                     client=mock_get_settings.return_value.api_client,
                 )
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.get_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
     @patch("maws.commands.ecs.console")
     def test_status_with_profile(self, mock_console, mock_get_service, mock_get_settings, fake):
         service_name = fake.word()
@@ -325,15 +376,15 @@ class TestStatusCommand:
         mock_get_service.sync_detailed.return_value = mock_response
         mock_get_settings.return_value.api_client = Mock()
 
-        status(service_name, profile=profile)
+        status([service_name], profile=profile)
 
         mock_get_settings.assert_called_with(profile)
 
 
 class TestECSCommandsCLI:
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.patch_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
     @patch("maws.commands.ecs.status")
     @patch("maws.commands.ecs.console")
     def test_deploy_command_cli(self, mock_console, mock_status, mock_patch_service, mock_get_settings, fake):
@@ -351,8 +402,8 @@ class TestECSCommandsCLI:
 
         mock_patch_service.sync_detailed.assert_called_once()
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.get_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
     @patch("maws.commands.ecs.console")
     def test_status_command_cli(self, mock_console, mock_get_service, mock_get_settings, fake):
         runner = CliRunner()
@@ -368,8 +419,8 @@ class TestECSCommandsCLI:
 
         mock_get_service.sync_detailed.assert_called_once()
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.get_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
     @patch("maws.commands.ecs.console")
     def test_status_command_cli_with_delay(self, mock_console, mock_get_service, mock_get_settings, fake):
         runner = CliRunner()
@@ -396,8 +447,8 @@ class TestECSCommandsCLI:
 
         mock_get_service.sync_detailed.assert_called_once()
 
-    @patch("maws.commands.ecs.get_settings")
-    @patch("maws.commands.ecs.patch_service")
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
     @patch("maws.commands.ecs.console")
     def test_deploy_command_cli_with_profile(self, mock_console, mock_patch_service, mock_get_settings, fake):
         runner = CliRunner()
@@ -413,3 +464,946 @@ class TestECSCommandsCLI:
         with patch("maws.commands.ecs.status"):
             runner.invoke(app, ["deploy", service_name, image, "--profile", profile])
             mock_get_settings.assert_called_with(profile)
+
+
+class TestDeployManyCommand:
+
+    @patch("maws.config.get_settings")
+    @patch("maws.fleet.deploy_fleet")
+    def test_deploy_many_success(self, mock_deploy_fleet, mock_get_settings, tmp_path):
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text("services:\n  api: registry/api:1.0.0\n  worker: registry/worker:1.0.0\n")
+        mock_deploy_fleet.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK),
+            DeploymentResult(service="worker", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK),
+        ]
+
+        result = runner.invoke(app, ["deploy-many", str(manifest), "--concurrency", "5"])
+
+        assert result.exit_code == 0
+        assert "api" in result.stdout
+        assert "worker" in result.stdout
+        args, kwargs = mock_deploy_fleet.call_args
+        assert [deployment.name for deployment in args[1]] == ["api", "worker"]
+        assert kwargs["concurrency"] == 5
+
+    @patch("maws.config.get_settings")
+    @patch("maws.fleet.deploy_fleet")
+    def test_deploy_many_failure_exit_code(self, mock_deploy_fleet, mock_get_settings, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"services": {"api": "registry/api:1.0.0"}}))
+        mock_deploy_fleet.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.FAILED, status_code=HTTPStatus.EXPECTATION_FAILED),
+        ]
+
+        result = runner.invoke(app, ["deploy-many", str(manifest)])
+
+        assert result.exit_code == 1
+        assert "failed" in result.stdout
+
+    @patch("maws.config.get_settings")
+    @patch("maws.fleet.deploy_fleet")
+    def test_deploy_many_invalid_manifest(self, mock_deploy_fleet, mock_get_settings, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"services": [{"name": "api"}]}))
+
+        result = runner.invoke(app, ["deploy-many", str(manifest)])
+
+        assert result.exit_code == 1
+        mock_deploy_fleet.assert_not_called()
+
+    def test_deploy_many_missing_manifest(self, tmp_path):
+        result = runner.invoke(app, ["deploy-many", str(tmp_path / "missing.yaml")])
+        assert result.exit_code != 0
+
+
+class TestStatusManyCommand:
+
+    @patch("maws.config.get_settings")
+    @patch("maws.fleet.fleet_status")
+    def test_status_many_services(self, mock_fleet_status, mock_get_settings):
+        mock_fleet_status.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK),
+            DeploymentResult(service="worker", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK),
+        ]
+
+        result = runner.invoke(app, ["status", "api", "worker", "--profile", "dev", "--concurrency", "2"])
+
+        assert result.exit_code == 0
+        args, kwargs = mock_fleet_status.call_args
+        assert args[1] == ["api", "worker"]
+        assert kwargs["concurrency"] == 2
+
+    @patch("maws.config.get_settings")
+    @patch("maws.fleet.fleet_status")
+    def test_status_all_services(self, mock_fleet_status, mock_get_settings):
+        mock_fleet_status.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.PENDING, status_code=HTTPStatus.ACCEPTED),
+        ]
+
+        result = runner.invoke(app, ["status", "--all", "--profile", "dev"])
+
+        assert result.exit_code == 3
+        assert mock_fleet_status.call_args.args[1] is None
+
+    @patch("maws.config.get_settings")
+    @patch("maws.fleet.fleet_status")
+    def test_status_many_failed(self, mock_fleet_status, mock_get_settings):
+        mock_fleet_status.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.PENDING, status_code=HTTPStatus.ACCEPTED),
+            DeploymentResult(service="worker", state=DeploymentState.FAILED, status_code=HTTPStatus.NOT_FOUND),
+        ]
+
+        result = runner.invoke(app, ["status", "api", "worker", "--profile", "dev"])
+
+        assert result.exit_code == 1
+
+    def test_status_without_services(self):
+        result = runner.invoke(app, ["status", "--profile", "dev"])
+        assert result.exit_code == 2
+
+
+class TestStatusPolling:
+
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
+    @patch("time.sleep")
+    def test_status_uses_profile_policy(self, mock_sleep, mock_get_service, mock_get_settings, fake):
+        pending = Mock(status_code=HTTPStatus.ACCEPTED)
+        mock_get_service.sync_detailed.side_effect = [pending, pending, pending, Mock(status_code=HTTPStatus.OK)]
+        mock_get_settings.return_value.polling_policy = PollingPolicy(initial_delay=1, max_delay=3, jitter=0)
+
+        result = runner.invoke(app, ["status", fake.word(), "--profile", "dev"])
+
+        assert result.exit_code == 0
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2, 3]
+
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
+    @patch("time.sleep")
+    def test_status_long_polling(self, mock_sleep, mock_get_service, mock_get_settings, fake):
+        pending = Mock(status_code=HTTPStatus.ACCEPTED, headers={"X-Max-Wait": "30"})
+        mock_get_service.sync_detailed.side_effect = [pending, pending, Mock(status_code=HTTPStatus.OK)]
+        mock_get_settings.return_value.polling_policy = PollingPolicy(max_wait=20)
+
+        result = runner.invoke(app, ["status", "api", "--profile", "dev"])
+
+        assert result.exit_code == 0
+        assert [c.kwargs.get("wait") for c in mock_get_service.sync_detailed.call_args_list] == [None, 20, 20]
+        # the API answered the held checks right away
+        assert mock_sleep.call_count == 1
+
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
+    @patch("time.sleep")
+    def test_status_timeout_exit_code(self, mock_sleep, mock_get_service, mock_get_settings, fake):
+        mock_get_service.sync_detailed.return_value = Mock(status_code=HTTPStatus.ACCEPTED)
+        mock_get_settings.return_value.polling_policy = PollingPolicy()
+
+        result = runner.invoke(app, ["status", fake.word(), "--profile", "dev", "--timeout", "0"])
+
+        assert result.exit_code == 3
+        assert "still in progress" in result.stdout
+        mock_get_service.sync_detailed.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("maws.config.get_settings")
+    @patch("maws.fleet.deploy_fleet")
+    def test_deploy_many_timeout_exit_code(self, mock_deploy_fleet, mock_get_settings, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"services": {"api": "registry/api:1.0.0"}}))
+        mock_get_settings.return_value.polling_policy = PollingPolicy()
+        mock_deploy_fleet.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.PENDING, status_code=HTTPStatus.ACCEPTED),
+        ]
+
+        result = runner.invoke(app, ["deploy-many", str(manifest), "--timeout", "60"])
+
+        assert result.exit_code == 3
+        policy = mock_deploy_fleet.call_args.args[2]
+        assert policy.timeout == 60
+
+
+class TestServiceCatalog:
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
+    def test_deploy_unknown_service(self, mock_patch_service, mock_get_catalog, mock_get_settings):
+        mock_get_catalog.return_value = Catalog(base_url="http://dummy-host/v1", services={"api", "worker"})
+
+        result = runner.invoke(app, ["deploy", "wroker", "registry/worker:1.0.0"])
+
+        assert result.exit_code == 1
+        assert "Unknown service wroker, did you mean worker?" in result.stdout
+        mock_patch_service.sync_detailed.assert_not_called()
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog")
+    @patch("maws.fleet.deploy_fleet")
+    def test_deploy_many_unknown_services(self, mock_deploy_fleet, mock_get_catalog, mock_get_settings, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"services": {"api": "registry/api:1.0.0", "db": "registry/db:1.0.0"}}))
+        mock_get_catalog.return_value = Catalog(base_url="http://dummy-host/v1", services={"api"})
+
+        result = runner.invoke(app, ["deploy-many", str(manifest), "--refresh"])
+
+        assert result.exit_code == 1
+        assert "Unknown service db" in result.stdout
+        assert mock_get_catalog.call_args.kwargs["refresh"] is True
+        mock_deploy_fleet.assert_not_called()
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog")
+    @patch("maws.fleet.deploy_fleet")
+    def test_cached_catalog_refreshed_on_miss(self, mock_deploy_fleet, mock_get_catalog, mock_get_settings, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"services": {"api": "registry/api:1.0.0", "new": "registry/new:1.0.0"}}))
+        mock_get_catalog.side_effect = [
+            Catalog(base_url="http://dummy-host/v1", services={"api"}, updated_at=time.time() - 60),
+            Catalog(base_url="http://dummy-host/v1", services={"api", "new"}, updated_at=time.time()),
+        ]
+        mock_deploy_fleet.return_value = [
+            DeploymentResult(service=name, state=DeploymentState.SUCCEEDED) for name in ("api", "new")
+        ]
+
+        result = runner.invoke(app, ["deploy-many", str(manifest)])
+
+        assert result.exit_code == 0
+        assert [call.kwargs["refresh"] for call in mock_get_catalog.call_args_list] == [False, True]
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog")
+    def test_fetched_catalog_not_refreshed(self, mock_get_catalog, mock_get_settings):
+        mock_get_catalog.side_effect = lambda *args, **kwargs: Catalog(
+            base_url="http://dummy-host/v1", services={"api"}, updated_at=time.time()
+        )
+
+        result = runner.invoke(app, ["status", "new", "--profile", "dev"])
+
+        assert result.exit_code == 1
+        assert "Unknown service new" in result.stdout
+        mock_get_catalog.assert_called_once()
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog")
+    @patch("maws.fleet.fleet_status")
+    def test_status_all_uses_catalog(self, mock_fleet_status, mock_get_catalog, mock_get_settings):
+        mock_get_catalog.return_value = Catalog(base_url="http://dummy-host/v1", services={"worker", "api"})
+        mock_fleet_status.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK),
+            DeploymentResult(service="worker", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK),
+        ]
+
+        result = runner.invoke(app, ["status", "--all", "--profile", "dev"])
+
+        assert result.exit_code == 0
+        assert mock_fleet_status.call_args.args[1] == ["api", "worker"]
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
+    def test_status_without_catalog(self, mock_get_service, mock_get_catalog, mock_get_settings, fake):
+        mock_get_catalog.return_value = None
+        mock_get_service.sync_detailed.return_value = Mock(status_code=HTTPStatus.OK)
+
+        result = runner.invoke(app, ["status", fake.word(), "--profile", "dev"])
+
+        assert result.exit_code == 0
+        mock_get_service.sync_detailed.assert_called_once()
+
+
+class TestTaskCommands:
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog", return_value=None)
+    @patch("maws.clients.ecs_service_deployment_client.api.tasks.patch_task")
+    def test_task_deploy(self, mock_patch_task, mock_get_catalog, mock_get_settings, fake):
+        task_name = fake.word()
+        mock_patch_task.sync_detailed.return_value = Mock(status_code=HTTPStatus.CREATED)
+
+        result = runner.invoke(app, ["task", "deploy", task_name, "registry/task:1.0.0"])
+
+        assert result.exit_code == 0
+        assert task_name in result.stdout
+        kwargs = mock_patch_task.sync_detailed.call_args.kwargs
+        assert kwargs["task"] == task_name
+        assert kwargs["body"].image == "registry/task:1.0.0"
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog", return_value=None)
+    @patch("maws.clients.ecs_service_deployment_client.api.tasks.patch_task")
+    def test_task_deploy_failed(self, mock_patch_task, mock_get_catalog, mock_get_settings, mock_response_failed):
+        mock_patch_task.sync_detailed.return_value = mock_response_failed("Image not found")
+
+        result = runner.invoke(app, ["task", "deploy", "cleanup", "registry/task:1.0.0"])
+
+        assert result.exit_code == 1
+        assert "Image not found" in result.stdout
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog")
+    @patch("maws.clients.ecs_service_deployment_client.api.tasks.patch_task")
+    def test_task_deploy_unknown_task(self, mock_patch_task, mock_get_catalog, mock_get_settings):
+        mock_get_catalog.return_value = Catalog(base_url="http://dummy-host/v1", tasks={"cleanup"})
+
+        result = runner.invoke(app, ["task", "deploy", "cleanpu", "registry/task:1.0.0"])
+
+        assert result.exit_code == 1
+        assert "Unknown task cleanpu, did you mean cleanup?" in result.stdout
+        mock_patch_task.sync_detailed.assert_not_called()
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog", return_value=None)
+    @patch("maws.fleet.deploy_tasks")
+    def test_task_deploy_many(self, mock_deploy_tasks, mock_get_catalog, mock_get_settings, tmp_path):
+        manifest = tmp_path / "manifest.yaml"
+        manifest.write_text("tasks:\n  cleanup: registry/cleanup:1.0.0\n  report: registry/report:1.0.0\n")
+        mock_deploy_tasks.return_value = [
+            DeploymentResult(service="cleanup", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.CREATED),
+            DeploymentResult(service="report", state=DeploymentState.FAILED, status_code=HTTPStatus.NOT_FOUND),
+        ]
+
+        result = runner.invoke(app, ["task", "deploy-many", str(manifest), "--concurrency", "50"])
+
+        assert result.exit_code == 1
+        assert "Task" in result.stdout
+        args, kwargs = mock_deploy_tasks.call_args
+        assert [deployment.name for deployment in args[1]] == ["cleanup", "report"]
+        assert kwargs["concurrency"] == 50
+
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.tasks.get_tasks")
+    def test_task_list(self, mock_get_tasks, mock_get_settings):
+        mock_get_tasks.sync_detailed.return_value = Mock(
+            status_code=HTTPStatus.OK, content=json.dumps(["report", "cleanup"]).encode()
+        )
+
+        result = runner.invoke(app, ["task", "list"])
+
+        assert result.exit_code == 0
+        assert result.stdout.split() == ["cleanup", "report"]
+
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.tasks.get_tasks")
+    def test_task_list_failed(self, mock_get_tasks, mock_get_settings):
+        mock_get_tasks.sync_detailed.return_value = Mock(status_code=HTTPStatus.FORBIDDEN)
+
+        result = runner.invoke(app, ["task", "list"])
+
+        assert result.exit_code == 1
+        assert "403" in result.stdout
+
+
+class TestJsonOutput:
+
+    def events(self, output: str) -> list[dict]:
+        return [json.loads(line) for line in output.splitlines()]
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog", return_value=None)
+    @patch("maws.fleet.deploy_fleet")
+    def test_deploy_json(self, mock_deploy_fleet, mock_get_catalog, mock_get_settings):
+        mock_deploy_fleet.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK),
+        ]
+
+        result = runner.invoke(app, ["deploy", "api", "registry/api:1.0.0", "--force", "--output", "json"])
+
+        assert result.exit_code == 0
+        assert self.events(result.stdout) == [
+            {
+                "event": "summary",
+                "service": None,
+                "elapsed": ANY,
+                "pending": 0,
+                "succeeded": 1,
+                "failed": 0,
+                "skipped": 0,
+            }
+        ]
+        args, kwargs = mock_deploy_fleet.call_args
+        assert args[1][0].name == "api"
+        assert args[1][0].force is True
+        assert isinstance(kwargs["events"], EventStream)
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog", return_value=None)
+    @patch("maws.fleet.fleet_status")
+    def test_status_json_single_service_waits(self, mock_fleet_status, mock_get_catalog, mock_get_settings):
+        mock_fleet_status.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.FAILED, status_code=HTTPStatus.EXPECTATION_FAILED),
+        ]
+
+        result = runner.invoke(app, ["status", "api", "--profile", "dev", "-o", "json"])
+
+        assert result.exit_code == 1
+        assert self.events(result.stdout)[-1]["failed"] == 1
+        assert mock_fleet_status.call_args.kwargs["policy"] is not None
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog", return_value=None)
+    @patch("maws.fleet.fleet_status")
+    def test_status_json_many_services(self, mock_fleet_status, mock_get_catalog, mock_get_settings):
+        mock_fleet_status.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.PENDING, status_code=HTTPStatus.ACCEPTED),
+            DeploymentResult(service="worker", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK),
+        ]
+
+        result = runner.invoke(app, ["status", "api", "worker", "--profile", "dev", "-o", "json"])
+
+        assert result.exit_code == 3
+        assert mock_fleet_status.call_args.kwargs["policy"] is None
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog")
+    def test_unknown_service_json(self, mock_get_catalog, mock_get_settings):
+        mock_get_catalog.return_value = Catalog(base_url="http://dummy-host/v1", services={"api"})
+
+        result = runner.invoke(app, ["deploy", "apj", "registry/api:1.0.0", "-o", "json"])
+
+        assert result.exit_code == 1
+        assert self.events(result.stdout) == [
+            {"event": "error", "service": "apj", "elapsed": 0.0, "message": "Unknown service", "suggestion": "api"}
+        ]
+
+    @patch("maws.config.get_settings")
+    @patch("maws.fleet.deploy_fleet")
+    def test_deploy_many_json_invalid_manifest(self, mock_deploy_fleet, mock_get_settings, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"services": [{"name": "api"}]}))
+
+        result = runner.invoke(app, ["deploy-many", str(manifest), "-o", "json"])
+
+        assert result.exit_code == 1
+        assert self.events(result.stdout)[0]["event"] == "error"
+        mock_deploy_fleet.assert_not_called()
+
+
+class TestRollout:
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog", return_value=None)
+    @patch("maws.rollout.deploy_rollout")
+    def test_rollout(self, mock_deploy_rollout, mock_get_catalog, mock_get_settings, tmp_path):
+        manifest = tmp_path / "rollout.json"
+        manifest.write_text(
+            json.dumps({"services": {"worker": {"image": "w:1", "wave": 1}, "api": {"image": "a:1", "wave": 2}}})
+        )
+        mock_deploy_rollout.return_value = [
+            DeploymentResult(service="worker", state=DeploymentState.FAILED, status_code=HTTPStatus.EXPECTATION_FAILED),
+            DeploymentResult(service="api", state=DeploymentState.SKIPPED),
+        ]
+
+        result = runner.invoke(app, ["rollout", str(manifest)])
+
+        assert result.exit_code == 1
+        assert "Rollout summary" in result.stdout
+        assert "skipped" in result.stdout
+        assert [deployment.name for deployment in mock_deploy_rollout.call_args.args[1]] == ["worker", "api"]
+
+    @patch("maws.config.get_settings")
+    @patch("maws.rollout.deploy_rollout")
+    def test_rollout_cycle(self, mock_deploy_rollout, mock_get_settings, tmp_path):
+        manifest = tmp_path / "rollout.json"
+        manifest.write_text(
+            json.dumps(
+                {"services": {"a": {"image": "a:1", "depends_on": ["b"]}, "b": {"image": "b:1", "depends_on": ["a"]}}}
+            )
+        )
+
+        result = runner.invoke(app, ["rollout", str(manifest)])
+
+        assert result.exit_code == 1
+        assert "Cyclic dependencies" in result.stdout
+        mock_deploy_rollout.assert_not_called()
+
+
+@patch("maws.catalog.get_catalog", return_value=None)
+@patch("maws.config.get_settings")
+class TestPlanApply:
+
+    @pytest.fixture(autouse=True)
+    def manifest(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "services": {
+                        "worker": {"image": "worker:2", "wave": 1},
+                        "api": {"image": "api:1", "wave": 2},
+                        "web": {"image": "web:2", "depends_on": ["api"]},
+                    }
+                }
+            )
+        )
+        return path
+
+    def settings(self, mock_get_settings):
+        mock_get_settings.return_value.api_base_url = "http://dummy-host"
+        mock_get_settings.return_value.api_version = "v1"
+        save_state(
+            "dev",
+            ReleaseState(
+                base_url="http://dummy-host/v1",
+                services={
+                    "worker": ServiceState(image="worker:1"),
+                    "api": ServiceState(image="api:1"),
+                    "web": ServiceState(image="web:1"),
+                },
+            ),
+        )
+
+    def test_plan(self, mock_get_settings, mock_get_catalog, manifest):
+        self.settings(mock_get_settings)
+
+        result = runner.invoke(app, ["plan", str(manifest), "--profile", "dev"])
+
+        assert result.exit_code == 0
+        assert "worker:1 -> worker:2" in result.stdout
+        assert "2 to deploy, 1 unchanged" in result.stdout
+
+    def test_plan_json(self, mock_get_settings, mock_get_catalog, manifest):
+        self.settings(mock_get_settings)
+
+        result = runner.invoke(app, ["plan", str(manifest), "--profile", "dev", "-o", "json"])
+
+        events = [json.loads(line) for line in result.stdout.splitlines()]
+        assert [(event["service"], event["action"]) for event in events] == [
+            ("worker", "update"),
+            ("api", "unchanged"),
+            ("web", "update"),
+        ]
+
+    @patch("maws.rollout.deploy_rollout")
+    def test_apply_deploys_changes(self, mock_deploy_rollout, mock_get_settings, mock_get_catalog, manifest):
+        self.settings(mock_get_settings)
+        mock_deploy_rollout.return_value = [
+            DeploymentResult(service="worker", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK),
+            DeploymentResult(service="web", state=DeploymentState.FAILED, status_code=HTTPStatus.EXPECTATION_FAILED),
+        ]
+
+        result = runner.invoke(app, ["apply", str(manifest), "--profile", "dev"])
+
+        assert result.exit_code == 1
+        deployments = mock_deploy_rollout.call_args.args[1]
+        # the unchanged api counts as deployed
+        assert [(deployment.name, deployment.depends_on) for deployment in deployments] == [
+            ("worker", []),
+            ("web", []),
+        ]
+        services = load_state("dev", "http://dummy-host/v1").services
+        assert services["worker"].image == "worker:2"
+        assert services["web"].image == "web:1"
+
+    @patch("maws.fleet.deploy_fleet")
+    @patch("maws.rollout.deploy_rollout")
+    def test_apply_without_changes(
+        self, mock_deploy_rollout, mock_deploy_fleet, mock_get_settings, mock_get_catalog, manifest
+    ):
+        self.settings(mock_get_settings)
+        for name, image in (("worker", "worker:2"), ("web", "web:2")):
+            record_deployments(
+                "dev",
+                "http://dummy-host/v1",
+                [ServiceDeployment(name=name, image=image)],
+                [DeploymentResult(service=name, state=DeploymentState.SUCCEEDED)],
+            )
+
+        result = runner.invoke(app, ["apply", str(manifest), "--profile", "dev"])
+
+        assert result.exit_code == 0
+        assert "No changes to deploy" in result.stdout
+        mock_deploy_rollout.assert_not_called()
+        mock_deploy_fleet.assert_not_called()
+
+    @patch("maws.fleet.deploy_fleet")
+    def test_deploy_many_records_state(self, mock_deploy_fleet, mock_get_settings, mock_get_catalog, tmp_path):
+        self.settings(mock_get_settings)
+        manifest = tmp_path / "services.json"
+        manifest.write_text(json.dumps({"services": {"api": "api:3"}}))
+        mock_deploy_fleet.return_value = [
+            DeploymentResult(service="api", state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK)
+        ]
+
+        result = runner.invoke(app, ["deploy-many", str(manifest), "--profile", "dev"])
+
+        assert result.exit_code == 0
+        assert load_state("dev", "http://dummy-host/v1").services["api"].image == "api:3"
+
+
+@patch("maws.catalog.get_catalog", return_value=None)
+@patch("maws.config.get_settings")
+class TestResume:
+
+    @pytest.fixture(autouse=True)
+    def manifest(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps({"services": {"api": "api:2", "worker": "worker:2", "web": "web:2"}}))
+        return path
+
+    def interrupted(self, client, deployments, policy, concurrency, events, reattach):
+        """
+        Deploys api, leaves worker in progress and fails web
+        """
+        events.emit("started", "api")
+        events.transition("api", DeploymentState.SUCCEEDED, HTTPStatus.OK)
+        events.emit("started", "worker")
+        events.poll("worker", HTTPStatus.ACCEPTED, DeploymentState.PENDING)
+        events.transition("web", DeploymentState.FAILED, HTTPStatus.EXPECTATION_FAILED)
+        return [
+            DeploymentResult(service="api", state=DeploymentState.SUCCEEDED, started_at=1000, finished_at=1042),
+            DeploymentResult(service="worker", state=DeploymentState.PENDING, started_at=1000),
+            DeploymentResult(service="web", state=DeploymentState.FAILED, status_code=HTTPStatus.EXPECTATION_FAILED),
+        ]
+
+    def resumed(self, client, deployments, policy, concurrency, events, reattach):
+        return [
+            DeploymentResult(service=deployment.name, state=DeploymentState.SUCCEEDED) for deployment in deployments
+        ]
+
+    @patch("maws.fleet.deploy_fleet")
+    def test_resume_deploys_outstanding_services(
+        self, mock_deploy_fleet, mock_get_settings, mock_get_catalog, manifest
+    ):
+        mock_deploy_fleet.side_effect = self.interrupted
+        result = runner.invoke(app, ["deploy-many", str(manifest), "--profile", "dev"])
+        assert result.exit_code == 1
+        assert "--resume" in result.stdout
+
+        mock_deploy_fleet.side_effect = self.resumed
+        result = runner.invoke(app, ["deploy-many", str(manifest), "--profile", "dev", "--resume"])
+
+        assert result.exit_code == 0
+        assert "1 services succeeded before, 1 in progress, 1 to deploy" in result.stdout
+        args, kwargs = mock_deploy_fleet.call_args
+        assert [deployment.name for deployment in args[1]] == ["worker", "web"]
+        assert kwargs["reattach"] == {"worker": ANY}
+        assert "Succeeded before resuming" in result.stdout
+        # api has been recorded by the interrupted run
+        assert duration_stats("dev")["api"].deployments == 1
+
+    @patch("maws.fleet.deploy_fleet")
+    def test_without_resume_everything_is_deployed(
+        self, mock_deploy_fleet, mock_get_settings, mock_get_catalog, manifest
+    ):
+        mock_deploy_fleet.side_effect = self.interrupted
+        runner.invoke(app, ["deploy-many", str(manifest), "--profile", "dev"])
+
+        mock_deploy_fleet.side_effect = self.resumed
+        result = runner.invoke(app, ["deploy-many", str(manifest), "--profile", "dev"])
+
+        assert result.exit_code == 0
+        assert [deployment.name for deployment in mock_deploy_fleet.call_args.args[1]] == ["api", "worker", "web"]
+        assert mock_deploy_fleet.call_args.kwargs["reattach"] == {}
+
+    @patch("maws.rollout.deploy_rollout")
+    def test_resume_rollout_json(self, mock_deploy_rollout, mock_get_settings, mock_get_catalog, tmp_path):
+        manifest = tmp_path / "rollout.json"
+        manifest.write_text(
+            json.dumps(
+                {"services": {"worker": {"image": "w:1", "wave": 1}, "api": {"image": "a:1", "depends_on": ["worker"]}}}
+            )
+        )
+
+        def interrupted(client, deployments, policy, concurrency, events, reattach):
+            events.emit("started", "worker")
+            events.transition("worker", DeploymentState.SUCCEEDED, HTTPStatus.OK)
+            events.transition("api", DeploymentState.FAILED, HTTPStatus.EXPECTATION_FAILED)
+            return [
+                DeploymentResult(service="worker", state=DeploymentState.SUCCEEDED),
+                DeploymentResult(service="api", state=DeploymentState.FAILED),
+            ]
+
+        mock_deploy_rollout.side_effect = interrupted
+        runner.invoke(app, ["rollout", str(manifest)])
+        mock_deploy_rollout.side_effect = self.resumed
+
+        result = runner.invoke(app, ["rollout", str(manifest), "--resume", "-o", "json"])
+
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert {"succeeded": 1, "reattached": 0, "outstanding": 1}.items() <= records[0].items()
+        assert records[0]["event"] == "resume"
+        (api,) = mock_deploy_rollout.call_args.args[1]
+        assert api.name == "api" and api.depends_on == []
+        assert records[-1]["succeeded"] == 2
+
+    def test_resume_requires_single_profile(self, mock_get_settings, mock_get_catalog, manifest):
+        result = runner.invoke(app, ["deploy-many", str(manifest), "--profile", "prod-*", "--resume"])
+
+        assert result.exit_code == 1
+        assert "--resume" in result.stdout
+
+
+@patch("maws.catalog.get_catalog", return_value=None)
+@patch("maws.config.get_settings")
+class TestHistory:
+
+    def deployed(self, service: str, *durations: float, profile: str = "dev") -> None:
+        log_deployments(
+            profile,
+            [ServiceDeployment(name=service, image=f"{service}:1")] * len(durations),
+            [
+                DeploymentResult(
+                    service=service, state=DeploymentState.SUCCEEDED, started_at=1000, finished_at=1000 + duration
+                )
+                for duration in durations
+            ],
+        )
+
+    @patch("maws.fleet.deploy_fleet")
+    def test_deploy_many_records_history(self, mock_deploy_fleet, mock_get_settings, mock_get_catalog, tmp_path):
+        manifest = tmp_path / "services.json"
+        manifest.write_text(json.dumps({"services": {"api": "api:3", "worker": "worker:3"}}))
+        started_at = time.time()
+        mock_deploy_fleet.return_value = [
+            DeploymentResult(
+                service="api", state=DeploymentState.SUCCEEDED, started_at=started_at, finished_at=started_at + 42
+            ),
+            DeploymentResult(service="worker", state=DeploymentState.PENDING, started_at=started_at),
+        ]
+
+        result = runner.invoke(app, ["deploy-many", str(manifest), "--profile", "dev"])
+
+        assert result.exit_code == 3
+        assert duration_stats("dev")["api"].p50 == 42
+        assert pending_since("dev", "worker") == started_at
+
+    @patch("maws.clients.ecs_service_deployment_client.api.services.get_service")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
+    @patch("time.sleep")
+    def test_deploy_shows_eta_and_records_duration(
+        self, mock_sleep, mock_patch_service, mock_get_service, mock_get_settings, mock_get_catalog
+    ):
+        self.deployed("api", 30, 90, 60)
+        mock_patch_service.sync_detailed.return_value = Mock(status_code=HTTPStatus.CREATED)
+        mock_get_service.sync_detailed.side_effect = [
+            Mock(status_code=HTTPStatus.ACCEPTED),
+            Mock(status_code=HTTPStatus.OK),
+        ]
+
+        result = runner.invoke(app, ["deploy", "api", "api:2", "--profile", "dev"])
+
+        assert result.exit_code == 0
+        assert "usually take 1m 00s, usually done around" in result.stdout
+        stats = duration_stats("dev")["api"]
+        assert stats.deployments == 4
+        assert pending_since("dev", "api") is None
+
+    def test_history(self, mock_get_settings, mock_get_catalog):
+        self.deployed("api", 30, 90, 60)
+        self.deployed("worker", 10, 500)
+
+        result = runner.invoke(app, ["history", "--profile", "dev"])
+
+        assert result.exit_code == 0
+        assert "Deployment durations" in result.stdout
+        assert "1m 00s" in result.stdout and "1m 30s" in result.stdout
+        assert "8m 20s" in result.stdout
+        mock_get_settings.assert_not_called()
+
+    def test_history_json(self, mock_get_settings, mock_get_catalog):
+        self.deployed("api", 30, 90, 60)
+        self.deployed("worker", 10)
+
+        result = runner.invoke(app, ["history", "api", "--profile", "dev", "-o", "json"])
+
+        assert result.exit_code == 0
+        events = [json.loads(line) for line in result.stdout.splitlines()]
+        assert len(events) == 1
+        assert events[0] | {"elapsed": 0} == {
+            "event": "history",
+            "service": "api",
+            "elapsed": 0,
+            "deployments": 3,
+            "failed": 0,
+            "p50": 60,
+            "p95": 90,
+            "last": 60,
+        }
+
+    def test_history_empty(self, mock_get_settings, mock_get_catalog):
+        result = runner.invoke(app, ["history"])
+
+        assert result.exit_code == 0
+        assert "No deployments recorded yet" in result.stdout
+
+    @patch("maws.commands.ecs.time.time", return_value=5000)
+    def test_estimate_follows_longest_chain(self, mock_time, mock_get_settings, mock_get_catalog):
+        self.deployed("db", 100)
+        self.deployed("api", 50)
+        self.deployed("web", 20)
+
+        assert estimate("dev", ["db", "api", "web"]) == 5100
+        assert estimate("dev", ["db", "api", "web"], graph={"db": set(), "api": {"db"}, "web": {"api"}}) == 5170
+        assert estimate("dev", ["unknown"]) is None
+
+    def test_estimate_events(self, mock_get_settings, mock_get_catalog):
+        self.deployed("api", 30)
+        stream = Mock()
+
+        estimate("dev", ["api", "worker"], EventStream(stream))
+
+        event = json.loads(stream.write.call_args.args[0])
+        assert event["event"] == "estimate"
+        assert event["service"] == "api"
+        assert event["p50"] == 30
+
+
+@patch("maws.config.get_settings")
+@patch("maws.catalog.get_catalog", return_value=Catalog(base_url="http://dummy-host/v1", services={"api", "worker"}))
+class TestWatch:
+
+    def results(self, *states: DeploymentState) -> dict:
+        return {
+            service: DeploymentResult(service=service, state=state) for service, state in zip(("api", "worker"), states)
+        }
+
+    @patch("maws.watch.FleetWatcher")
+    def test_watch_all_services_until_settled(self, mock_watcher, mock_get_catalog, mock_get_settings):
+        async def watch(on_change, until_settled):
+            on_change(list(self.results(DeploymentState.SUCCEEDED, DeploymentState.FAILED).values()))
+            return self.results(DeploymentState.SUCCEEDED, DeploymentState.FAILED)
+
+        mock_watcher.return_value.watch.side_effect = watch
+        mock_watcher.return_value.checks = 2
+
+        result = runner.invoke(app, ["watch", "--profile", "dev", "--until-settled", "--settled-delay", "10"])
+
+        assert result.exit_code == 1
+        assert "2 services: 0 pending, 1 failed, 1 succeeded" in result.stdout
+        args, kwargs = mock_watcher.call_args
+        assert args[1] == ["api", "worker"]
+        assert kwargs["settled_delay"] == 10
+        assert kwargs["settled_max_delay"] == 100
+
+    @patch("maws.watch.FleetWatcher")
+    def test_watch_json(self, mock_watcher, mock_get_catalog, mock_get_settings):
+        async def watch(on_change, until_settled):
+            return self.results(DeploymentState.SUCCEEDED)
+
+        mock_watcher.return_value.watch.side_effect = watch
+
+        result = runner.invoke(app, ["watch", "api", "--profile", "dev", "--until-settled", "-o", "json"])
+
+        assert result.exit_code == 0
+        assert json.loads(result.stdout.splitlines()[-1])["event"] == "summary"
+        assert mock_watcher.call_args.args[1] == ["api"]
+        assert mock_watcher.call_args.kwargs["events"] is not None
+
+    @patch("maws.watch.FleetWatcher")
+    def test_watch_interrupted(self, mock_watcher, mock_get_catalog, mock_get_settings):
+        mock_watcher.return_value.watch.side_effect = KeyboardInterrupt
+
+        result = runner.invoke(app, ["watch", "--profile", "dev"])
+
+        assert result.exit_code == 0
+
+    def test_watch_unknown_service(self, mock_get_catalog, mock_get_settings):
+        result = runner.invoke(app, ["watch", "apj", "--profile", "dev"])
+
+        assert result.exit_code == 1
+        assert "did you mean" in result.stdout
+
+
+class TestValidation:
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog")
+    @patch("maws.fleet.deploy_fleet")
+    def test_deploy_many_reports_all_errors(self, mock_deploy_fleet, mock_get_catalog, mock_get_settings, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(
+            json.dumps(
+                {
+                    "services": {
+                        "api": "",
+                        "worker": {"image": "worker:1", "secret_arns": ["my-secret"]},
+                        "web": "web:1",
+                    }
+                }
+            )
+        )
+
+        result = runner.invoke(app, ["deploy-many", str(manifest)])
+
+        assert result.exit_code == 1
+        assert "nothing has been deployed" in result.stdout
+        assert "api: image must not be empty" in result.stdout
+        assert "worker: secret_arns[0] 'my-secret' does not match" in result.stdout
+        mock_get_catalog.assert_not_called()
+        mock_deploy_fleet.assert_not_called()
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog")
+    @patch("maws.clients.ecs_service_deployment_client.api.services.patch_service")
+    def test_deploy_invalid_secret_json(self, mock_patch_service, mock_get_catalog, mock_get_settings):
+        result = runner.invoke(app, ["deploy", "api", "api:1", "--secret-arns", "my-secret", "-o", "json"])
+
+        assert result.exit_code == 1
+        event = json.loads(result.stdout)
+        assert event["event"] == "error"
+        assert event["service"] == "api"
+        assert event["message"].startswith("secret_arns[0] 'my-secret' does not match")
+        mock_patch_service.sync_detailed.assert_not_called()
+
+    @patch("maws.config.get_settings")
+    @patch("maws.clients.ecs_service_deployment_client.api.tasks.patch_task")
+    def test_task_deploy_empty_image(self, mock_patch_task, mock_get_settings):
+        result = runner.invoke(app, ["task", "deploy", "migrate", ""])
+
+        assert result.exit_code == 1
+        assert "migrate: image must not be empty" in result.stdout
+        mock_patch_task.sync_detailed.assert_not_called()
+
+
+@patch("maws.catalog.get_catalog", return_value=None)
+@patch("maws.config.get_settings")
+@patch("maws.config.match_profiles", return_value=["prod-a", "prod-b"])
+class TestProfileFanOut:
+
+    def results(self, *states: DeploymentState) -> dict:
+        return {
+            profile: [DeploymentResult(service="api", state=state, status_code=HTTPStatus.OK)]
+            for profile, state in zip(("prod-a", "prod-b"), states)
+        }
+
+    @patch("maws.fleet.deploy_profiles")
+    def test_deploy_matrix(self, mock_deploy_profiles, mock_match_profiles, mock_get_settings, mock_get_catalog):
+        mock_deploy_profiles.return_value = self.results(DeploymentState.SUCCEEDED, DeploymentState.PENDING)
+
+        result = runner.invoke(app, ["deploy", "api", "api:1", "--profile", "prod-*"])
+
+        assert result.exit_code == 3
+        assert "prod-a" in result.stdout and "prod-b" in result.stdout
+        assert "succeeded (200)" in result.stdout
+        mock_match_profiles.assert_called_once_with("prod-*")
+        assert [call.args[0] for call in mock_get_settings.call_args_list] == ["prod-a", "prod-b"]
+        targets = mock_deploy_profiles.call_args.args[0]
+        assert list(targets) == ["prod-a", "prod-b"]
+
+    @patch("maws.fleet.deploy_profiles")
+    def test_deploy_many_json(
+        self, mock_deploy_profiles, mock_match_profiles, mock_get_settings, mock_get_catalog, tmp_path
+    ):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps({"services": {"api": "api:1"}}))
+        mock_deploy_profiles.return_value = self.results(DeploymentState.SUCCEEDED, DeploymentState.FAILED)
+
+        result = runner.invoke(app, ["deploy-many", str(manifest), "--profile", "prod-a,prod-b", "-o", "json"])
+
+        assert result.exit_code == 1
+        summary = json.loads(result.stdout.splitlines()[-1])
+        assert summary["failed"] == 1
+        assert summary["profiles"]["prod-a"]["succeeded"] == 1
+        assert set(mock_deploy_profiles.call_args.kwargs["events"]) == {"prod-a", "prod-b"}
+
+    def test_no_matching_profile(self, mock_match_profiles, mock_get_settings, mock_get_catalog):
+        mock_match_profiles.side_effect = ValueError("No profile matches 'test-*'")
+
+        result = runner.invoke(app, ["deploy", "api", "api:1", "--profile", "test-*"])
+
+        assert result.exit_code == 1
+        assert "No profile matches" in result.stdout
+        mock_get_settings.assert_not_called()
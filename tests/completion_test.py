@@ -0,0 +1,94 @@
+import json
+import os
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from maws.completion import (
+    catalog_path,
+    complete_services,
+    complete_tasks,
+    read_catalog,
+    refresh_in_background,
+)
+
+
+def write_catalog(profile: str | None, **data) -> None:
+    path = catalog_path(profile)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+@pytest.fixture(scope="function")
+def ctx():
+    ctx = Mock()
+    ctx.params = {"profile": "dev"}
+    return ctx
+
+
+class TestReadCatalog:
+
+    def test_missing(self):
+        assert read_catalog("dev") == {}
+
+    def test_corrupt(self):
+        path = catalog_path("dev")
+        path.parent.mkdir(parents=True)
+        path.write_text("[1, 2")
+        assert read_catalog("dev") == {}
+
+
+class TestComplete:
+
+    @patch("maws.completion.refresh_in_background")
+    def test_complete_services(self, mock_refresh, ctx):
+        write_catalog("dev", services=["db", "api-worker", "api"], updated_at=time.time())
+
+        assert complete_services(ctx, "ap") == ["api", "api-worker"]
+        assert complete_services(ctx, "") == ["api", "api-worker", "db"]
+        mock_refresh.assert_not_called()
+
+    @patch("maws.completion.refresh_in_background")
+    def test_complete_tasks(self, mock_refresh, ctx):
+        write_catalog("dev", tasks=["migrate", "seed"], updated_at=time.time())
+        assert complete_tasks(ctx, "m") == ["migrate"]
+
+    @patch("maws.completion.refresh_in_background")
+    def test_default_profile(self, mock_refresh, ctx):
+        ctx.params = {}
+        write_catalog(None, services=["api"], updated_at=time.time())
+        assert complete_services(ctx, "") == ["api"]
+
+    @patch("maws.completion.refresh_in_background")
+    def test_stale_catalog_is_refreshed(self, mock_refresh, ctx):
+        write_catalog("dev", services=["api"], updated_at=time.time() - 61, ttl=60)
+
+        assert complete_services(ctx, "") == ["api"]
+        mock_refresh.assert_called_once_with("dev")
+
+    @patch("maws.completion.refresh_in_background")
+    def test_missing_catalog_is_refreshed(self, mock_refresh, ctx):
+        assert complete_services(ctx, "") == []
+        mock_refresh.assert_called_once_with("dev")
+
+
+class TestRefreshInBackground:
+
+    @patch("maws.completion.os.fork", return_value=1234)
+    def test_refresh_forks_once(self, mock_fork):
+        refresh_in_background("dev")
+        refresh_in_background("dev")
+
+        mock_fork.assert_called_once()
+        assert catalog_path("dev").with_suffix(".refresh").exists()
+
+    @patch("maws.completion.os.fork", return_value=1234)
+    def test_refresh_after_interval(self, mock_fork):
+        refresh_in_background("dev")
+        marker = catalog_path("dev").with_suffix(".refresh")
+        os.utime(marker, (time.time() - 61, time.time() - 61))
+
+        refresh_in_background("dev")
+
+        assert mock_fork.call_count == 2
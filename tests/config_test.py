@@ -1,17 +1,26 @@
+import asyncio
 import os
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
+import httpx
 import pytest
 
 from maws.config import (
     CONFIG_FILE_PATH,
     DotEnvSettings,
     Settings,
+    async_session,
+    close_api_clients,
     get_settings,
+    is_profile_pattern,
     load_profile,
+    match_profiles,
+    registry,
 )
+from maws.httpcache import CacheTransport
+from maws.retry import RetryPolicy, RetryTransport
 
 
 class TestDotEnvSettings:
@@ -75,8 +84,14 @@ class TestSettings:
                 token=mock_env_vars["API_ACCESS_TOKEN"],
                 auth_header_name="x-api-token",
                 prefix="",
+                timeout=httpx.Timeout(30),
+                httpx_args={"transport": ANY},
             )
             assert client == mock_client_instance
+            transport = mock_client_class.call_args.kwargs["httpx_args"]["transport"]
+            assert isinstance(transport, CacheTransport)
+            assert isinstance(transport.transport, RetryTransport)
+            assert transport.transport.policy == RetryPolicy()
 
     @patch("maws.config.AuthenticatedClient")
     def test_api_client_with_default_version(self, mock_client_class, fake):
@@ -98,6 +113,8 @@ class TestSettings:
                 token=mock_vars["API_ACCESS_TOKEN"],
                 auth_header_name="x-api-token",
                 prefix="",
+                timeout=ANY,
+                httpx_args=ANY,
             )
 
     def test_settings_with_fake_data(self, fake):
@@ -135,6 +152,152 @@ API_VERSION = "v2"
         os.unlink(f.name)
 
 
+class TestApiClientPool:
+
+    def test_api_client_is_reused(self, mock_env_vars):
+        with patch.dict(os.environ, mock_env_vars):
+            assert Settings().api_client is Settings().api_client
+
+    def test_api_client_per_base_url(self, fake, mock_env_vars):
+        with patch.dict(os.environ, mock_env_vars):
+            client = Settings().api_client
+        with patch.dict(os.environ, {**mock_env_vars, "API_BASE_URL": fake.url()}):
+            assert Settings().api_client is not client
+
+    def test_api_client_pool_settings(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+            f.write(
+                """
+[profiles.test]
+API_BASE_URL = "https://pool-api.example.com"
+API_ACCESS_TOKEN = "test-token"
+HTTP_TIMEOUT = 5
+HTTP_MAX_CONNECTIONS = 7
+"""
+            )
+            f.flush()
+
+            with patch("maws.config.CONFIG_FILE_PATH", Path(f.name)):
+                httpx_client = Settings(profile="test").api_client.get_httpx_client()
+                assert httpx_client.timeout == httpx.Timeout(5)
+                assert httpx_client.headers["x-api-token"] == "test-token"
+
+        os.unlink(f.name)
+
+    def test_api_client_per_transport_settings(self, tmp_path):
+        path = tmp_path / "profile.toml"
+        path.write_text(
+            """
+[profiles.a]
+API_BASE_URL = "https://pool-api.example.com"
+API_ACCESS_TOKEN = "test-token"
+
+[profiles.b]
+API_BASE_URL = "https://pool-api.example.com"
+API_ACCESS_TOKEN = "test-token"
+HTTP_TIMEOUT = 5
+RETRY_ATTEMPTS = 1
+
+[profiles.c]
+API_BASE_URL = "https://pool-api.example.com"
+API_ACCESS_TOKEN = "test-token"
+"""
+        )
+
+        with patch("maws.config.CONFIG_FILE_PATH", path):
+            clients = [get_settings(profile).api_client for profile in ("a", "b", "c")]
+
+        assert clients[0] is clients[2]
+        assert clients[1] is not clients[0]
+        assert clients[1].get_httpx_client().timeout == httpx.Timeout(5)
+        assert clients[1].get_httpx_client()._transport.transport.policy.attempts == 1
+        assert clients[0].get_httpx_client()._transport.transport.policy.attempts == 3
+
+    def test_close_api_clients(self, mock_env_vars):
+        with patch.dict(os.environ, mock_env_vars):
+            client = Settings().api_client
+            httpx_client = client.get_httpx_client()
+            close_api_clients()
+            assert httpx_client.is_closed
+            assert Settings().api_client is not client
+
+    def test_async_session_resets_pool(self, mock_env_vars):
+        with patch.dict(os.environ, mock_env_vars):
+            client = Settings().api_client
+
+        async def session():
+            async with async_session(client):
+                return client.get_async_httpx_client()
+
+        async_client = asyncio.run(session())
+        assert async_client.is_closed
+        assert client.get_async_httpx_client() is not async_client
+
+
+class TestPollingPolicySettings:
+
+    def test_polling_policy_defaults(self, mock_env_vars):
+        with patch.dict(os.environ, mock_env_vars):
+            policy = Settings().polling_policy
+            assert policy.initial_delay == 1
+            assert policy.timeout is None
+            assert policy.max_wait == 20
+
+    def test_long_poll_wait_bounded_by_http_timeout(self, mock_env_vars):
+        with patch.dict(os.environ, mock_env_vars | {"POLL_WAIT": "60", "HTTP_TIMEOUT": "30"}):
+            assert Settings().polling_policy.max_wait == 25
+        with patch.dict(os.environ, mock_env_vars | {"POLL_WAIT": "0"}):
+            assert Settings().polling_policy.max_wait == 0
+
+    def test_polling_policy_from_profile(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+            f.write(
+                """
+[profiles.test]
+API_BASE_URL = "https://test-api.example.com"
+API_ACCESS_TOKEN = "test-token"
+POLL_INITIAL_DELAY = 0.5
+POLL_MAX_DELAY = 20
+POLL_TIMEOUT = 900
+"""
+            )
+            f.flush()
+
+            with patch("maws.config.CONFIG_FILE_PATH", Path(f.name)):
+                policy = Settings(profile="test").polling_policy
+                assert policy.initial_delay == 0.5
+                assert policy.max_delay == 20
+                assert policy.timeout == 900
+
+        os.unlink(f.name)
+
+
+class TestRetrySettings:
+
+    def test_retry_settings_from_profile(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".toml", delete=False) as f:
+            f.write(
+                """
+[profiles.test]
+API_BASE_URL = "https://retry-api.example.com"
+API_ACCESS_TOKEN = "test-token"
+RETRY_ATTEMPTS = 5
+RETRY_MAX_DELAY = 10
+CIRCUIT_FAILURE_THRESHOLD = 2
+"""
+            )
+            f.flush()
+
+            with patch("maws.config.CONFIG_FILE_PATH", Path(f.name)):
+                settings = Settings(profile="test")
+                assert settings.retry_policy == RetryPolicy(attempts=5, max_delay=10)
+                transport = settings.api_client.get_httpx_client()._transport.transport
+                assert transport.breaker.failure_threshold == 2
+                assert transport.breaker.reset_timeout == 30
+
+        os.unlink(f.name)
+
+
 class TestProfileLoading:
     def test_load_profile_empty_name(self):
         result = load_profile(None)
@@ -238,6 +401,187 @@ API_VERSION = "v2"
         os.unlink(f.name)
 
 
+class TestRateLimitSettings:
+
+    def test_rate_limiter_shared_per_base_url(self, tmp_path):
+        path = tmp_path / "profile.toml"
+        path.write_text(
+            """
+[profiles.a]
+API_BASE_URL = "https://limited-api.example.com"
+API_ACCESS_TOKEN = "token-a"
+RATE_LIMIT = 5
+RATE_LIMIT_BURST = 10
+
+[profiles.b]
+API_BASE_URL = "https://limited-api.example.com"
+API_ACCESS_TOKEN = "token-b"
+RATE_LIMIT = 5
+RATE_LIMIT_BURST = 10
+
+[profiles.c]
+API_BASE_URL = "https://limited-api.example.com"
+API_ACCESS_TOKEN = "token-a"
+"""
+        )
+
+        with patch("maws.config.CONFIG_FILE_PATH", path):
+            limiters = [
+                get_settings(profile).api_client.get_httpx_client()._transport.transport._transport_factory().limiter
+                for profile in ("c", "a", "b")
+            ]
+
+        assert limiters[1] is limiters[2]
+        assert limiters[1].rate == 5
+        assert limiters[1].capacity == 10
+        assert limiters[0].rate is None
+
+    def test_unbounded_by_default(self, mock_env_vars):
+        with patch.dict(os.environ, mock_env_vars):
+            transport = Settings().api_client.get_httpx_client()._transport.transport
+            assert transport._transport_factory().limiter.rate is None
+
+
+class TestHttpCacheSettings:
+
+    def test_cache_per_base_url_and_token(self, tmp_path, cache_dir):
+        path = tmp_path / "profile.toml"
+        path.write_text(
+            """
+[profiles.a]
+API_BASE_URL = "https://cached-api.example.com"
+API_ACCESS_TOKEN = "token-a"
+
+[profiles.b]
+API_BASE_URL = "https://cached-api.example.com"
+API_ACCESS_TOKEN = "token-b"
+"""
+        )
+
+        with patch("maws.config.CONFIG_FILE_PATH", path):
+            transports = [get_settings(profile).api_client.get_httpx_client()._transport for profile in ("a", "b")]
+
+        assert all(isinstance(transport, CacheTransport) for transport in transports)
+        assert transports[0].cache.path.parent == cache_dir / "http"
+        assert transports[0].cache.path != transports[1].cache.path
+
+    def test_cache_disabled(self, mock_env_vars):
+        with patch.dict(os.environ, {**mock_env_vars, "HTTP_CACHE": "false"}):
+            assert isinstance(Settings().api_client.get_httpx_client()._transport, RetryTransport)
+
+
+PROFILE = """
+[profiles.test]
+API_BASE_URL = "https://registry-api.example.com"
+API_ACCESS_TOKEN = "test-token"
+"""
+
+
+class TestProfileRegistry:
+
+    def test_profile_file_parsed_once(self, tmp_path):
+        path = tmp_path / "profile.toml"
+        path.write_text(PROFILE)
+
+        with patch("maws.config.CONFIG_FILE_PATH", path), patch("maws.config.tomllib.load") as mock_load:
+            mock_load.return_value = {"profiles": {"test": {"API_BASE_URL": "https://registry-api.example.com"}}}
+            load_profile("test")
+            load_profile("test")
+            get_settings("test")
+            mock_load.assert_called_once()
+
+    def test_settings_memoized_per_profile(self, tmp_path):
+        path = tmp_path / "profile.toml"
+        path.write_text(PROFILE + '\n[profiles.other]\nAPI_BASE_URL = "https://other.example.com"\n')
+
+        with patch("maws.config.CONFIG_FILE_PATH", path):
+            assert get_settings("test") is get_settings("test")
+            assert get_settings("other") is not get_settings("test")
+            assert get_settings("other").api_base_url == "https://other.example.com"
+
+    def test_profile_file_change_invalidates(self, tmp_path):
+        path = tmp_path / "profile.toml"
+        path.write_text(PROFILE)
+
+        with patch("maws.config.CONFIG_FILE_PATH", path):
+            assert get_settings("test").api_version == "v1"
+            path.write_text(PROFILE + 'API_VERSION = "v2"\n')
+            assert get_settings("test").api_version == "v2"
+
+    def test_disk_cache_skips_parsing(self, tmp_path, cache_dir):
+        path = tmp_path / "profile.toml"
+        path.write_text(PROFILE)
+
+        with patch("maws.config.CONFIG_FILE_PATH", path):
+            settings = get_settings("test")
+            assert (cache_dir / "profiles.json").stat().st_mode & 0o777 == 0o600
+
+            registry.clear()
+            with patch("maws.config.tomllib.load") as mock_load, patch("maws.config.Settings.__init__") as mock_init:
+                cached = get_settings("test")
+                mock_load.assert_not_called()
+                mock_init.assert_not_called()
+
+        assert cached.api_base_url == settings.api_base_url
+        assert cached.api_access_token == "test-token"
+
+    def test_disk_cache_ignored_when_corrupt(self, tmp_path, cache_dir):
+        path = tmp_path / "profile.toml"
+        path.write_text(PROFILE)
+        cache_dir.mkdir(parents=True)
+        (cache_dir / "profiles.json").write_text("not json")
+
+        with patch("maws.config.CONFIG_FILE_PATH", path):
+            assert get_settings("test").api_access_token == "test-token"
+
+    def test_environment_change_invalidates(self, tmp_path):
+        path = tmp_path / "profile.toml"
+        path.write_text(PROFILE)
+
+        with patch("maws.config.CONFIG_FILE_PATH", path):
+            with patch.dict(os.environ, {"POLL_TIMEOUT": "10"}):
+                assert get_settings("test").poll_timeout == 10
+            with patch.dict(os.environ, {"POLL_TIMEOUT": "20"}):
+                assert get_settings("test").poll_timeout == 20
+
+
+class TestMatchProfiles:
+
+    @pytest.fixture(autouse=True)
+    def profile_file(self, tmp_path):
+        path = tmp_path / "profile.toml"
+        path.write_text(
+            "".join(
+                f'[profiles.{name}]\nAPI_BASE_URL = "https://{name}.example.com"\n'
+                for name in ("dev", "prod-a", "prod-b", "staging")
+            )
+        )
+        with patch("maws.config.CONFIG_FILE_PATH", path):
+            yield path
+
+    @pytest.mark.parametrize(
+        "profile, expected",
+        [(None, False), ("prod", False), ("prod-*", True), ("dev,prod", True), ("prod-[ab]", True)],
+    )
+    def test_is_profile_pattern(self, profile, expected):
+        assert is_profile_pattern(profile) is expected
+
+    def test_glob(self):
+        assert match_profiles("prod-*") == ["prod-a", "prod-b"]
+
+    def test_names_and_globs_without_duplicates(self):
+        assert match_profiles("staging, prod-*,prod-a") == ["staging", "prod-a", "prod-b"]
+
+    def test_no_match(self):
+        with pytest.raises(ValueError, match="No profile matches 'test-\\*', available profiles: dev, prod-a"):
+            match_profiles("prod-a,test-*")
+
+    def test_missing_profile_file(self, tmp_path):
+        with patch("maws.config.CONFIG_FILE_PATH", tmp_path / "missing.toml"), patch("maws.config.show_config_help"):
+            with pytest.raises(SystemExit):
+                match_profiles("prod-*")
+
+
 class TestConfigFilePath:
     def test_config_file_path_is_correct(self):
         expected_path = Path.home() / ".skaylink" / "profile.toml"
@@ -1,10 +1,13 @@
 import json
 from http import HTTPStatus
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from faker import Faker
 
+from maws import fleet
+from maws.config import close_api_clients, registry
+
 
 @pytest.fixture(scope="function")
 def fake():
@@ -44,3 +47,31 @@ def mock_console():
 @pytest.fixture(scope="function")
 def mock_authenticated_client():
     return Mock()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setenv("MAWS_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_api_clients():
+    yield
+    close_api_clients()
+    registry.clear()
+    fleet._unbatched.clear()
+
+
+@pytest.fixture(scope="function")
+def patch_services():
+    """
+    Batch deployment endpoint of an API which does not support it, tests may replace the response
+    """
+    with patch("maws.fleet.patch_services") as mock:
+        response = Mock()
+        response.status_code = HTTPStatus.NOT_FOUND
+        response.content = b""
+        mock.asyncio_detailed = AsyncMock(return_value=response)
+        yield mock
@@ -0,0 +1,54 @@
+from rich.console import Console
+
+from maws.dashboard import Dashboard
+from maws.fleet import DeploymentResult, DeploymentState
+
+STYLES = {"pending": "yellow", "succeeded": "green", "failed": "red", "skipped": "dim"}
+
+
+def render(dashboard: Dashboard, height: int = 40) -> str:
+    console = Console(width=120, height=height, record=True, color_system=None)
+    console.print(dashboard)
+    return console.export_text()
+
+
+class TestDashboard:
+
+    def test_summary(self):
+        dashboard = Dashboard(STYLES)
+        dashboard.update(
+            [
+                DeploymentResult(service="api", state=DeploymentState.PENDING, status_code=202),
+                DeploymentResult(service="worker", state=DeploymentState.FAILED, message="Image not found"),
+            ],
+            checks=2,
+        )
+        dashboard.update([DeploymentResult(service="api", state=DeploymentState.SUCCEEDED, status_code=200)], 3)
+
+        output = render(dashboard)
+
+        assert "2 services: 0 pending, 1 failed, 1 succeeded, 0 skipped, 3 status checks" in output
+        assert "Image not found" in output
+
+    def test_only_rows_fitting_the_terminal(self):
+        dashboard = Dashboard(STYLES)
+        dashboard.update(
+            [DeploymentResult(service=f"svc-{i:04}", state=DeploymentState.SUCCEEDED) for i in range(2000)]
+        )
+        dashboard.update([DeploymentResult(service="svc-1500", state=DeploymentState.PENDING)])
+
+        output = render(dashboard, height=20)
+
+        assert len(output.splitlines()) <= 20
+        assert "svc-1500" in output.splitlines()[5]
+        assert "1987 more services" in output
+
+    def test_rows_rendered_once_per_change(self):
+        dashboard = Dashboard(STYLES)
+        dashboard.update([DeploymentResult(service="api", state=DeploymentState.SUCCEEDED)])
+        row = dashboard.rows["api"]
+
+        render(dashboard)
+        dashboard.update([DeploymentResult(service="worker", state=DeploymentState.SUCCEEDED)])
+
+        assert dashboard.rows["api"] is row
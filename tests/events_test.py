@@ -0,0 +1,43 @@
+import io
+import json
+
+from maws.events import EventStream
+
+
+def read(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestEventStream:
+
+    def test_emit(self):
+        stream = io.StringIO()
+        EventStream(stream).emit("started", "api", status_code=201)
+
+        assert stream.getvalue().endswith("\n")
+        assert read(stream) == [{"event": "started", "service": "api", "elapsed": 0.0, "status_code": 201}]
+
+    def test_poll_emits_state_transitions(self):
+        stream = io.StringIO()
+        events = EventStream(stream)
+
+        events.poll("api", 202, "pending")
+        events.poll("api", 202, "pending")
+        events.poll("api", 200, "succeeded")
+
+        records = read(stream)
+        assert [record["event"] for record in records] == ["poll", "state", "poll", "poll", "state"]
+        assert [record["attempt"] for record in records if record["event"] == "poll"] == [1, 2, 3]
+        assert [(record["previous"], record["state"]) for record in records if record["event"] == "state"] == [
+            (None, "pending"),
+            ("pending", "succeeded"),
+        ]
+
+    def test_attempts_per_service(self):
+        stream = io.StringIO()
+        events = EventStream(stream)
+
+        events.poll("api", 202, "pending")
+        events.poll("worker", 202, "pending")
+
+        assert [record["attempt"] for record in read(stream) if record["event"] == "poll"] == [1, 1]
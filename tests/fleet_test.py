@@ -0,0 +1,578 @@
+import asyncio
+import io
+import json
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from maws.clients.ecs_service_deployment_client import AuthenticatedClient
+from maws.events import EventStream
+from maws.fleet import (
+    DeploymentState,
+    _unbatched,
+    deploy_fleet,
+    deploy_profiles,
+    deploy_service,
+    deploy_tasks,
+    deployment_result,
+    error_message,
+    fleet_status,
+    list_tasks,
+    parse_batch_results,
+    parse_names,
+)
+from maws.manifest import ServiceDeployment, TaskDeployment
+from maws.polling import PollingPolicy
+
+POLICY = PollingPolicy.fixed(0)
+
+pytestmark = pytest.mark.usefixtures("patch_services")
+
+
+def make_response(status_code: HTTPStatus, content: bytes = b"") -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    return response
+
+
+@pytest.fixture(scope="function")
+def client():
+    return AuthenticatedClient(base_url="http://dummy-host/v1", token="dummy-token")
+
+
+class TestErrorMessage:
+
+    def test_error_message_string(self, fake):
+        error = fake.sentence()
+        assert error_message(json.dumps({"error": error})) == error
+
+    def test_error_message_list(self):
+        assert error_message(json.dumps({"error": ["a", "b"]})) == "a, b"
+
+    def test_error_message_invalid(self):
+        assert error_message(b"not json") == ""
+
+
+class TestParseNames:
+
+    def test_parse_names_list(self):
+        assert parse_names(json.dumps(["api", "worker"]), "services") == ["api", "worker"]
+
+    def test_parse_names_objects(self):
+        assert parse_names(json.dumps({"services": [{"name": "api"}]}), "services") == ["api"]
+
+    def test_parse_names_empty(self):
+        assert parse_names(b"", "services") == []
+
+    def test_parse_batch_results(self):
+        content = json.dumps({"results": [{"service": "api", "status_code": 201, "error": None}]})
+        assert parse_batch_results(content) == {"api": (201, "")}
+
+
+class TestDeploymentResult:
+
+    def test_deployment_result_states(self):
+        assert deployment_result("api", HTTPStatus.ACCEPTED).state == DeploymentState.PENDING
+        assert deployment_result("api", HTTPStatus.OK).state == DeploymentState.SUCCEEDED
+        assert deployment_result("api", HTTPStatus.EXPECTATION_FAILED).state == DeploymentState.FAILED
+        assert deployment_result("api", HTTPStatus.NOT_FOUND).failed
+
+
+@patch("maws.fleet.get_service")
+@patch("maws.fleet.patch_service")
+class TestDeployService:
+
+    def test_deploy_service_succeeded(self, mock_patch_service, mock_get_service, client, fake):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(
+            side_effect=[make_response(HTTPStatus.ACCEPTED), make_response(HTTPStatus.OK)]
+        )
+        deployment = ServiceDeployment(name=fake.word(), image=fake.uuid4())
+
+        result = asyncio.run(deploy_service(client, deployment, asyncio.Semaphore(1), POLICY))
+
+        assert result.state == DeploymentState.SUCCEEDED
+        assert result.succeeded
+        assert mock_get_service.asyncio_detailed.call_count == 2
+        body = mock_patch_service.asyncio_detailed.call_args.kwargs["body"]
+        assert body.image == deployment.image
+
+    def test_deploy_service_timeout(self, mock_patch_service, mock_get_service, client):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.ACCEPTED))
+        policy = PollingPolicy.fixed(0.01, timeout=0.05)
+
+        result = asyncio.run(
+            deploy_service(client, ServiceDeployment(name="api", image="img"), asyncio.Semaphore(1), policy)
+        )
+
+        assert result.state == DeploymentState.PENDING
+        assert "Timed out" in result.message
+        assert mock_get_service.asyncio_detailed.call_count > 1
+
+    def test_deploy_service_patch_rejected(self, mock_patch_service, mock_get_service, client, fake):
+        error = fake.sentence()
+        mock_patch_service.asyncio_detailed = AsyncMock(
+            return_value=make_response(HTTPStatus.EXPECTATION_FAILED, json.dumps({"error": error}))
+        )
+        mock_get_service.asyncio_detailed = AsyncMock()
+
+        result = asyncio.run(
+            deploy_service(client, ServiceDeployment(name="api", image="img"), asyncio.Semaphore(1), POLICY)
+        )
+
+        assert result.state == DeploymentState.FAILED
+        assert result.status_code == HTTPStatus.EXPECTATION_FAILED
+        assert result.message == error
+        mock_get_service.asyncio_detailed.assert_not_called()
+
+    def test_deploy_service_failed(self, mock_patch_service, mock_get_service, client):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(
+            return_value=make_response(HTTPStatus.EXPECTATION_FAILED, json.dumps({"error": "boom"}))
+        )
+
+        result = asyncio.run(
+            deploy_service(client, ServiceDeployment(name="api", image="img"), asyncio.Semaphore(1), POLICY)
+        )
+
+        assert result.state == DeploymentState.FAILED
+        assert result.message == "boom"
+
+    def test_deploy_service_unexpected_status(self, mock_patch_service, mock_get_service, client):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.NOT_FOUND))
+
+        result = asyncio.run(
+            deploy_service(client, ServiceDeployment(name="api", image="img"), asyncio.Semaphore(1), POLICY)
+        )
+
+        assert result.state == DeploymentState.FAILED
+        assert result.status_code == HTTPStatus.NOT_FOUND
+
+    def test_deploy_service_exception(self, mock_patch_service, mock_get_service, client):
+        mock_patch_service.asyncio_detailed = AsyncMock(side_effect=Exception("Test exception"))
+
+        result = asyncio.run(
+            deploy_service(client, ServiceDeployment(name="api", image="img"), asyncio.Semaphore(1), POLICY)
+        )
+
+        assert result.state == DeploymentState.FAILED
+        assert result.message == "Test exception"
+
+
+@patch("maws.fleet.get_service")
+@patch("maws.fleet.patch_service")
+class TestDeployFleet:
+
+    def test_deploy_fleet_keeps_manifest_order(self, mock_patch_service, mock_get_service, client, fake):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.OK))
+        deployments = [ServiceDeployment(name=f"{fake.word()}-{i}", image=fake.uuid4()) for i in range(20)]
+
+        results = asyncio.run(deploy_fleet(client, deployments, POLICY, concurrency=4))
+
+        assert [result.service for result in results] == [deployment.name for deployment in deployments]
+        assert all(result.succeeded for result in results)
+        assert mock_patch_service.asyncio_detailed.call_count == 20
+
+    def test_deploy_fleet_bounded_concurrency(self, mock_patch_service, mock_get_service, client):
+        in_flight = 0
+        peak = 0
+
+        async def slow_patch(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return make_response(HTTPStatus.CREATED)
+
+        mock_patch_service.asyncio_detailed = slow_patch
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.OK))
+        deployments = [ServiceDeployment(name=f"service-{i}", image="img") for i in range(12)]
+
+        asyncio.run(deploy_fleet(client, deployments, POLICY, concurrency=3))
+
+        assert peak == 3
+
+
+def batch_response(*results: tuple) -> Mock:
+    items = [
+        {"service": service, "status_code": status_code, **({"error": error} if error else {})}
+        for service, status_code, error in results
+    ]
+    return make_response(HTTPStatus.MULTI_STATUS, json.dumps({"results": items}).encode())
+
+
+@patch("maws.fleet.get_service")
+@patch("maws.fleet.patch_service")
+class TestBatchDeployments:
+
+    def test_batch_results(self, mock_patch_service, mock_get_service, patch_services, client):
+        patch_services.asyncio_detailed.return_value = batch_response(
+            ("api", HTTPStatus.CREATED, None),
+            ("worker", HTTPStatus.EXPECTATION_FAILED, "Image not found"),
+        )
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.OK))
+        deployments = [ServiceDeployment(name="api", image="img:1"), ServiceDeployment(name="worker", image="img:2")]
+
+        results = asyncio.run(deploy_fleet(client, deployments, POLICY))
+
+        body = patch_services.asyncio_detailed.call_args.kwargs["body"].to_dict()
+        assert [(item["service"], item["request"]["image"]) for item in body["deployments"]] == [
+            ("api", "img:1"),
+            ("worker", "img:2"),
+        ]
+        assert results[0].succeeded
+        assert (results[1].status_code, results[1].message) == (HTTPStatus.EXPECTATION_FAILED, "Image not found")
+        mock_patch_service.asyncio_detailed.assert_not_called()
+        mock_get_service.asyncio_detailed.assert_called_once()
+
+    def test_fallback_is_remembered(self, mock_patch_service, mock_get_service, patch_services, client):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.OK))
+        deployments = [ServiceDeployment(name=f"service-{i}", image="img") for i in range(3)]
+
+        for _ in range(2):
+            results = asyncio.run(deploy_fleet(client, deployments, POLICY))
+            assert all(result.succeeded for result in results)
+
+        assert patch_services.asyncio_detailed.call_count == 1
+        assert mock_patch_service.asyncio_detailed.call_count == 6
+        assert "http://dummy-host/v1" in _unbatched
+
+    def test_batches_of_batch_size(self, mock_patch_service, mock_get_service, patch_services, client):
+        async def accept(client, body):
+            return batch_response(*((item.service, HTTPStatus.CREATED, None) for item in body.deployments))
+
+        patch_services.asyncio_detailed = AsyncMock(side_effect=accept)
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.OK))
+        deployments = [ServiceDeployment(name=f"service-{i}", image="img") for i in range(5)]
+
+        with patch("maws.fleet.BATCH_SIZE", 2):
+            results = asyncio.run(deploy_fleet(client, deployments, POLICY))
+
+        assert [len(call.kwargs["body"].deployments) for call in patch_services.asyncio_detailed.call_args_list] == [
+            2,
+            2,
+            1,
+        ]
+        assert [result.service for result in results] == [deployment.name for deployment in deployments]
+        assert all(result.succeeded for result in results)
+
+    def test_batch_too_large_falls_back_once(self, mock_patch_service, mock_get_service, patch_services, client):
+        patch_services.asyncio_detailed.return_value = make_response(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.OK))
+        deployments = [ServiceDeployment(name=f"service-{i}", image="img") for i in range(2)]
+
+        results = asyncio.run(deploy_fleet(client, deployments, POLICY))
+
+        assert all(result.succeeded for result in results)
+        assert not _unbatched
+
+    def test_batch_rejected(self, mock_patch_service, mock_get_service, patch_services, client):
+        patch_services.asyncio_detailed.return_value = make_response(HTTPStatus.FORBIDDEN)
+        deployments = [ServiceDeployment(name=f"service-{i}", image="img") for i in range(2)]
+
+        results = asyncio.run(deploy_fleet(client, deployments, POLICY))
+
+        assert [(result.status_code, result.message) for result in results] == [
+            (HTTPStatus.FORBIDDEN, "Deployment failed with status 403")
+        ] * 2
+        mock_patch_service.asyncio_detailed.assert_not_called()
+
+    def test_missing_and_failed_batch(self, mock_patch_service, mock_get_service, patch_services, client):
+        deployments = [ServiceDeployment(name="api", image="img"), ServiceDeployment(name="worker", image="img")]
+
+        patch_services.asyncio_detailed.return_value = batch_response(("api", HTTPStatus.NOT_FOUND, None))
+        missing = asyncio.run(deploy_fleet(client, deployments, POLICY))
+        patch_services.asyncio_detailed.side_effect = Exception("Connection reset")
+        failed = asyncio.run(deploy_fleet(client, deployments, POLICY))
+
+        assert [result.message for result in missing] == [
+            "Deployment failed with status 404",
+            "Missing from the batch response",
+        ]
+        assert [result.message for result in failed] == ["Connection reset"] * 2
+        mock_patch_service.asyncio_detailed.assert_not_called()
+
+    def test_single_deployment_not_batched(self, mock_patch_service, mock_get_service, patch_services, client):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.OK))
+
+        asyncio.run(deploy_fleet(client, [ServiceDeployment(name="api", image="img")], POLICY))
+
+        patch_services.asyncio_detailed.assert_not_called()
+
+
+@patch("maws.fleet.get_service")
+@patch("maws.fleet.patch_service")
+class TestReattach:
+
+    def test_reattached_deployment_is_awaited(self, mock_patch_service, mock_get_service, patch_services, client):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.OK))
+        deployments = [ServiceDeployment(name="api", image="img"), ServiceDeployment(name="worker", image="img")]
+        stream = io.StringIO()
+
+        results = asyncio.run(
+            deploy_fleet(client, deployments, POLICY, events=EventStream(stream), reattach={"api": 1000.0})
+        )
+
+        assert [result.service for result in results] == ["api", "worker"]
+        assert all(result.succeeded for result in results)
+        assert results[0].started_at == 1000.0
+        mock_patch_service.asyncio_detailed.assert_called_once()
+        assert mock_patch_service.asyncio_detailed.call_args.kwargs["service"] == "worker"
+        patch_services.asyncio_detailed.assert_not_called()
+        assert mock_get_service.asyncio_detailed.call_count == 2
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [record["service"] for record in records if record["event"] == "reattached"] == ["api"]
+
+    def test_reattached_deployment_failed(self, mock_patch_service, mock_get_service, patch_services, client):
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.EXPECTATION_FAILED))
+
+        results = asyncio.run(
+            deploy_fleet(client, [ServiceDeployment(name="api", image="img")], POLICY, reattach={"api": 1000.0})
+        )
+
+        assert results[0].failed
+        mock_patch_service.asyncio_detailed.assert_not_called()
+
+
+@patch("maws.fleet.get_services")
+@patch("maws.fleet.get_service")
+class TestFleetStatus:
+
+    def test_fleet_status_services(self, mock_get_service, mock_get_services, client):
+        responses = {"api": make_response(HTTPStatus.OK), "worker": make_response(HTTPStatus.ACCEPTED)}
+        mock_get_service.asyncio_detailed = AsyncMock(side_effect=lambda service, client: responses[service])
+        mock_get_services.asyncio_detailed = AsyncMock()
+
+        results = asyncio.run(fleet_status(client, ["api", "worker"]))
+
+        assert [result.state for result in results] == [DeploymentState.SUCCEEDED, DeploymentState.PENDING]
+        mock_get_services.asyncio_detailed.assert_not_called()
+
+    def test_fleet_status_all(self, mock_get_service, mock_get_services, client):
+        mock_get_services.asyncio_detailed = AsyncMock(
+            return_value=make_response(HTTPStatus.OK, json.dumps(["api", "worker"]))
+        )
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.OK))
+
+        results = asyncio.run(fleet_status(client))
+
+        assert [result.service for result in results] == ["api", "worker"]
+        assert mock_get_service.asyncio_detailed.call_count == 2
+
+    def test_fleet_status_listing_failed(self, mock_get_service, mock_get_services, client):
+        mock_get_services.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.FORBIDDEN))
+
+        with pytest.raises(Exception, match="403"):
+            asyncio.run(fleet_status(client))
+
+    def test_fleet_status_exception(self, mock_get_service, mock_get_services, client):
+        mock_get_service.asyncio_detailed = AsyncMock(side_effect=Exception("Test exception"))
+
+        results = asyncio.run(fleet_status(client, ["api"]))
+
+        assert results[0].failed
+        assert results[0].message == "Test exception"
+
+
+@patch("maws.fleet.patch_task")
+class TestDeployTasks:
+
+    def test_deploy_tasks_results(self, mock_patch_task, client, fake):
+        error = fake.sentence()
+        responses = {
+            "cleanup": make_response(HTTPStatus.CREATED),
+            "report": make_response(HTTPStatus.EXPECTATION_FAILED, json.dumps({"error": error})),
+            "missing": make_response(HTTPStatus.NOT_FOUND),
+        }
+        mock_patch_task.asyncio_detailed = AsyncMock(side_effect=lambda task, client, body: responses[task])
+        deployments = [TaskDeployment(name=name, image=fake.uuid4()) for name in responses]
+
+        results = asyncio.run(deploy_tasks(client, deployments))
+
+        assert [result.service for result in results] == ["cleanup", "report", "missing"]
+        assert [result.state for result in results] == [
+            DeploymentState.SUCCEEDED,
+            DeploymentState.FAILED,
+            DeploymentState.FAILED,
+        ]
+        assert results[1].message == error
+        assert results[2].message == "Update failed with status 404"
+
+    def test_deploy_tasks_exception(self, mock_patch_task, client):
+        mock_patch_task.asyncio_detailed = AsyncMock(side_effect=Exception("Test exception"))
+
+        results = asyncio.run(deploy_tasks(client, [TaskDeployment(name="cleanup", image="img")]))
+
+        assert results[0].failed
+        assert results[0].message == "Test exception"
+
+    def test_deploy_tasks_bounded_concurrency(self, mock_patch_task, client):
+        in_flight = 0
+        peak = 0
+
+        async def slow_patch(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return make_response(HTTPStatus.CREATED)
+
+        mock_patch_task.asyncio_detailed = slow_patch
+        deployments = [TaskDeployment(name=f"task-{i}", image="img") for i in range(12)]
+
+        asyncio.run(deploy_tasks(client, deployments, concurrency=4))
+
+        assert peak == 4
+
+
+@patch("maws.fleet.get_tasks")
+class TestListTasks:
+
+    def test_list_tasks(self, mock_get_tasks, client):
+        mock_get_tasks.asyncio_detailed = AsyncMock(
+            return_value=make_response(HTTPStatus.OK, json.dumps({"tasks": [{"name": "cleanup"}]}))
+        )
+        assert asyncio.run(list_tasks(client)) == ["cleanup"]
+
+    def test_list_tasks_failed(self, mock_get_tasks, client):
+        mock_get_tasks.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.FORBIDDEN))
+        with pytest.raises(Exception, match="403"):
+            asyncio.run(list_tasks(client))
+
+
+@patch("maws.fleet.get_service")
+@patch("maws.fleet.patch_service")
+class TestFleetEvents:
+
+    def events(self, stream: io.StringIO) -> list[tuple]:
+        return [
+            (record["event"], record["service"], record.get("state"))
+            for record in map(json.loads, stream.getvalue().splitlines())
+        ]
+
+    def test_deploy_fleet_events(self, mock_patch_service, mock_get_service, client):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(
+            side_effect=[make_response(HTTPStatus.ACCEPTED), make_response(HTTPStatus.OK)]
+        )
+        stream = io.StringIO()
+
+        asyncio.run(
+            deploy_fleet(client, [ServiceDeployment(name="api", image="img")], POLICY, events=EventStream(stream))
+        )
+
+        assert self.events(stream) == [
+            ("started", "api", None),
+            ("poll", "api", "pending"),
+            ("state", "api", "pending"),
+            ("poll", "api", "succeeded"),
+            ("state", "api", "succeeded"),
+        ]
+
+    def test_deploy_fleet_rejected_event(self, mock_patch_service, mock_get_service, client):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.NOT_FOUND))
+        stream = io.StringIO()
+
+        asyncio.run(
+            deploy_fleet(client, [ServiceDeployment(name="api", image="img")], POLICY, events=EventStream(stream))
+        )
+
+        assert self.events(stream) == [("state", "api", "failed")]
+
+    def test_deploy_fleet_timeout_event(self, mock_patch_service, mock_get_service, client):
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.ACCEPTED))
+        stream = io.StringIO()
+        policy = PollingPolicy.fixed(0, timeout=0)
+
+        asyncio.run(
+            deploy_fleet(client, [ServiceDeployment(name="api", image="img")], policy, events=EventStream(stream))
+        )
+
+        assert self.events(stream)[-1] == ("timeout", "api", None)
+
+    def test_fleet_status_waits_with_policy(self, mock_patch_service, mock_get_service, client):
+        mock_get_service.asyncio_detailed = AsyncMock(
+            side_effect=[make_response(HTTPStatus.ACCEPTED), make_response(HTTPStatus.OK)]
+        )
+
+        results = asyncio.run(fleet_status(client, ["api"], policy=POLICY))
+
+        assert results[0].succeeded
+        assert mock_get_service.asyncio_detailed.call_count == 2
+
+
+@patch("maws.fleet.get_service")
+@patch("maws.fleet.patch_service")
+class TestDeployProfiles:
+
+    def test_deploys_through_every_client(self, mock_patch_service, mock_get_service):
+        clients = {
+            profile: AuthenticatedClient(base_url=f"http://{profile}-host/v1", token=profile)
+            for profile in ("prod-a", "prod-b")
+        }
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = AsyncMock(
+            side_effect=lambda service, client: make_response(
+                HTTPStatus.OK if client is clients["prod-a"] else HTTPStatus.EXPECTATION_FAILED
+            )
+        )
+        stream = io.StringIO()
+
+        results = asyncio.run(
+            deploy_profiles(
+                {profile: (client, POLICY) for profile, client in clients.items()},
+                [ServiceDeployment(name="api", image="img")],
+                events={profile: EventStream(stream, profile=profile) for profile in clients},
+            )
+        )
+
+        assert {profile: [result.state for result in results[profile]] for profile in results} == {
+            "prod-a": [DeploymentState.SUCCEEDED],
+            "prod-b": [DeploymentState.FAILED],
+        }
+        patched_clients = [call.kwargs["client"] for call in mock_patch_service.asyncio_detailed.call_args_list]
+        assert all(any(client is patched for patched in patched_clients) for client in clients.values())
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert {event["profile"] for event in events} == {"prod-a", "prod-b"}
+
+    def test_profiles_sharing_a_client(self, mock_patch_service, mock_get_service):
+        client = AuthenticatedClient(base_url="http://prod-host/v1", token="token")
+        sessions = []
+
+        @asynccontextmanager
+        async def session(client):
+            sessions.append("open")
+            yield client
+            sessions.append("closed")
+
+        async def get_service(service, client):
+            await asyncio.sleep(0.01)
+            assert "closed" not in sessions
+            return make_response(HTTPStatus.OK)
+
+        mock_patch_service.asyncio_detailed = AsyncMock(return_value=make_response(HTTPStatus.CREATED))
+        mock_get_service.asyncio_detailed = get_service
+
+        with patch("maws.fleet.async_session", session):
+            results = asyncio.run(
+                deploy_profiles(
+                    {"prod-a": (client, POLICY), "prod-b": (client, PollingPolicy.fixed(0.02))},
+                    [ServiceDeployment(name="api", image="img")],
+                )
+            )
+
+        assert all(result.succeeded for profile in results.values() for result in profile)
+        assert sessions == ["open", "closed"]
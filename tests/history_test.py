@@ -0,0 +1,153 @@
+import time
+from contextlib import closing
+
+import pytest
+
+from maws.fleet import DeploymentResult, DeploymentState
+from maws.history import (
+    PENDING_EXPIRY,
+    duration_stats,
+    format_duration,
+    history_path,
+    log_deployments,
+    log_status,
+    open_history,
+    pending_since,
+    percentile,
+)
+from maws.manifest import ServiceDeployment
+
+
+def result(
+    service: str,
+    state: DeploymentState = DeploymentState.SUCCEEDED,
+    started_at: float = 1000,
+    duration: float | None = 60,
+    polls: int = 3,
+) -> DeploymentResult:
+    return DeploymentResult(
+        service=service,
+        state=state,
+        started_at=started_at,
+        finished_at=None if duration is None else started_at + duration,
+        polls=polls,
+    )
+
+
+def deploy(service: str, *results: DeploymentResult, profile: str = "prod") -> None:
+    log_deployments(profile, [ServiceDeployment(name=service, image=f"{service}:1")] * len(results), list(results))
+
+
+def rows() -> list[tuple]:
+    with closing(open_history()) as db:
+        return db.execute(
+            "SELECT profile, service, image, started_at, finished_at, polls, result FROM deployments ORDER BY id"
+        ).fetchall()
+
+
+class TestHistoryStore:
+
+    def test_history_path(self, cache_dir):
+        assert history_path() == cache_dir / "history.db"
+
+    def test_log_deployments(self):
+        log_deployments(
+            None,
+            [ServiceDeployment(name="api", image="api:2"), ServiceDeployment(name="worker", image="worker:2")],
+            [result("api"), result("worker", DeploymentState.SKIPPED)],
+        )
+        assert rows() == [("default", "api", "api:2", 1000, 1060, 3, "succeeded")]
+
+    def test_pending_deployment_completed_by_status(self):
+        started_at = time.time() - 60
+        deploy("api", result("api", DeploymentState.PENDING, started_at=started_at, duration=None, polls=5))
+        assert pending_since("prod", "api") == started_at
+
+        log_status("prod", [result("api", started_at=started_at + 30, duration=30, polls=2)])
+
+        assert rows() == [("prod", "api", "api:1", started_at, started_at + 60, 7, "succeeded")]
+        assert pending_since("prod", "api") is None
+
+    def test_status_without_deployment(self):
+        log_status("prod", [result("api", started_at=1200, duration=30, polls=2)])
+        log_status("prod", [result("api", DeploymentState.PENDING, started_at=1300, duration=None)])
+
+        assert rows() == []
+        assert pending_since("prod", "api") is None
+        assert duration_stats("prod") == {}
+
+    def test_expired_pending_deployment(self):
+        started_at = time.time() - PENDING_EXPIRY - 60
+        deploy("api", result("api", DeploymentState.PENDING, started_at=started_at, duration=None))
+        assert pending_since("prod", "api") is None
+
+        log_status("prod", [result("api", started_at=time.time(), duration=30)])
+
+        assert rows() == [("prod", "api", "api:1", started_at, None, 3, "pending")]
+        assert duration_stats("prod") == {}
+
+    def test_unwritable_history(self, cache_dir):
+        cache_dir.mkdir()
+        history_path().mkdir()
+        deploy("api", result("api"))
+        log_status("prod", [result("api")])
+        assert duration_stats("prod") == {}
+        assert pending_since("prod", "api") is None
+
+    def test_indexed(self):
+        with closing(open_history()) as db:
+            plan = db.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM deployments WHERE profile = 'prod' AND service = 'api'"
+            ).fetchall()
+        assert "deployments_service" in str(plan)
+
+
+class TestDurationStats:
+
+    def test_percentiles(self):
+        deploy(
+            "api",
+            *(
+                result("api", started_at=1000 + i * 1000, duration=duration)
+                for i, duration in enumerate([50, 10, 40, 30, 20, 100, 60, 70, 90, 80])
+            ),
+        )
+        deploy("api", result("api", DeploymentState.FAILED, started_at=20000, duration=5))
+        deploy("api", result("api", DeploymentState.PENDING, started_at=30000, duration=None))
+
+        stats = duration_stats("prod")["api"]
+
+        assert stats.deployments == 11
+        assert stats.failed == 1
+        assert stats.p50 == 50
+        assert stats.p95 == 100
+        assert stats.last == 80
+
+    def test_recent_deployments_only(self):
+        deploy("api", *(result("api", started_at=i * 1000, duration=10 * (i + 1)) for i in range(10)))
+
+        stats = duration_stats("prod", limit=3)["api"]
+
+        assert stats.deployments == 3
+        assert stats.p50 == 90
+
+    def test_filters(self):
+        deploy("api", result("api", duration=10))
+        deploy("worker", result("worker", duration=20))
+        deploy("api", result("api", duration=30), profile="dev")
+
+        assert set(duration_stats("prod")) == {"api", "worker"}
+        assert set(duration_stats("prod", ["worker", "db"])) == {"worker"}
+        assert duration_stats("dev")["api"].p50 == 30
+        assert duration_stats(None) == {}
+
+    def test_percentile(self):
+        assert percentile([1.0], 0.95) == 1.0
+        assert percentile([1.0, 2.0], 0.5) == 1.0
+        assert percentile([float(i) for i in range(1, 21)], 0.95) == 19.0
+
+    @pytest.mark.parametrize(
+        "seconds, expected", [(0, "0s"), (42.4, "42s"), (65, "1m 05s"), (3600, "1h 00m"), (5430, "1h 30m")]
+    )
+    def test_format_duration(self, seconds, expected):
+        assert format_duration(seconds) == expected
@@ -0,0 +1,171 @@
+import asyncio
+import gzip
+import stat
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from maws.httpcache import CachedResponse, CacheTransport, HttpCache
+
+URL = "https://api.example.com/v1/services"
+
+
+class Server:
+    """
+    Answers GET requests with a body and an ETag, honouring If-None-Match
+    """
+
+    def __init__(self, body: bytes = b'["api"]', headers: dict = None, status_code: int = HTTPStatus.OK):
+        self.body = body
+        self.headers = {"ETag": '"v1"', "Content-Type": "application/json"} if headers is None else headers
+        self.status_code = status_code
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        etag = self.headers.get("ETag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+        return httpx.Response(self.status_code, headers=self.headers, content=self.body)
+
+
+def client(server: Server, cache: HttpCache = None) -> httpx.Client:
+    return httpx.Client(transport=CacheTransport(httpx.MockTransport(server), cache or HttpCache()))
+
+
+class TestCacheTransport:
+
+    def test_revalidates_with_etag(self):
+        server = Server()
+        with client(server) as http:
+            first = http.get(URL)
+            second = http.get(URL)
+
+        assert "If-None-Match" not in server.requests[0].headers
+        assert server.requests[1].headers["If-None-Match"] == '"v1"'
+        assert second.status_code == HTTPStatus.OK
+        assert second.json() == first.json() == ["api"]
+        assert second.headers["Content-Type"] == "application/json"
+
+    def test_revalidates_with_last_modified(self):
+        server = Server(headers={"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"})
+        with client(server) as http:
+            http.get(URL)
+            http.get(URL)
+
+        assert server.requests[1].headers["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    def test_changed_response_replaces_entry(self):
+        server, cache = Server(), HttpCache()
+        with client(server, cache) as http:
+            http.get(URL)
+            server.body, server.headers["ETag"] = b'["api", "worker"]', '"v2"'
+            assert http.get(URL).json() == ["api", "worker"]
+            assert http.get(URL).json() == ["api", "worker"]
+
+        assert server.requests[2].headers["If-None-Match"] == '"v2"'
+
+    @pytest.mark.parametrize(
+        "status_code, headers",
+        [
+            (HTTPStatus.ACCEPTED, {"ETag": '"v1"'}),
+            (HTTPStatus.OK, {}),
+            (HTTPStatus.OK, {"ETag": '"v1"', "Cache-Control": "no-store"}),
+        ],
+    )
+    def test_not_cached(self, status_code, headers):
+        server = Server(headers=headers, status_code=status_code)
+        with client(server) as http:
+            http.get(URL)
+            http.get(URL)
+
+        assert "If-None-Match" not in server.requests[1].headers
+
+    def test_only_get_is_cached(self):
+        server = Server()
+        with client(server) as http:
+            http.get(URL)
+            http.patch(URL, json={"image": "img"})
+
+        assert "If-None-Match" not in server.requests[1].headers
+
+    def test_own_conditional_request_passes_through(self):
+        server = Server()
+        with client(server) as http:
+            http.get(URL)
+            response = http.get(URL, headers={"If-None-Match": '"v1"'})
+
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_stores_decoded_body(self):
+        server = Server(body=gzip.compress(b'["api"]'), headers={"ETag": '"v1"', "Content-Encoding": "gzip"})
+        cache = HttpCache()
+        with client(server, cache) as http:
+            first = http.get(URL)
+            second = http.get(URL)
+
+        assert first.json() == second.json() == ["api"]
+        assert "content-encoding" not in first.headers
+        assert cache.get(httpx.URL(URL)).content == b'["api"]'
+
+    def test_async(self):
+        server = Server()
+
+        async def get_twice():
+            transport = CacheTransport(httpx.MockTransport(server), HttpCache())
+            async with httpx.AsyncClient(transport=transport) as http:
+                await http.get(URL)
+                return await http.get(URL)
+
+        response = asyncio.run(get_twice())
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == ["api"]
+        assert server.requests[1].headers["If-None-Match"] == '"v1"'
+
+    def test_wait_shares_entry(self):
+        server, cache = Server(), HttpCache()
+        with client(server, cache) as http:
+            http.get(URL, params={"wait": 20})
+            response = http.get(URL, params={"wait": 10})
+            http.get(URL)
+
+        assert response.json() == ["api"]
+        assert [request.headers.get("If-None-Match") for request in server.requests] == [None, '"v1"', '"v1"']
+        assert server.requests[1].url.params["wait"] == "10"
+        assert list(cache.entries) == [cache.key(httpx.URL(URL))]
+
+
+class TestHttpCache:
+
+    def test_entries_persist_on_disk(self, tmp_path):
+        HttpCache(tmp_path).put(CachedResponse(url=URL, headers={"etag": '"v1"'}, content=b"\x00body"))
+
+        entry = HttpCache(tmp_path).get(httpx.URL(URL))
+
+        assert entry.content == b"\x00body"
+        assert entry.conditions == {"If-None-Match": '"v1"'}
+
+    def test_entries_private(self, tmp_path):
+        path = tmp_path / "http" / "client"
+        HttpCache(path).put(CachedResponse(url=URL, headers={}, content=b"body"))
+
+        assert stat.S_IMODE((tmp_path / "http").stat().st_mode) == 0o700
+        assert stat.S_IMODE(path.stat().st_mode) == 0o700
+        assert [stat.S_IMODE(entry.stat().st_mode) for entry in path.iterdir()] == [0o600]
+
+    def test_corrupt_entry_ignored(self, tmp_path):
+        cache = HttpCache(tmp_path)
+        (tmp_path / f"{cache.key(httpx.URL(URL))}.json").write_text("{")
+
+        assert cache.get(httpx.URL(URL)) is None
+
+    def test_least_recently_used_evicted(self):
+        cache = HttpCache(size=2)
+        for name in ("a", "b", "c"):
+            cache.put(CachedResponse(url=f"{URL}/{name}", headers={}, content=b""))
+            cache.get(httpx.URL(f"{URL}/a"))
+
+        assert cache.get(httpx.URL(f"{URL}/a")) is not None
+        assert cache.get(httpx.URL(f"{URL}/b")) is None
+        assert cache.get(httpx.URL(f"{URL}/c")) is not None
@@ -0,0 +1,140 @@
+import io
+import json
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+
+from maws.events import EventStream
+from maws.fleet import DeploymentResult, DeploymentState
+from maws.journal import Journal, JournalState, journal_path
+from maws.manifest import ServiceDeployment
+
+DEPLOYMENTS = [ServiceDeployment(name="api", image="api:2"), ServiceDeployment(name="worker", image="worker:2")]
+
+
+@pytest.fixture(scope="function")
+def path(tmp_path) -> Path:
+    return tmp_path / "journal.ndjson"
+
+
+def interrupted(path: Path, deployments: list[ServiceDeployment] = DEPLOYMENTS) -> Journal:
+    """
+    Journal of a run which deployed api and was interrupted while worker was in progress
+    """
+    journal = Journal(path, deployments)
+    journal.emit("started", "api")
+    journal.transition("api", DeploymentState.SUCCEEDED, HTTPStatus.OK)
+    journal.emit("started", "worker")
+    journal.poll("worker", HTTPStatus.ACCEPTED, DeploymentState.PENDING)
+    return journal
+
+
+class TestJournal:
+
+    def test_resume(self, path):
+        interrupted(path)
+
+        journal = Journal(path, DEPLOYMENTS, resume=True)
+
+        assert journal.succeeded == ["api"]
+        assert list(journal.in_progress) == ["worker"]
+        assert journal.entries["worker"].state == JournalState.WAITING
+        assert journal.result("api").succeeded
+        assert journal.recorded == set()
+
+    def test_new_run_discards_journal(self, path):
+        interrupted(path)
+
+        journal = Journal(path, DEPLOYMENTS)
+
+        assert journal.entries == {}
+        assert not path.exists()
+
+    def test_missing_journal(self, path):
+        journal = Journal(path, DEPLOYMENTS, resume=True)
+
+        assert journal.succeeded == []
+        assert journal.in_progress == {}
+
+    def test_torn_line_ignored(self, path):
+        interrupted(path)
+        with open(path, "a") as f:
+            f.write('{"service": "worker", "state": "succ')
+
+        journal = Journal(path, DEPLOYMENTS, resume=True)
+
+        assert journal.succeeded == ["api"]
+        assert list(journal.in_progress) == ["worker"]
+
+    def test_changed_deployment_is_outstanding(self, path):
+        interrupted(path)
+        changed = [ServiceDeployment(name="api", image="api:3"), DEPLOYMENTS[1]]
+
+        journal = Journal(path, changed, resume=True)
+
+        assert journal.succeeded == []
+        assert list(journal.in_progress) == ["worker"]
+
+    def test_failed_deployment_is_outstanding(self, path):
+        journal = interrupted(path)
+        journal.transition("worker", DeploymentState.FAILED, HTTPStatus.EXPECTATION_FAILED)
+
+        journal = Journal(path, DEPLOYMENTS, resume=True)
+
+        assert journal.succeeded == ["api"]
+        assert journal.in_progress == {}
+
+    def test_only_changes_are_written(self, path):
+        journal = Journal(path, DEPLOYMENTS)
+        journal.emit("started", "api")
+        for _ in range(3):
+            journal.poll("api", HTTPStatus.ACCEPTED, DeploymentState.PENDING)
+
+        states = [json.loads(line)["state"] for line in path.read_text().splitlines()]
+        assert states == ["patched", "waiting"]
+
+    def test_events_are_forwarded(self, path):
+        stream = io.StringIO()
+
+        Journal(path, DEPLOYMENTS, events=EventStream(stream)).emit("started", "api")
+
+        assert json.loads(stream.getvalue())["event"] == "started"
+
+
+class TestFinish:
+
+    def test_removed_when_all_succeeded(self, path):
+        journal = interrupted(path)
+
+        journal.finish([DeploymentResult(service=name, state=DeploymentState.SUCCEEDED) for name in ("api", "worker")])
+
+        assert not path.exists()
+
+    def test_kept_and_marked_recorded(self, path):
+        journal = interrupted(path)
+
+        journal.finish(
+            [
+                DeploymentResult(service="api", state=DeploymentState.SUCCEEDED),
+                DeploymentResult(service="worker", state=DeploymentState.PENDING),
+            ]
+        )
+
+        resumed = Journal(path, DEPLOYMENTS, resume=True)
+        assert resumed.recorded == {"api"}
+        assert list(resumed.in_progress) == ["worker"]
+
+
+class TestJournalPath:
+
+    def test_path_per_command_and_profile(self, tmp_path):
+        manifest = tmp_path / "manifest.yaml"
+        paths = {
+            journal_path(command, profile, "http://dummy-host/v1", manifest)
+            for command in ("deploy-many", "rollout")
+            for profile in (None, "prod")
+        }
+
+        assert len(paths) == 4
+        assert journal_path("rollout", None, "http://dummy-host/v1", tmp_path / "." / "manifest.yaml") in paths
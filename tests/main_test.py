@@ -1,9 +1,14 @@
-from unittest.mock import patch
+import json
+from http import HTTPStatus
+from unittest.mock import Mock, patch
 
+import pytest
 import typer
+from click import Context
+from typer.main import get_command
 from typer.testing import CliRunner
 
-from maws.main import app, ecs_commands
+from maws.main import app, command_path, ecs_commands, main
 
 
 class TestMainApp:
@@ -77,6 +82,33 @@ class TestMainApp:
         assert hasattr(maws.main, "app")
         assert callable(maws.main.app)
 
+    @patch("maws.main.app")
+    @patch("maws.agent.forward", return_value=3)
+    def test_main_forwards_to_agent(self, mock_forward, mock_app):
+        with patch("sys.argv", ["maws", "ecs", "status", "api"]), pytest.raises(SystemExit) as exit_info:
+            main()
+
+        assert exit_info.value.code == 3
+        mock_forward.assert_called_once_with(["ecs", "status", "api"])
+        mock_app.assert_not_called()
+
+    @patch("maws.main.app")
+    @patch("maws.agent.forward", return_value=None)
+    def test_main_runs_in_process_without_agent(self, mock_forward, mock_app):
+        with patch("sys.argv", ["maws", "ecs", "status", "api"]):
+            main()
+
+        mock_app.assert_called_once_with()
+
+    @patch("maws.main.app")
+    @patch("maws.agent.forward")
+    def test_main_never_forwards_agent_commands(self, mock_forward, mock_app):
+        with patch("sys.argv", ["maws", "agent", "start"]):
+            main()
+
+        mock_forward.assert_not_called()
+        mock_app.assert_called_once_with()
+
     def test_app_with_fake_commands(self, fake):
         runner = CliRunner()
 
@@ -84,3 +116,27 @@ class TestMainApp:
         for cmd in fake_commands:
             result = runner.invoke(app, [cmd])
             assert result.exit_code != 0
+
+
+class TestTrace:
+
+    @patch("maws.config.get_settings")
+    @patch("maws.catalog.get_catalog", return_value=None)
+    @patch("maws.clients.ecs_service_deployment_client.api.tasks.get_tasks")
+    def test_trace_writes_root_span(self, mock_get_tasks, mock_get_catalog, mock_get_settings, tmp_path):
+        mock_get_tasks.sync_detailed.return_value = Mock(status_code=HTTPStatus.OK, content=b"[]")
+        path = tmp_path / "trace.json"
+        args = ["--trace", str(path), "ecs", "task", "list"]
+
+        with patch("sys.argv", ["maws", *args]):
+            result = CliRunner().invoke(app, args)
+
+        assert result.exit_code == 0
+        spans = json.loads(path.read_text())["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert spans[0]["name"] == "maws ecs task list"
+        assert spans[0]["endTimeUnixNano"] >= spans[0]["startTimeUnixNano"]
+
+    def test_command_path_skips_options(self):
+        ctx = Context(get_command(app))
+        assert command_path(ctx, ["--trace", "x.json", "ecs", "deploy", "api", "image"]) == "maws ecs deploy"
+        assert command_path(ctx, ["--trace=x.json", "ecs", "unknown"]) == "maws ecs"
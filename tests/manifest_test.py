@@ -0,0 +1,125 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from maws.manifest import (
+    ServiceDeployment,
+    TaskDeployment,
+    load_manifest,
+    load_task_manifest,
+    parse_entries,
+)
+
+
+class TestParseEntries:
+
+    def test_parse_entries_mapping_shorthand(self, fake):
+        image = fake.uuid4()
+        assert parse_entries({"api": image}) == [{"name": "api", "image": image}]
+
+    def test_parse_entries_mapping_full(self):
+        entries = parse_entries({"api": {"image": "img", "force": True}})
+        assert entries == [{"name": "api", "image": "img", "force": True}]
+
+    def test_parse_entries_list(self):
+        entries = [{"name": "api", "image": "img"}]
+        assert parse_entries(entries) == entries
+
+
+class TestLoadManifest:
+
+    def test_load_manifest_yaml(self, tmp_path):
+        path = tmp_path / "manifest.yaml"
+        path.write_text(
+            """
+services:
+  api: registry/api:1.0.0
+  worker:
+    image: registry/worker:1.0.0
+    force: true
+    secret_arns:
+      - arn:aws:secretsmanager:eu-central-1:123456789012:secret:worker
+"""
+        )
+        deployments = load_manifest(path)
+        assert deployments == [
+            ServiceDeployment(name="api", image="registry/api:1.0.0"),
+            ServiceDeployment(
+                name="worker",
+                image="registry/worker:1.0.0",
+                force=True,
+                secret_arns=["arn:aws:secretsmanager:eu-central-1:123456789012:secret:worker"],
+            ),
+        ]
+
+    def test_load_manifest_toml(self, tmp_path):
+        path = tmp_path / "manifest.toml"
+        path.write_text(
+            """
+[services]
+api = "registry/api:1.0.0"
+
+[services.worker]
+image = "registry/worker:1.0.0"
+force = true
+"""
+        )
+        deployments = load_manifest(path)
+        assert [deployment.name for deployment in deployments] == ["api", "worker"]
+        assert deployments[1].force is True
+
+    def test_load_manifest_json(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps({"services": [{"name": "api", "image": "registry/api:1.0.0"}]}))
+        assert load_manifest(path) == [ServiceDeployment(name="api", image="registry/api:1.0.0")]
+
+    def test_load_manifest_empty(self, tmp_path):
+        path = tmp_path / "manifest.yaml"
+        path.write_text("")
+        assert load_manifest(path) == []
+
+    def test_load_manifest_unsupported_format(self, tmp_path):
+        path = tmp_path / "manifest.ini"
+        path.write_text("")
+        with pytest.raises(ValueError):
+            load_manifest(path)
+
+    def test_load_manifest_duplicates(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps({"services": [{"name": "api", "image": "a"}, {"name": "api", "image": "b"}]}))
+        with pytest.raises(ValueError, match="api"):
+            load_manifest(path)
+
+    def test_load_manifest_missing_image(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps({"services": [{"name": "api"}]}))
+        with pytest.raises(ValidationError):
+            load_manifest(path)
+
+
+class TestLoadTaskManifest:
+
+    def test_load_task_manifest(self, tmp_path):
+        path = tmp_path / "manifest.yaml"
+        path.write_text(
+            """
+services:
+  api: registry/api:1.0.0
+tasks:
+  cleanup: registry/cleanup:1.0.0
+  report:
+    image: registry/report:1.0.0
+"""
+        )
+        assert load_task_manifest(path) == [
+            TaskDeployment(name="cleanup", image="registry/cleanup:1.0.0"),
+            TaskDeployment(name="report", image="registry/report:1.0.0"),
+        ]
+        assert [deployment.name for deployment in load_manifest(path)] == ["api"]
+
+    def test_load_task_manifest_duplicates(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps({"tasks": [{"name": "cleanup", "image": "a"}, {"name": "cleanup", "image": "b"}]}))
+        with pytest.raises(ValueError, match="Duplicate tasks in manifest: cleanup"):
+            load_task_manifest(path)
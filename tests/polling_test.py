@@ -0,0 +1,113 @@
+from itertools import islice
+from unittest.mock import patch
+
+import pytest
+
+from maws.polling import WAIT_HEADER, PollingPolicy, StatusWaits, advertised_wait
+
+
+class TestPollingPolicy:
+
+    def test_polling_policy_defaults(self):
+        policy = PollingPolicy()
+        assert policy.initial_delay < policy.max_delay
+        assert policy.timeout is None
+
+    def test_polling_policy_exponential_growth(self):
+        policy = PollingPolicy(initial_delay=1, max_delay=10, multiplier=2, jitter=0)
+        assert list(islice(policy.intervals(), 6)) == [1, 2, 4, 8, 10, 10]
+
+    def test_polling_policy_jitter(self):
+        policy = PollingPolicy(initial_delay=10, max_delay=10, jitter=0.5)
+        intervals = list(islice(policy.intervals(), 50))
+        assert all(5 <= interval <= 15 for interval in intervals)
+        assert len(set(intervals)) > 1
+
+    def test_polling_policy_fixed(self, fake):
+        delay = fake.random_int(min=1, max=30)
+        policy = PollingPolicy.fixed(delay)
+        assert list(islice(policy.intervals(), 3)) == [delay, delay, delay]
+
+    def test_polling_policy_unbounded_without_timeout(self):
+        policy = PollingPolicy.fixed(1)
+        assert len(list(islice(policy.intervals(), 1000))) == 1000
+
+    @patch("maws.polling.time.monotonic")
+    def test_polling_policy_timeout(self, mock_monotonic):
+        mock_monotonic.side_effect = [100, 100, 104, 109, 111]
+        policy = PollingPolicy.fixed(4, timeout=10)
+        assert list(policy.intervals()) == [4, 4, 1]
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestStatusWaits:
+
+    @pytest.fixture(autouse=True)
+    def clock(self):
+        clock = Clock()
+        with patch("maws.polling.time.monotonic", clock):
+            yield clock
+
+    @pytest.mark.parametrize("headers, expected", [({}, 0), ({WAIT_HEADER: "20"}, 20), ({WAIT_HEADER: "soon"}, 0)])
+    def test_advertised_wait(self, headers, expected):
+        assert advertised_wait(headers) == expected
+
+    def test_without_long_polling(self):
+        waits = StatusWaits(PollingPolicy(max_wait=20))
+        for _ in range(3):
+            assert waits.request() == {}
+            assert waits.pending({}) is True
+
+    def test_long_polling(self, clock):
+        waits = StatusWaits(PollingPolicy(max_wait=10))
+
+        assert waits.request() == {}
+        # the next check is held by the API right away
+        assert waits.pending({WAIT_HEADER: "30"}) is False
+        assert waits.request() == {"wait": 10}
+        clock.now += 10
+        assert waits.pending({WAIT_HEADER: "30"}) is False
+        assert waits.request() == {"wait": 10}
+
+    def test_api_answers_early(self, clock):
+        waits = StatusWaits(PollingPolicy(max_wait=10))
+        waits.request()
+        waits.pending({WAIT_HEADER: "30"})
+
+        waits.request()
+        clock.now += 1
+        assert waits.pending({WAIT_HEADER: "30"}) is True
+
+    def test_not_allowed(self, clock):
+        waits = StatusWaits(PollingPolicy(max_wait=10))
+        waits.request()
+        waits.pending({WAIT_HEADER: "30"})
+
+        assert waits.request(allowed=False) == {}
+        assert waits.pending({WAIT_HEADER: "30"}) is True
+        assert waits.request() == {"wait": 10}
+
+    def test_bounded_by_timeout(self, clock):
+        waits = StatusWaits(PollingPolicy(max_wait=20, timeout=15))
+        waits.request()
+        clock.now += 3
+        waits.pending({WAIT_HEADER: "30"})
+        assert waits.request() == {"wait": 12}
+
+        clock.now += 11.5
+        assert waits.pending({WAIT_HEADER: "30"}) is True
+        assert waits.request() == {}
+
+    def test_disabled(self):
+        waits = StatusWaits(PollingPolicy.fixed(5))
+        waits.request()
+        assert waits.pending({WAIT_HEADER: "30"}) is True
+        assert waits.request() == {}
@@ -0,0 +1,132 @@
+import asyncio
+from http import HTTPStatus
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from maws.ratelimit import RateLimiter, RateLimitTransport
+
+
+class Clock:
+    """
+    Monotonic clock advanced by the tests
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def clock():
+    clock = Clock()
+    with patch("maws.ratelimit.time.monotonic", clock):
+        yield clock
+
+
+def response(status_code: int) -> httpx.Response:
+    return httpx.Response(status_code)
+
+
+class TestRateLimiter:
+
+    def test_unbounded(self, clock):
+        limiter = RateLimiter()
+        assert [limiter.reserve() for _ in range(100)] == [0] * 100
+
+    def test_token_bucket(self, clock):
+        limiter = RateLimiter(rate=10, burst=2)
+
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == pytest.approx(0.1)
+        clock.now += 0.1
+        assert limiter.reserve() == 0
+
+    def test_deployments_go_first(self, clock):
+        limiter = RateLimiter(rate=10, burst=1)
+        limiter.reserve()
+
+        # a deployment request takes the next token, status checks wait for the one after
+        assert limiter.reserve(priority=True) == pytest.approx(0.1)
+        assert limiter.reserve() == pytest.approx(0.2)
+        clock.now += 0.1
+        assert limiter.reserve() == pytest.approx(0.1)
+        clock.now += 0.1
+        assert limiter.reserve() == 0
+
+    def test_throttling_halves_rate(self, clock):
+        limiter = RateLimiter(rate=10)
+
+        limiter.record(response(HTTPStatus.TOO_MANY_REQUESTS))
+        assert limiter.rate == 5
+        # concurrent responses of the same burst do not lower it again
+        limiter.record(response(HTTPStatus.TOO_MANY_REQUESTS))
+        assert limiter.rate == 5
+
+        clock.now += 1
+        limiter.record(response(HTTPStatus.TOO_MANY_REQUESTS))
+        assert limiter.rate == 2.5
+
+    def test_throttling_unbounded_uses_observed_rate(self, clock):
+        limiter = RateLimiter()
+        for _ in range(40):
+            limiter.reserve()
+
+        limiter.record(response(HTTPStatus.TOO_MANY_REQUESTS))
+
+        assert limiter.rate == 20
+        assert limiter.reserve() > 0
+
+    def test_min_rate(self, clock):
+        limiter = RateLimiter(rate=1, min_rate=0.75)
+        limiter.record(response(HTTPStatus.TOO_MANY_REQUESTS))
+        assert limiter.rate == 0.75
+
+    def test_recovery(self, clock):
+        limiter = RateLimiter(rate=10)
+        limiter.record(response(HTTPStatus.TOO_MANY_REQUESTS))
+
+        rates = []
+        for _ in range(7):
+            clock.now += 1
+            limiter.record(response(HTTPStatus.OK))
+            rates.append(limiter.rate)
+
+        assert rates == pytest.approx([6, 7, 8, 9, 10, 10, 10])
+
+
+class TestRateLimitTransport:
+
+    def test_sync_and_async_share_limiter(self, clock):
+        limiter = RateLimiter()
+        transport = RateLimitTransport(httpx.MockTransport(lambda request: response(429)), limiter)
+        with httpx.Client(transport=transport) as client:
+            client.get("http://dummy-host/v1/services/api")
+        assert limiter.rate is not None
+
+        async def patch_service():
+            with patch("maws.ratelimit.asyncio.sleep") as mock_sleep:
+                async with httpx.AsyncClient(transport=transport) as client:
+                    await client.patch("http://dummy-host/v1/services/api")
+                return mock_sleep
+
+        mock_sleep = asyncio.run(patch_service())
+        mock_sleep.assert_awaited_once()
+
+    def test_waits_for_token(self, clock):
+        limiter = RateLimiter(rate=10, burst=1)
+        transport = RateLimitTransport(httpx.MockTransport(lambda request: response(200)), limiter)
+
+        def sleep(seconds):
+            clock.now += seconds
+
+        with patch("maws.ratelimit.time.sleep", side_effect=sleep) as mock_sleep:
+            with httpx.Client(transport=transport) as client:
+                client.get("http://dummy-host/v1/services/api")
+                client.get("http://dummy-host/v1/services/api")
+
+        mock_sleep.assert_called_once_with(pytest.approx(0.1))
@@ -0,0 +1,209 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http import HTTPStatus
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from maws.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    RetryTransport,
+    retry_after,
+)
+
+POLICY = RetryPolicy(attempts=3, initial_delay=0, jitter=0)
+
+
+class Script:
+    """
+    Mock transport answering requests from a list of responses or exceptions
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, tuple):
+            return httpx.Response(outcome[0], headers=outcome[1])
+        return httpx.Response(outcome)
+
+
+def make_transport(script: Script, policy: RetryPolicy = POLICY, breaker: CircuitBreaker = None) -> RetryTransport:
+    return RetryTransport(
+        lambda: httpx.MockTransport(script),
+        lambda: httpx.MockTransport(script),
+        policy=policy,
+        breaker=breaker,
+    )
+
+
+def request(transport: RetryTransport, method: str = "GET") -> httpx.Response:
+    with httpx.Client(transport=transport, base_url="http://dummy-host/v1") as client:
+        return client.request(method, "/services/api")
+
+
+class TestRetryPolicy:
+
+    def test_backoff(self):
+        policy = RetryPolicy(initial_delay=1, max_delay=5, jitter=0)
+        assert [policy.backoff(retry) for retry in range(5)] == [1, 2, 4, 5, 5]
+
+    def test_backoff_jitter(self):
+        policy = RetryPolicy(initial_delay=1, jitter=0.5)
+        assert all(0.5 <= policy.backoff(0) <= 1.5 for _ in range(50))
+
+
+class TestRetryAfter:
+
+    def test_seconds(self):
+        assert retry_after(httpx.Response(429, headers={"Retry-After": "3"})) == 3
+
+    def test_http_date(self):
+        date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=10), usegmt=True)
+        assert 8 <= retry_after(httpx.Response(503, headers={"Retry-After": date})) <= 10
+
+    def test_missing_or_invalid(self):
+        assert retry_after(httpx.Response(503)) is None
+        assert retry_after(httpx.Response(503, headers={"Retry-After": "soon"})) is None
+
+
+class TestRetryTransport:
+
+    def test_get_retried_on_status(self):
+        script = Script(HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.BAD_GATEWAY, HTTPStatus.OK)
+        assert request(make_transport(script)).status_code == HTTPStatus.OK
+        assert len(script.requests) == 3
+
+    def test_get_gives_up(self):
+        script = Script(HTTPStatus.SERVICE_UNAVAILABLE)
+        assert request(make_transport(script)).status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert len(script.requests) == 3
+
+    def test_get_retried_on_read_error(self):
+        script = Script(httpx.ReadError("reset"), HTTPStatus.OK)
+        assert request(make_transport(script)).status_code == HTTPStatus.OK
+
+    def test_final_status_not_retried(self):
+        script = Script(HTTPStatus.EXPECTATION_FAILED)
+        assert request(make_transport(script)).status_code == HTTPStatus.EXPECTATION_FAILED
+        assert len(script.requests) == 1
+
+    def test_patch_not_retried_on_status(self):
+        script = Script(HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.CREATED)
+        assert request(make_transport(script), "PATCH").status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert len(script.requests) == 1
+
+    def test_patch_not_retried_after_sending(self):
+        script = Script(httpx.ReadError("reset"), HTTPStatus.CREATED)
+        with pytest.raises(httpx.ReadError):
+            request(make_transport(script), "PATCH")
+        assert len(script.requests) == 1
+
+    def test_patch_retried_on_connect_error(self):
+        script = Script(httpx.ConnectError("refused"), HTTPStatus.CREATED)
+        assert request(make_transport(script), "PATCH").status_code == HTTPStatus.CREATED
+        assert len(script.requests) == 2
+
+    @patch("maws.retry.time.sleep")
+    def test_retry_after_honoured(self, mock_sleep):
+        script = Script((HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "7"}), HTTPStatus.OK)
+        assert request(make_transport(script)).status_code == HTTPStatus.OK
+        mock_sleep.assert_called_once_with(7)
+
+    @patch("maws.retry.time.sleep")
+    def test_retry_after_above_max_delay(self, mock_sleep):
+        script = Script((HTTPStatus.TOO_MANY_REQUESTS, {"Retry-After": "120"}), HTTPStatus.OK)
+        assert request(make_transport(script)).status_code == HTTPStatus.TOO_MANY_REQUESTS
+        mock_sleep.assert_not_called()
+
+    def test_async_retry(self):
+        script = Script(httpx.ConnectError("refused"), HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.OK)
+        transport = make_transport(script)
+
+        async def run():
+            async with httpx.AsyncClient(transport=transport, base_url="http://dummy-host/v1") as client:
+                return await client.get("/services/api")
+
+        assert asyncio.run(run()).status_code == HTTPStatus.OK
+        assert len(script.requests) == 3
+        # the async pool is recreated after the client has been closed
+        assert asyncio.run(run()).status_code == HTTPStatus.OK
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record(False)
+        breaker.record(True)
+        breaker.record(False)
+        breaker.check()
+        breaker.record(False)
+
+        assert breaker.is_open
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+    def test_trial_after_reset_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record(False)
+        time.sleep(0.02)
+
+        breaker.check()
+        with pytest.raises(CircuitOpenError):
+            breaker.check()  # only a single trial request
+        breaker.record(True)
+
+        assert not breaker.is_open
+        breaker.check()
+
+    def test_cancelled_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record(False)
+        started = asyncio.Event()
+
+        async def hang(request: httpx.Request) -> httpx.Response:
+            started.set()
+            await asyncio.Event().wait()
+
+        transport = RetryTransport(
+            lambda: httpx.MockTransport(hang), lambda: httpx.MockTransport(hang), policy=POLICY, breaker=breaker
+        )
+
+        async def run():
+            async with httpx.AsyncClient(transport=transport, base_url="http://dummy-host/v1") as client:
+                trial = asyncio.create_task(client.get("/services/api"))
+                await started.wait()
+                trial.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await trial
+
+        asyncio.run(run())
+
+        assert breaker.check()  # the next request is let through as a new trial
+
+    def test_transport_fails_fast(self):
+        script = Script(HTTPStatus.SERVICE_UNAVAILABLE)
+        transport = make_transport(script, breaker=CircuitBreaker(failure_threshold=4))
+
+        request(transport)
+        with pytest.raises(CircuitOpenError):
+            request(transport)
+        assert len(script.requests) == 4
+
+    def test_throttling_does_not_open(self):
+        script = Script(HTTPStatus.TOO_MANY_REQUESTS)
+        transport = make_transport(script, breaker=CircuitBreaker(failure_threshold=1))
+
+        request(transport)
+        assert not transport.breaker.is_open
@@ -0,0 +1,185 @@
+import asyncio
+import io
+import json
+from http import HTTPStatus
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from maws.clients.ecs_service_deployment_client import AuthenticatedClient
+from maws.events import EventStream
+from maws.fleet import DeploymentResult, DeploymentState
+from maws.manifest import ServiceDeployment
+from maws.polling import PollingPolicy
+from maws.rollout import deploy_rollout, rollout_graph
+
+POLICY = PollingPolicy.fixed(0)
+
+pytestmark = pytest.mark.usefixtures("patch_services")
+
+
+def service(name: str, **kwargs) -> ServiceDeployment:
+    return ServiceDeployment(name=name, image="registry/image:1.0.0", **kwargs)
+
+
+@pytest.fixture(scope="function")
+def client():
+    return AuthenticatedClient(base_url="http://dummy-host/v1", token="dummy-token")
+
+
+class FakeDeployments:
+    """
+    Records the order in which deployments start and finish
+    """
+
+    def __init__(self, durations: dict[str, float], failing: frozenset[str] = frozenset()):
+        self.durations = durations
+        self.failing = failing
+        self.log: list[str] = []
+
+    async def __call__(self, client, deployment, semaphore, policy, events=None) -> DeploymentResult:
+        self.log.append(f"start {deployment.name}")
+        await asyncio.sleep(self.durations.get(deployment.name, 0))
+        self.log.append(f"done {deployment.name}")
+        if deployment.name in self.failing:
+            return DeploymentResult(
+                service=deployment.name, state=DeploymentState.FAILED, status_code=HTTPStatus.EXPECTATION_FAILED
+            )
+        return DeploymentResult(service=deployment.name, state=DeploymentState.SUCCEEDED, status_code=HTTPStatus.OK)
+
+
+class TestRolloutGraph:
+
+    def test_dependencies(self):
+        graph = rollout_graph([service("worker"), service("api", depends_on=["worker"])])
+        assert graph == {"worker": set(), "api": {"worker"}}
+
+    def test_waves_depend_on_previous_wave(self):
+        graph = rollout_graph(
+            [
+                service("web", wave=3),
+                service("worker", wave=1),
+                service("api", wave=2),
+                service("admin", wave=2),
+                service("docs"),
+            ]
+        )
+        assert graph == {
+            "worker": set(),
+            "api": {"worker"},
+            "admin": {"worker"},
+            "web": {"api", "admin"},
+            "docs": set(),
+        }
+
+    def test_unknown_dependency(self):
+        with pytest.raises(ValueError, match="Unknown dependencies of api: db"):
+            rollout_graph([service("api", depends_on=["db"])])
+
+    def test_cycle(self):
+        with pytest.raises(ValueError, match="Cyclic dependencies"):
+            rollout_graph([service("a", depends_on=["b"]), service("b", depends_on=["a"])])
+
+
+class TestDeployRollout:
+
+    def test_dependents_start_after_prerequisites(self, client):
+        fake = FakeDeployments({"worker": 0.02, "cache": 0.01})
+        deployments = [
+            service("web", depends_on=["api"]),
+            service("api", depends_on=["worker", "cache"]),
+            service("worker"),
+            service("cache"),
+        ]
+
+        with patch("maws.fleet.deploy_service", new=fake):
+            results = asyncio.run(deploy_rollout(client, deployments, POLICY))
+
+        assert [result.service for result in results] == ["web", "api", "worker", "cache"]
+        assert all(result.succeeded for result in results)
+        assert fake.log == [
+            "start worker",
+            "start cache",
+            "done cache",
+            "done worker",
+            "start api",
+            "done api",
+            "start web",
+            "done web",
+        ]
+
+    def test_independent_branches_do_not_wait(self, client):
+        # the short branch finishes while the long prerequisite is still running
+        fake = FakeDeployments({"slow": 0.05})
+        deployments = [service("slow"), service("fast"), service("fast-api", depends_on=["fast"])]
+
+        with patch("maws.fleet.deploy_service", new=fake):
+            asyncio.run(deploy_rollout(client, deployments, POLICY))
+
+        assert fake.log.index("done fast-api") < fake.log.index("done slow")
+
+    def test_failure_stops_scheduling(self, client):
+        fake = FakeDeployments({"other": 0.02}, failing=frozenset({"worker"}))
+        deployments = [
+            service("worker"),
+            service("other"),
+            service("api", depends_on=["worker"]),
+            service("web", depends_on=["other"]),
+        ]
+        stream = io.StringIO()
+
+        with patch("maws.fleet.deploy_service", new=fake):
+            results = asyncio.run(deploy_rollout(client, deployments, POLICY, events=EventStream(stream)))
+
+        assert [result.state for result in results] == [
+            DeploymentState.FAILED,
+            DeploymentState.SUCCEEDED,
+            DeploymentState.SKIPPED,
+            DeploymentState.SKIPPED,
+        ]
+        assert "start web" not in fake.log
+        skipped = [json.loads(line)["service"] for line in stream.getvalue().splitlines()]
+        assert skipped == ["api", "web"]
+
+    def test_ready_services_start_in_one_batch(self, client, patch_services):
+        def respond(status_code: int, content: bytes = b"") -> Mock:
+            return Mock(status_code=status_code, content=content)
+
+        async def accept(client, body):
+            items = [{"service": item.service, "status_code": HTTPStatus.CREATED} for item in body.deployments]
+            return respond(HTTPStatus.MULTI_STATUS, json.dumps({"results": items}).encode())
+
+        patch_services.asyncio_detailed = AsyncMock(side_effect=accept)
+        deployments = [service("api", wave=1), service("worker", wave=1), service("web", wave=2)]
+
+        with (
+            patch("maws.fleet.patch_service") as mock_patch_service,
+            patch("maws.fleet.get_service") as mock_get_service,
+        ):
+            mock_patch_service.asyncio_detailed = AsyncMock(return_value=respond(HTTPStatus.CREATED))
+            mock_get_service.asyncio_detailed = AsyncMock(return_value=respond(HTTPStatus.OK))
+            results = asyncio.run(deploy_rollout(client, deployments, POLICY))
+
+        assert all(result.succeeded for result in results)
+        assert mock_patch_service.asyncio_detailed.call_args.kwargs["service"] == "web"
+        # the second wave is a single service, deployed on its own
+        batches = [
+            [item.service for item in call.kwargs["body"].deployments]
+            for call in patch_services.asyncio_detailed.call_args_list
+        ]
+        assert batches == [["api", "worker"]]
+
+    def test_reattached_services_are_not_triggered(self, client):
+        deployments = [service("api", wave=1), service("web", wave=2)]
+
+        with (
+            patch("maws.fleet.patch_service") as mock_patch_service,
+            patch("maws.fleet.get_service") as mock_get_service,
+        ):
+            mock_patch_service.asyncio_detailed = AsyncMock(return_value=Mock(status_code=HTTPStatus.CREATED))
+            mock_get_service.asyncio_detailed = AsyncMock(return_value=Mock(status_code=HTTPStatus.OK))
+            results = asyncio.run(deploy_rollout(client, deployments, POLICY, reattach={"api": 1000.0}))
+
+        assert all(result.succeeded for result in results)
+        assert [call.kwargs["service"] for call in mock_patch_service.asyncio_detailed.call_args_list] == ["web"]
+        assert mock_get_service.asyncio_detailed.call_count == 2
@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Cumulative import time of `maws --help`, generous enough for slow CI runners
+IMPORT_BUDGET_MS = 750
+
+HEAVY_MODULES = (
+    "asyncio",
+    "httpx",
+    "pydantic",
+    "pydantic_settings",
+    "maws.clients.ecs_service_deployment_client",
+    "maws.config",
+)
+
+
+def run_cli(*args: str, env: dict[str, str] | None = None) -> tuple[str, dict[str, int]]:
+    """
+    Run the CLI with `-X importtime` and collect its output and the self import time per module in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "from maws.main import app; app(prog_name='maws')", *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+    )
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            self_time, _, name = line.removeprefix("import time:").split("|")
+            times[name.strip()] = int(self_time)
+    return result.stdout, times
+
+
+def import_times(*args: str) -> dict[str, int]:
+    return run_cli(*args)[1]
+
+
+class TestStartup:
+
+    @pytest.mark.parametrize("args", [["--help"], ["ecs", "--help"], ["ecs", "deploy", "--help"]])
+    def test_help_does_not_import_heavy_modules(self, args):
+        imported = import_times(*args)
+        assert not [module for module in HEAVY_MODULES if module in imported]
+
+    def test_help_import_budget(self):
+        # best of three to smooth out noisy neighbours
+        total = min(sum(import_times("--help").values()) for _ in range(3)) / 1000
+        assert total < IMPORT_BUDGET_MS, f"maws --help spent {total:.0f}ms importing modules"
+
+    def test_completion_answers_from_cache(self, cache_dir):
+        catalog = cache_dir / "catalog" / "dev.json"
+        catalog.parent.mkdir(parents=True)
+        catalog.write_text(json.dumps({"services": ["api", "api-worker", "db"], "updated_at": time.time()}))
+
+        output, imported = run_cli(
+            env={
+                "_MAWS_COMPLETE": "complete_bash",
+                "COMP_WORDS": "maws ecs deploy --profile dev ap",
+                "COMP_CWORD": "5",
+            }
+        )
+
+        assert output.split() == ["api", "api-worker"]
+        assert not [module for module in HEAVY_MODULES if module in imported]
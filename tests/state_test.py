@@ -0,0 +1,96 @@
+import json
+
+from maws.fleet import DeploymentResult, DeploymentState
+from maws.manifest import ServiceDeployment
+from maws.state import (
+    PlanAction,
+    ReleaseState,
+    ServiceState,
+    load_state,
+    plan_deployments,
+    record_deployments,
+    save_state,
+    state_path,
+)
+
+BASE_URL = "http://dummy-host/v1"
+
+
+def result(service: str, state: DeploymentState = DeploymentState.SUCCEEDED) -> DeploymentResult:
+    return DeploymentResult(service=service, state=state)
+
+
+class TestStateStore:
+
+    def test_state_path(self, cache_dir):
+        assert state_path() == cache_dir / "state" / "default.json"
+        assert state_path("prod") == cache_dir / "state" / "prod.json"
+
+    def test_load_missing(self):
+        assert load_state("prod", BASE_URL) == ReleaseState(base_url=BASE_URL)
+
+    def test_load_other_endpoint(self):
+        save_state("prod", ReleaseState(base_url=BASE_URL, services={"api": ServiceState(image="api:1")}))
+        assert load_state("prod", "http://other-host/v1").services == {}
+
+    def test_load_corrupt(self):
+        state_path().parent.mkdir(parents=True)
+        state_path().write_text("{not json")
+        assert load_state(None, BASE_URL).services == {}
+
+    def test_record_successful_deployments(self):
+        save_state("prod", ReleaseState(base_url=BASE_URL, services={"db": ServiceState(image="db:1")}))
+        deployments = [
+            ServiceDeployment(name="api", image="api:2", secret_arns=["arn"]),
+            ServiceDeployment(name="worker", image="worker:2"),
+        ]
+
+        record_deployments("prod", BASE_URL, deployments, [result("api"), result("worker", DeploymentState.FAILED)])
+
+        services = load_state("prod", BASE_URL).services
+        assert set(services) == {"db", "api"}
+        assert services["api"].image == "api:2"
+        assert services["api"].secret_arns == ["arn"]
+        assert services["api"].deployed_at > 0
+
+    def test_record_nothing_succeeded(self):
+        record_deployments("prod", BASE_URL, [ServiceDeployment(name="api", image="api:2")], [])
+        assert not state_path("prod").exists()
+
+    def test_state_file_is_json(self):
+        record_deployments("prod", BASE_URL, [ServiceDeployment(name="api", image="api:2")], [result("api")])
+        assert json.loads(state_path("prod").read_text())["services"]["api"]["image"] == "api:2"
+
+
+class TestPlanDeployments:
+
+    def test_actions(self):
+        state = ReleaseState(
+            base_url=BASE_URL,
+            services={
+                "same": ServiceState(image="same:1", secret_arns=["b", "a"]),
+                "image": ServiceState(image="image:1"),
+                "secrets": ServiceState(image="secrets:1", secret_arns=["a"]),
+                "forced": ServiceState(image="forced:1"),
+            },
+        )
+        deployments = [
+            ServiceDeployment(name="same", image="same:1", secret_arns=["a", "b"]),
+            ServiceDeployment(name="image", image="image:2"),
+            ServiceDeployment(name="secrets", image="secrets:1", secret_arns=["a", "c"]),
+            ServiceDeployment(name="forced", image="forced:1", force=True),
+            ServiceDeployment(name="new", image="new:1"),
+        ]
+
+        plan = plan_deployments(deployments, state)
+
+        assert [planned.action for planned in plan] == [
+            PlanAction.UNCHANGED,
+            PlanAction.UPDATE,
+            PlanAction.UPDATE,
+            PlanAction.FORCE,
+            PlanAction.CREATE,
+        ]
+        assert [planned.changed for planned in plan] == [False, True, True, True, True]
+        assert plan[1].previous.image == "image:1"
+        assert plan[4].previous is None
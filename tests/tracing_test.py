@@ -0,0 +1,118 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from benchmarks.stub import TOKEN, DeploymentApiStub, StubConfig
+from maws.tracing import (
+    SPAN_KIND_CLIENT,
+    STATUS_ERROR,
+    Tracer,
+    TracingTransport,
+    start_tracing,
+    stop_tracing,
+)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_tracing():
+    yield
+    stop_tracing()
+
+
+@pytest.fixture(scope="function")
+def stub():
+    with DeploymentApiStub(StubConfig(services=["api"])) as stub:
+        yield stub
+
+
+def attributes(span: dict) -> dict:
+    return {item["key"]: next(iter(item["value"].values())) for item in span["attributes"]}
+
+
+class TestTracer:
+
+    def test_spans_nest_under_root(self):
+        tracer = Tracer("maws ecs deploy", {"maws.args": "ecs deploy api image"})
+        span = tracer.start_span("child")
+        span.end()
+        tracer.root.end()
+
+        spans = tracer.to_otlp()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [span["name"] for span in spans] == ["maws ecs deploy", "child"]
+        assert "parentSpanId" not in spans[0]
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+        assert {span["traceId"] for span in spans} == {tracer.trace_id}
+        assert len(tracer.trace_id) == 32 and len(spans[0]["spanId"]) == 16
+        assert attributes(spans[0]) == {"maws.args": "ecs deploy api image"}
+
+    def test_error_status(self):
+        tracer = Tracer("maws")
+        tracer.root.end("boom")
+        assert tracer.root.to_otlp()["status"] == {"code": STATUS_ERROR, "message": "boom"}
+
+    def test_stop_tracing_writes_file(self, tmp_path):
+        start_tracing("maws")
+        path = tmp_path / "trace.json"
+
+        tracer = stop_tracing(path)
+
+        assert tracer.root.end_time is not None
+        assert json.loads(path.read_text()) == tracer.to_otlp()
+        assert stop_tracing() is None
+
+
+class TestTracingTransport:
+
+    def test_disabled(self):
+        transport = TracingTransport(httpx.MockTransport(lambda request: httpx.Response(HTTPStatus.OK)))
+        with httpx.Client(transport=transport) as client:
+            assert client.get("http://dummy-host/v1/services").status_code == HTTPStatus.OK
+
+    def test_request_span(self, stub):
+        tracer = start_tracing("maws ecs status")
+        transport = TracingTransport(httpx.HTTPTransport())
+        with httpx.Client(transport=transport, headers={"x-api-token": TOKEN}) as client:
+            client.get(f"{stub.base_url}/v1/services/api")
+            client.get(f"{stub.base_url}/v1/services/api")
+
+        first, second = [span.to_otlp() for span in tracer.spans[1:]]
+        assert first["name"] == "GET /v1/services/api"
+        assert first["kind"] == SPAN_KIND_CLIENT
+        assert first["parentSpanId"] == tracer.root.span_id
+        first, second = attributes(first), attributes(second)
+        assert first["maws.service"] == "api"
+        assert first["http.response.status_code"] == "200"
+        assert first["http.connection_reused"] is False
+        assert {"http.connect_ms", "http.ttfb_ms", "http.total_ms"} <= first.keys()
+        assert second["http.connection_reused"] is True
+        assert "http.connect_ms" not in second
+
+    def test_async_request_span(self, stub):
+        tracer = start_tracing("maws ecs status")
+        transport = TracingTransport(httpx.AsyncHTTPTransport())
+
+        async def run():
+            async with httpx.AsyncClient(transport=transport, headers={"x-api-token": TOKEN}) as client:
+                await client.patch(f"{stub.base_url}/v1/tasks/unknown")
+
+        asyncio.run(run())
+
+        span = tracer.spans[1]
+        assert span.attributes["maws.task"] == "unknown"
+        assert span.attributes["http.response.status_code"] == HTTPStatus.NOT_FOUND
+        assert span.attributes["http.ttfb_ms"] <= span.attributes["http.total_ms"]
+
+    def test_failed_request_span(self):
+        tracer = start_tracing("maws")
+
+        def refuse(request):
+            raise httpx.ConnectError("refused")
+
+        with httpx.Client(transport=TracingTransport(httpx.MockTransport(refuse))) as client:
+            with pytest.raises(httpx.ConnectError):
+                client.get("http://dummy-host/v1/services")
+
+        assert tracer.spans[1].error == "ConnectError('refused')"
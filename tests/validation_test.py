@@ -0,0 +1,80 @@
+import pytest
+
+from maws.manifest import ServiceDeployment, TaskDeployment
+from maws.validation import compile_schema, request_schema, validate_requests
+
+SECRET_ARN = "arn:aws:secretsmanager:eu-central-1:123456789012:secret:my-secret"
+SECRET_ARN_PATTERN = "arn:aws:secretsmanager:[a-z0-9-]+:[0-9]+:secret:.*"
+
+
+class TestRequestSchemas:
+
+    def test_loaded_from_openapi(self):
+        schema = request_schema("ServiceDeploymentRequest")
+        assert schema["required"] == ["image"]
+        assert schema["properties"]["secret_arns"]["items"]["pattern"] == SECRET_ARN_PATTERN
+        assert request_schema("ServiceDeploymentRequest") is schema
+
+    def test_unknown_schema(self):
+        with pytest.raises(KeyError):
+            request_schema("UnknownRequest")
+
+
+class TestCompileSchema:
+
+    def test_valid(self):
+        check = compile_schema({"type": "string", "minLength": 1, "pattern": "^a"})
+        assert list(check("abc", "name")) == []
+
+    def test_min_length(self):
+        check = compile_schema({"type": "string", "minLength": 1})
+        assert list(check("", "image")) == ["image must not be empty"]
+
+    def test_max_length(self):
+        check = compile_schema({"type": "string", "maxLength": 2})
+        assert list(check("abc", "image")) == ["image must not be longer than 2"]
+
+    def test_pattern_matches_anywhere(self):
+        check = compile_schema({"type": "string", "pattern": "b+"})
+        assert list(check("abc", "value")) == []
+        assert list(check("xyz", "value")) == ["value 'xyz' does not match b+"]
+
+    def test_type(self):
+        check = compile_schema({"type": "array", "items": {"type": "string"}})
+        assert list(check("abc", "list")) == ["list must be of type array"]
+        assert list(check(["a", 1], "list")) == ["list[1] must be of type string"]
+
+    def test_nullable(self):
+        assert list(compile_schema({"type": "string", "nullable": True})(None, "value")) == []
+        assert list(compile_schema({"type": "string"})(None, "value")) == ["value must not be null"]
+
+    def test_nested_properties(self):
+        check = compile_schema(
+            {"required": ["a"], "properties": {"b": {"properties": {"c": {"type": "string", "minLength": 1}}}}}
+        )
+        assert list(check({"b": {"c": ""}}, "")) == ["a is required", "b.c must not be empty"]
+
+
+class TestValidateRequests:
+
+    def test_valid_manifest(self):
+        deployments = [ServiceDeployment(name="api", image="registry/api:1", secret_arns=[SECRET_ARN])]
+        assert validate_requests(deployments, "ServiceDeploymentRequest") == []
+
+    def test_reports_every_error(self):
+        deployments = [
+            ServiceDeployment(name="api", image=""),
+            ServiceDeployment(name="worker", image="registry/worker:1", secret_arns=[SECRET_ARN, "my-secret"]),
+            ServiceDeployment(name="web", image="", secret_arns=["arn:aws:ssm:eu-central-1:1:parameter/x"]),
+        ]
+
+        assert validate_requests(deployments, "ServiceDeploymentRequest") == [
+            ("api", "image must not be empty"),
+            ("worker", f"secret_arns[1] 'my-secret' does not match {SECRET_ARN_PATTERN}"),
+            ("web", "image must not be empty"),
+            ("web", f"secret_arns[0] 'arn:aws:ssm:eu-central-1:1:parameter/x' does not match {SECRET_ARN_PATTERN}"),
+        ]
+
+    def test_task_requests(self):
+        deployments = [TaskDeployment(name="migrate", image=""), TaskDeployment(name="cleanup", image="cleanup:1")]
+        assert validate_requests(deployments, "TaskDeploymentRequest") == [("migrate", "image must not be empty")]
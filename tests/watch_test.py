@@ -0,0 +1,161 @@
+import asyncio
+import io
+import json
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+
+from maws.clients.ecs_service_deployment_client import AuthenticatedClient
+from maws.events import EventStream
+from maws.fleet import DeploymentResult, DeploymentState, deployment_result
+from maws.polling import PollingPolicy
+from maws.watch import FleetWatcher
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeChecks:
+    """
+    Status codes returned by consecutive checks per service, the last one is repeated
+    """
+
+    def __init__(self, **sequences: list[int]):
+        self.sequences = sequences
+        self.calls: list[str] = []
+
+    async def __call__(self, client, service, semaphore) -> DeploymentResult:
+        self.calls.append(service)
+        sequence = self.sequences[service]
+        status_code = sequence.pop(0) if len(sequence) > 1 else sequence[0]
+        if status_code is None:
+            raise Exception("Connection refused")
+        return deployment_result(service, status_code)
+
+
+@pytest.fixture(scope="function")
+def client():
+    return AuthenticatedClient(base_url="http://dummy-host/v1", token="dummy-token")
+
+
+@pytest.fixture(scope="function")
+def clock():
+    clock = Clock()
+    with patch("maws.watch.time.monotonic", clock), patch("maws.polling.time.monotonic", clock):
+        yield clock
+
+
+class TestFleetWatcher:
+
+    def watcher(self, client, services, **kwargs) -> FleetWatcher:
+        watcher = FleetWatcher(
+            client, services, PollingPolicy.fixed(5), settled_delay=30, settled_max_delay=100, **kwargs
+        )
+        watcher._due = [(100.0, service) for service in services]
+        return watcher
+
+    def test_polls_only_due_services(self, client, clock):
+        checks = FakeChecks(api=[202, 202, 200], worker=[200])
+        watcher = self.watcher(client, ["api", "worker"])
+
+        with patch("maws.watch.check_deployment", new=checks):
+            changes = asyncio.run(watcher.refresh())
+            assert {result.service for result in changes} == {"api", "worker"}
+            assert asyncio.run(watcher.refresh()) == []
+            assert watcher.next_due() == 5
+
+            clock.now += 5
+            assert asyncio.run(watcher.refresh()) == []
+            clock.now += 5
+            changes = asyncio.run(watcher.refresh())
+
+        assert checks.calls == ["api", "worker", "api", "api"]
+        assert [(result.service, result.state) for result in changes] == [("api", DeploymentState.SUCCEEDED)]
+        assert watcher.results["api"].polls == 3
+        assert watcher.checks == 4
+        assert watcher.settled
+
+    def test_settled_services_back_off(self, client, clock):
+        checks = FakeChecks(api=[200])
+        watcher = self.watcher(client, ["api"])
+
+        delays = []
+        with patch("maws.watch.check_deployment", new=checks):
+            for _ in range(5):
+                asyncio.run(watcher.refresh())
+                delays.append(watcher.next_due())
+                clock.now += watcher.next_due()
+
+        assert delays == [30, 60, 100, 100, 100]
+
+    def test_new_deployment_is_polled_again(self, client, clock):
+        checks = FakeChecks(api=[200, 200, 202, 202])
+        watcher = self.watcher(client, ["api"])
+
+        with patch("maws.watch.check_deployment", new=checks):
+            asyncio.run(watcher.refresh())
+            clock.now += 30
+            asyncio.run(watcher.refresh())
+            clock.now += 60
+            asyncio.run(watcher.refresh())
+
+        assert watcher.results["api"].state == DeploymentState.PENDING
+        assert watcher.next_due() == 5
+        assert not watcher.settled
+
+    def test_failed_check(self, client, clock):
+        checks = FakeChecks(api=[None])
+        watcher = self.watcher(client, ["api"])
+
+        with patch("maws.watch.check_deployment", new=checks):
+            changes = asyncio.run(watcher.refresh())
+
+        assert changes[0].failed
+        assert changes[0].message == "Connection refused"
+
+    def test_state_events(self, client, clock):
+        stream = io.StringIO()
+        checks = FakeChecks(api=[202, 200])
+        watcher = self.watcher(client, ["api"], events=EventStream(stream))
+
+        with patch("maws.watch.check_deployment", new=checks):
+            asyncio.run(watcher.refresh())
+            clock.now += 5
+            asyncio.run(watcher.refresh())
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [(event["event"], event["state"]) for event in events] == [("state", "pending"), ("state", "succeeded")]
+
+    def test_watch_until_settled(self, client):
+        checks = FakeChecks(api=[202, 202, 200], worker=[417])
+        watcher = FleetWatcher(client, ["api", "worker"], PollingPolicy.fixed(0), tick=0)
+        rounds = []
+
+        with patch("maws.watch.check_deployment", new=checks):
+            results = asyncio.run(watcher.watch(rounds.append, until_settled=True))
+
+        assert results["api"].succeeded
+        assert results["worker"].status_code == HTTPStatus.EXPECTATION_FAILED
+        assert len(rounds) == 2
+        # settled right away, not checked again before the watch ended
+        assert checks.calls.count("worker") == 1
+
+    @patch("maws.watch.list_services")
+    def test_watch_all_services(self, mock_list_services, client):
+        async def list_services(client):
+            return ["api"]
+
+        mock_list_services.side_effect = list_services
+        watcher = FleetWatcher(client, None, PollingPolicy.fixed(0), tick=0)
+
+        with patch("maws.watch.check_deployment", new=FakeChecks(api=[200])):
+            results = asyncio.run(watcher.watch(lambda changes: None, until_settled=True))
+
+        assert list(results) == ["api"]